@@ -0,0 +1,156 @@
+"""
+This module contains the asset pack: one versioned binary file holding every image from the asset manifest
+already decoded, scaled and rotated, stored as raw RGBA pixels.
+
+assets.py memory-maps the pack and builds surfaces straight from its buffers, with no PNG decoding and no
+scaling. An entry is only used if its fingerprint matches the manifest entry and the source files it was
+built from. Otherwise, or when the pack is missing, the image is loaded from its source file as usual.
+
+Build or rebuild the pack with:
+    python assetpack.py
+
+File layout (little-endian):
+- header: magic b'FOEPACK\\0', format version (u32), number of entries (u32)
+- index, one record per entry: name length (u16), name (utf-8), fingerprint (20 bytes), width (u32),
+  height (u32), pixel data offset (u64)
+- pixel data: width * height * 4 bytes of RGBA per entry, at the recorded offset
+
+Functions:
+- asset_fingerprint: Returns the fingerprint of an image asset and the source files it is built from.
+- build_pack: Writes every image asset of the manifest into a pack file.
+
+Classes:
+- AssetPack: A memory-mapped asset pack.
+"""
+import hashlib
+import mmap
+import os
+import struct
+
+import pygame
+
+PACK_MAGIC = b'FOEPACK\0'
+PACK_VERSION = 1
+PACK_PATH = 'graphics/assets.pack'
+
+HEADER = struct.Struct('<8sII')
+NAME_LENGTH = struct.Struct('<H')
+RECORD = struct.Struct('<20sIIQ')
+
+
+def asset_fingerprint(manifest, name) -> bytes:
+    """
+    Returns the fingerprint of an image asset: a hash of its manifest entry, of the entries it is derived from
+    and of the size and modification time of their source files.
+    """
+    digest = hashlib.sha1(struct.pack('<I', PACK_VERSION))
+    while True:
+        spec = manifest[name]
+        digest.update(repr(spec).encode())
+        if spec[0] == 'image':
+            stat = os.stat(spec[1])
+            digest.update(struct.pack('<QQ', stat.st_size, stat.st_mtime_ns))
+            return digest.digest()
+        name = spec[1]
+
+
+class AssetPack:
+    """
+    A memory-mapped asset pack.
+
+    Instance Attributes:
+    - path: the pack file
+    - buffer: the memory map of the pack
+    - entries: the fingerprint, size and pixel data offset of every entry whose pixel data lies within the file,
+      keyed by asset name
+    """
+    path: str
+    buffer: mmap.mmap
+    entries: dict[str, tuple[bytes, int, int, int]]
+
+    def __init__(self, path: str) -> None:
+        """
+        Memory-map a pack file and read its index. Raises ValueError if the file is not a pack of this version.
+        Entries whose pixel data runs past the end of the file, as in a pack cut short, are left out.
+        """
+        self.path = path
+        with open(path, 'rb') as pack_file:
+            self.buffer = mmap.mmap(pack_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, count = HEADER.unpack_from(self.buffer, 0)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            raise ValueError(f'{path} is not a version {PACK_VERSION} asset pack')
+
+        self.entries = {}
+        position = HEADER.size
+        for _ in range(count):
+            (name_length,) = NAME_LENGTH.unpack_from(self.buffer, position)
+            position += NAME_LENGTH.size
+            name = self.buffer[position:position + name_length].decode()
+            position += name_length
+            entry = RECORD.unpack_from(self.buffer, position)
+            position += RECORD.size
+            _, width, height, offset = entry
+            if offset + width * height * 4 <= len(self.buffer):
+                self.entries[name] = entry
+
+    @classmethod
+    def open(cls, path: str = PACK_PATH):
+        """
+        Return the pack at the path, or None if there is no usable pack there.
+        """
+        try:
+            return cls(path)
+        except (OSError, ValueError, struct.error):
+            return None
+
+    def surface(self, name: str, fingerprint: bytes):
+        """
+        Return a surface built directly on the pack buffer for an asset, or None if the pack has no entry for it,
+        the entry is stale or its pixel data is cut short.
+        """
+        entry = self.entries.get(name)
+        if entry is None or entry[0] != fingerprint:
+            return None
+        _, width, height, offset = entry
+        pixels = memoryview(self.buffer)[offset:offset + width * height * 4]
+        if len(pixels) != width * height * 4:
+            return None
+        return pygame.image.frombuffer(pixels, (width, height), 'RGBA')
+
+
+def build_pack(path: str = PACK_PATH) -> int:
+    """
+    Writes every image asset of the manifest into a pack file, loading each one from its source files.
+    Returns the number of entries written.
+    """
+    import assets
+
+    assets.asset_pack = None
+    names = [name for name, spec in assets.ASSET_MANIFEST.items() if spec[0] in {'image', 'rotated'}]
+
+    index = []
+    pixels = []
+    for name in names:
+        surface = assets.load_source_asset(name)
+        index.append((name.encode(), asset_fingerprint(assets.ASSET_MANIFEST, name), surface.get_size()))
+        pixels.append(pygame.image.tobytes(surface, 'RGBA'))
+
+    offset = HEADER.size + sum(NAME_LENGTH.size + len(name) + RECORD.size for name, _, _ in index)
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'wb') as pack_file:
+        pack_file.write(HEADER.pack(PACK_MAGIC, PACK_VERSION, len(index)))
+        for (name, fingerprint, (width, height)), data in zip(index, pixels):
+            pack_file.write(NAME_LENGTH.pack(len(name)))
+            pack_file.write(name)
+            pack_file.write(RECORD.pack(fingerprint, width, height, offset))
+            offset += len(data)
+        for data in pixels:
+            pack_file.write(data)
+    os.replace(temporary_path, path)
+    return len(index)
+
+
+if __name__ == '__main__':
+    count = build_pack()
+    print(f'Wrote {count} images to {PACK_PATH}')
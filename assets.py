@@ -1,15 +1,82 @@
 """
 This module contains the assignment of every image and mp3 file into their selected variables
+
+Images and fonts are declared in ASSET_MANIFEST and loaded the first time they are used, then kept in a
+cache. The module-level names (full_heart, man_down, wooden_sign1, ...) still work: reading one through the
+module loads it on demand. SCENE_ASSETS lists the assets every screen needs so a screen can load them all
+when it is entered instead of on its first frame.
+
+Images are taken from the memory-mapped asset pack (see assetpack.py) when it holds an up-to-date copy, and
+decoded from their source files otherwise. Setting FOREST_ASSET_PACK=0 ignores the pack.
+
+Importing this module does not open a window. An interactive run opens it with init_display. Headless runs
+(the FOREST_HEADLESS=1 environment variable or the --headless flag) use SDL's dummy video and audio drivers,
+and init_display opens an off-screen render target instead. Its size is HEADLESS_WINDOW_SIZE, or
+FOREST_WINDOW_SIZE (as WIDTHxHEIGHT) when that is set.
+
+Every screen limits its frame rate to FPS_CAP frames per second through the shared clock. Set FOREST_FPS_CAP
+to change the cap, or to 0 to run uncapped.
+
+Functions:
+- get_window_size: Returns the size of the game window.
+- init_display: Opens the game window, or the off-screen render target when headless.
+- image_asset: Declares an image asset, optionally scaled.
+- rotated_asset: Declares an asset rotated from another image asset, optionally scaled.
+- alias_asset: Declares another name for an asset.
+- group_asset: Declares a list of assets.
+- font_asset: Declares a font asset.
+- load_source_asset: Loads an image asset from its source files.
+- load_asset: Loads an asset from the manifest, or returns it from the cache.
+- load_scene_assets: Loads every asset a scene needs.
 """
+import os
+import sys
+
 import pygame
 
+from assetpack import AssetPack, asset_fingerprint
+
+HEADLESS = os.environ.get('FOREST_HEADLESS', '0') == '1' or '--headless' in sys.argv
+HEADLESS_WINDOW_SIZE = (1920, 1080)
+if HEADLESS:
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+
+
+def get_window_size() -> tuple[int, int]:
+    """
+    Returns the size of the game window: FOREST_WINDOW_SIZE if it is set, HEADLESS_WINDOW_SIZE when headless and
+    the size of the desktop otherwise.
+    """
+    size = os.environ.get('FOREST_WINDOW_SIZE')
+    if size:
+        width, height = size.lower().split('x')
+        return int(width), int(height)
+    if HEADLESS:
+        return HEADLESS_WINDOW_SIZE
+    display_info = pygame.display.Info()
+    return display_info.current_w, display_info.current_h
+
+
+def init_display() -> pygame.Surface:
+    """
+    Opens the game window, fullscreen, or the off-screen render target when headless, and starts the mixer.
+    Returns the screen surface. Only the first call opens it.
+    """
+    global screen
+    if screen is None:
+        screen = pygame.display.set_mode(window_size, 0 if HEADLESS else pygame.FULLSCREEN)
+        pygame.display.set_caption("Forest of Echoes")
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+    return screen
+
+
 pygame.init()
-display_info = pygame.display.Info()
-window_size = (display_info.current_w, display_info.current_h)
-clock = pygame.time.Clock().tick(60)
-screen = pygame.display.set_mode(window_size, pygame.FULLSCREEN)
-pygame.mixer.init()
-pygame.display.set_caption("Forest of Echoes")
+window_size = get_window_size()
+clock = pygame.time.Clock()
+FPS_CAP = int(os.environ.get('FOREST_FPS_CAP', '60'))
+screen = None
 
 # Colours
 WHITE = (255, 255, 255)
@@ -42,43 +109,313 @@ dying_sound = 'graphics/dying_sound.mp3'
 select_sound = 'graphics/select_sound.mp3'
 breathe_sound = 'graphics/breathe_sound.mp3'
 
+# Sound effects decoded when the game screen is entered, so none of them is decoded mid-game
+GAME_SOUNDS = [breathe_sound, select_sound, error_sound, sign_sound, pickup_sound, dying_sound, footsteps_sound,
+               campfire_sound, chest_sound]
+
+
+# Sizes shared by the button images and their rects
+BUTTON_SIZE = (230, 80)
+SMALL_BUTTON_SIZE = (150, 50)
+GAME_BUTTON_SIZE = (130, 50)
+
+
+def image_asset(path, size=None) -> tuple:
+    """
+    Declares an image asset, optionally scaled.
+    """
+    return 'image', path, size
+
+
+def rotated_asset(base, angle, size=None) -> tuple:
+    """
+    Declares an asset rotated from another image asset, optionally scaled.
+    """
+    return 'rotated', base, angle, size
+
+
+def alias_asset(name) -> tuple:
+    """
+    Declares another name for an asset.
+    """
+    return 'alias', name
+
+
+def group_asset(*names) -> tuple:
+    """
+    Declares a list of assets.
+    """
+    return 'group', names
+
+
+def font_asset(path, size) -> tuple:
+    """
+    Declares a font asset.
+    """
+    return 'font', path, size
+
+
+ASSET_MANIFEST = {
+    # Background Image
+    'background_start_image': image_asset('graphics/background_start_screen.png', window_size),
+
+    # Buttons frames
+    'button_image': image_asset('graphics/button_back.png', BUTTON_SIZE),
+    'small_button_image': image_asset('graphics/button_back.png', SMALL_BUTTON_SIZE),
+    'game_button': image_asset('graphics/interact_button.png', GAME_BUTTON_SIZE),
+    'game_button1': image_asset('graphics/interact_button.png', (90, 45)),
+    'item_frame': image_asset('graphics/item_frame.png', (170, 170)),
+    'item_frame1': image_asset('graphics/item_frame.png', (120, 120)),
+    'start_button_image': alias_asset('button_image'),
+    'menu_button_image': alias_asset('button_image'),
+    'exit_button_image': alias_asset('button_image'),
+
+    # Game Signs Images
+    'wooden_sign1': image_asset('graphics/wooden_sign1.png', (900, 800)),
+    'wooden_sign2': image_asset('graphics/wooden_sign2.png', (900, 800)),
+    'wooden_sign3': image_asset('graphics/wooden_sign3.png', (900, 800)),
+
+    # Player Hearts Images
+    'full_heart': image_asset('graphics/full_heart.png', (40, 40)),
+    'half_heart': image_asset('graphics/half_heart.png', (40, 40)),
+    'empty_heart': image_asset('graphics/empty_heart.png', (40, 40)),
+
+    # Fonts
+    'dash_180': font_asset('graphics/dashhorizon.otf', 180),
+    'pixel_150': font_asset('graphics/pixelboy.ttf', 150),
+    'pixel_100': font_asset('graphics/pixelboy.ttf', 100),
+    'pixel_70': font_asset('graphics/pixelboy.ttf', 70),
+    'pixel_50': font_asset('graphics/pixelboy.ttf', 50),
+    'pixel_40': font_asset('graphics/pixelboy.ttf', 40),
+    'pixel_35': font_asset('graphics/pixelboy.ttf', 35),
+    'pixel_30': font_asset('graphics/pixelboy.ttf', 30),
+    'pixel_24': font_asset('graphics/pixelboy.ttf', 24),
+    'steph_30': font_asset('graphics/Stepalange.otf', 30),
+    'steph_24': font_asset('graphics/Stepalange.otf', 24),
+    'steph_20': font_asset('graphics/Stepalange.otf', 20),
+    'steph_15': font_asset('graphics/Stepalange.otf', 15),
+
+    # Pathway Images and Rotations
+    'pathway_hori_image': image_asset('graphics/pathway_hori.png', (55, 45)),
+    'pathway_vert_image': image_asset('graphics/pathway_vert.png', (45, 55)),
+    'orig_l_curve_image': image_asset('graphics/L_curve.png', (50, 50)),
+    't_path_image': image_asset('graphics/T_path.png', (50, 45)),
+    'all_path_image': image_asset('graphics/all_path.png', (50, 50)),
+    'l_curve_image': rotated_asset('orig_l_curve_image', 0, (50, 45)),
+    'inverse_l_image': rotated_asset('orig_l_curve_image', 90, (50, 45)),
+    'up_left_l_image': rotated_asset('orig_l_curve_image', 270),
+    'up_right_l_image': rotated_asset('orig_l_curve_image', 180, (45, 50)),
+    'upside_down_t_image': rotated_asset('t_path_image', 180),
+    'right_t_image': rotated_asset('t_path_image', 90),
+
+    # Campfire Images
+    'campfire_image': image_asset('graphics/campfire_img.png', (40, 40)),
+    'campfire_base': image_asset('graphics/campfire_base.png', (40, 40)),
+    'campfire_1': image_asset('graphics/campfire_1.png', (40, 40)),
+    'campfire_2': image_asset('graphics/campfire_2.png', (40, 40)),
+    'campfire_3': image_asset('graphics/campfire_3.png', (40, 40)),
+    'campfire_images': group_asset('campfire_image', 'campfire_1', 'campfire_2', 'campfire_3'),
+
+    # Selection Screen Images
+    'off_switch': image_asset('graphics/off_switch.png', (80, 100)),
+    'on_switch': image_asset('graphics/on_switch.png', (80, 100)),
+    'check_mark': image_asset('graphics/check_mark.png', (100, 60)),
+    'difficulty_scale': image_asset('graphics/difficulty_scale.png', (400, 80)),
+    'difficulty_check': image_asset('graphics/diff_check.png', (50, 50)),
+    'example_man': image_asset('graphics/man_down_1.png', (200, 250)),
+    'example_girl': image_asset('graphics/girl_down_1.png', (200, 250)),
+
+    'man_dead': image_asset('graphics/male_dead.png', (40, 30)),
+    'girl_dead': image_asset('graphics/girl_dead.png', (40, 30)),
+
+    # Male and Female Images
+    'man_up_0': image_asset('graphics/man_up_0.png', (30, 40)),
+    'man_up_1': image_asset('graphics/man_up_1.png', (30, 40)),
+    'man_up_2': image_asset('graphics/man_up_2.png', (30, 40)),
+    'girl_up_0': image_asset('graphics/girl_up_0.png', (30, 40)),
+    'girl_up_1': image_asset('graphics/girl_up_1.png', (30, 40)),
+    'girl_up_2': image_asset('graphics/girl_up_2.png', (30, 40)),
+
+    'man_down_0': image_asset('graphics/man_down_0.png', (30, 40)),
+    'man_down_1': image_asset('graphics/man_down_1.png', (30, 40)),
+    'man_down_2': image_asset('graphics/man_down_2.png', (30, 40)),
+    'girl_down_0': image_asset('graphics/girl_down_0.png', (30, 40)),
+    'girl_down_1': image_asset('graphics/girl_down_1.png', (30, 40)),
+    'girl_down_2': image_asset('graphics/girl_down_2.png', (30, 40)),
+
+    'man_right_0': image_asset('graphics/man_right_0.png', (30, 40)),
+    'man_right_1': image_asset('graphics/man_right_1.png', (30, 40)),
+    'man_right_2': image_asset('graphics/man_right_2.png', (30, 40)),
+    'girl_right_0': image_asset('graphics/girl_right_0.png', (30, 40)),
+    'girl_right_1': image_asset('graphics/girl_right_1.png', (30, 40)),
+    'girl_right_2': image_asset('graphics/girl_right_2.png', (30, 40)),
+
+    'man_left_0': image_asset('graphics/man_left_0.png', (30, 40)),
+    'man_left_1': image_asset('graphics/man_left_1.png', (30, 40)),
+    'man_left_2': image_asset('graphics/man_left_2.png', (30, 40)),
+    'girl_left_0': image_asset('graphics/girl_left_0.png', (30, 40)),
+    'girl_left_1': image_asset('graphics/girl_left_1.png', (30, 40)),
+    'girl_left_2': image_asset('graphics/girl_left_2.png', (30, 40)),
+
+    'man_down': group_asset('man_down_1', 'man_down_0', 'man_down_2'),
+    'man_up': group_asset('man_up_1', 'man_up_0', 'man_up_2'),
+    'man_left': group_asset('man_left_1', 'man_left_0', 'man_left_2'),
+    'man_right': group_asset('man_right_1', 'man_right_0', 'man_right_2'),
+    'man_dead1': group_asset('man_dead'),
+
+    'girl_down': group_asset('girl_down_1', 'girl_down_0', 'girl_down_2'),
+    'girl_up': group_asset('girl_up_1', 'girl_up_0', 'girl_up_2'),
+    'girl_left': group_asset('girl_left_1', 'girl_left_0', 'girl_left_2'),
+    'girl_right': group_asset('girl_right_1', 'girl_right_0', 'girl_right_2'),
+    'girl_dead1': group_asset('girl_dead'),
+
+    # GAME TILES
+    'chest_image': image_asset('graphics/chest.png', (40, 40)),
+    'sign_tile_image': image_asset('graphics/sign_tile.png', (40, 40)),
+
+    'grass_tile_image': image_asset('graphics/green_grass_tile.png', (50, 50)),
+    'flower_grass_tile_image': image_asset('graphics/flower_grass_tile.png', (50, 50)),
+    'pathway_tile_image': image_asset('graphics/pathways_tile.png', (50, 50)),
+    'individual_tree_image': image_asset('graphics/individual_tree.png', (44, 44)),
+    'water_tile_image': image_asset('graphics/water_tile.png', (50, 50)),
+    'bridge_tile_image': image_asset('graphics/bridge_tile.png', (50, 50)),
+    'hill_tile_image': image_asset('graphics/hill_tile.png', (200, 190)),
+    'red_bushes_image': image_asset('graphics/red_bushes.png', (40, 40)),
+    'white_bushes_image': image_asset('graphics/white_bushes.png', (40, 40)),
+    'purple_bushes_image': image_asset('graphics/purple_bushes.png', (40, 40)),
+    'blue_bushes_image': image_asset('graphics/blue_bushes.png', (40, 40)),
+    'tulips_image': image_asset('graphics/tulips.png', (40, 40)),
+    'ground_vern_image': image_asset('graphics/ground_vern.png', (40, 40)),
+
+    # Item Images
+    'rock_image': image_asset('graphics/rock.png', (30, 30)),
+    'w_rock_image': image_asset('graphics/w_rock_image.png', (30, 30)),
+    'blue_key_image': image_asset('graphics/blue_key.png', (15, 25)),
+    'gold_key_image': image_asset('graphics/gold_key.png', (15, 25)),
+    'copper_key_image': image_asset('graphics/copper_key.png', (15, 25)),
+    'wood_key_image': image_asset('graphics/wood_key.png', (15, 25)),
+    'matchbox_image': image_asset('graphics/matchbox.png', (30, 30)),
+    'w_matchbox_image': image_asset('graphics/w_matchbox_img.png', (30, 30)),
+    'logs_image': image_asset('graphics/logs_image.png', (40, 25)),
+    'w_logs_image': image_asset('graphics/w_logs_image.png', (40, 25)),
+    'orange_fruit_image': image_asset('graphics/orange_fruit.png', (25, 25)),
+    'pear_fruit_image': image_asset('graphics/pear_fruit.png', (25, 25)),
+    'apple_fruit_image': image_asset('graphics/apple_fruit.png', (25, 25)),
+    'w_campfire_image': image_asset('graphics/w_campfire_img.png', (90, 90)),
+    'flaregun_image': image_asset('graphics/flare_gun.png', (55, 55)),
+    'jewel_bag': image_asset('graphics/jewel_bag.png', (55, 55)),
+}
+
+ITEM_ASSETS = ['apple_fruit_image', 'orange_fruit_image', 'pear_fruit_image', 'matchbox_image', 'logs_image',
+               'rock_image', 'blue_key_image', 'gold_key_image', 'copper_key_image', 'wood_key_image',
+               'campfire_image', 'flaregun_image', 'jewel_bag']
+MAP_TILE_ASSETS = ['grass_tile_image', 'individual_tree_image', 'water_tile_image', 'chest_image', 'bridge_tile_image',
+                   'sign_tile_image', 'flower_grass_tile_image', 'red_bushes_image', 'white_bushes_image',
+                   'purple_bushes_image', 'blue_bushes_image', 'tulips_image', 'ground_vern_image',
+                   'pathway_hori_image', 'pathway_vert_image', 'l_curve_image', 'inverse_l_image', 'up_left_l_image',
+                   'up_right_l_image', 't_path_image', 'all_path_image', 'upside_down_t_image', 'right_t_image',
+                   'hill_tile_image']
+
+# The assets each screen draws. The character sprites are left out on purpose: only the chosen gender's set is
+# loaded, when the player is created.
+SCENE_ASSETS = {
+    'start': ['background_start_image', 'start_button_image', 'menu_button_image', 'exit_button_image',
+              'dash_180', 'pixel_70'],
+    'selection': ['small_button_image', 'pixel_40', 'pixel_35', 'pixel_100', 'pixel_50', 'steph_15', 'steph_20',
+                  'on_switch', 'off_switch', 'check_mark', 'difficulty_scale', 'difficulty_check', 'example_man',
+                  'example_girl'],
+    'intro': ['small_button_image', 'pixel_40', 'pixel_35', 'steph_30'],
+    'game': ['small_button_image', 'game_button', 'pixel_40', 'pixel_30', 'pixel_24', 'steph_15', 'full_heart',
+             'half_heart', 'empty_heart', 'wooden_sign1', 'wooden_sign2', 'wooden_sign3', 'campfire_images',
+             'campfire_base', *MAP_TILE_ASSETS, *ITEM_ASSETS],
+    'inventory': ['small_button_image', 'item_frame', 'item_frame1', 'pixel_150', 'pixel_40', 'steph_15',
+                  'w_matchbox_image', 'w_logs_image', 'w_rock_image', 'w_campfire_image', *ITEM_ASSETS],
+    'use': ['small_button_image', 'item_frame', 'game_button1', 'pixel_100', 'pixel_24', 'steph_15', 'steph_24',
+            'pear_fruit_image', 'apple_fruit_image', 'orange_fruit_image', 'campfire_image', 'flaregun_image'],
+    'win': ['small_button_image', 'pixel_40', 'pixel_70', 'pixel_100', 'dash_180'],
+    'gameover': ['small_button_image', 'pixel_40', 'pixel_70', 'pixel_100', 'dash_180'],
+    'menu': ['small_button_image', 'pixel_40', 'pixel_35', 'steph_15', 'steph_24'],
+}
+
+_asset_cache = {}
+asset_pack = AssetPack.open() if os.environ.get('FOREST_ASSET_PACK', '1') == '1' else None
+
+
+def load_source_asset(name) -> pygame.Surface:
+    """
+    Loads an image asset from its source files: decodes the image, then rotates and scales it.
+    """
+    spec = ASSET_MANIFEST[name]
+    if spec[0] == 'image':
+        _, path, size = spec
+        asset = pygame.image.load(path)
+    else:
+        _, base, angle, size = spec
+        asset = pygame.transform.rotate(load_asset(base), angle) if angle else load_asset(base)
+    if size is not None:
+        asset = pygame.transform.scale(asset, size)
+    return asset
+
+
+def load_asset(name):
+    """
+    Loads an asset from the manifest, or returns it from the cache.
+    """
+    if name in _asset_cache:
+        return _asset_cache[name]
+
+    spec = ASSET_MANIFEST[name]
+    kind = spec[0]
+    if kind in {'image', 'rotated'}:
+        asset = None
+        if asset_pack is not None:
+            asset = asset_pack.surface(name, asset_fingerprint(ASSET_MANIFEST, name))
+        if asset is None:
+            asset = load_source_asset(name)
+    elif kind == 'alias':
+        asset = load_asset(spec[1])
+    elif kind == 'group':
+        asset = [load_asset(member) for member in spec[1]]
+    elif kind == 'font':
+        _, path, size = spec
+        asset = pygame.font.Font(path, size)
+    else:
+        raise ValueError(f'Unknown asset kind {kind!r} for {name!r}')
+
+    _asset_cache[name] = asset
+    globals()[name] = asset
+    return asset
+
+
+def load_scene_assets(scene):
+    """
+    Loads every asset a scene needs.
+    """
+    for name in SCENE_ASSETS[scene]:
+        load_asset(name)
+
+
+def __getattr__(name):
+    """
+    Loads manifest assets the first time they are read as module attributes.
+    """
+    if name in ASSET_MANIFEST:
+        return load_asset(name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
-# Background Image
-background_start_image = pygame.transform.scale(pygame.image.load('graphics/background_start_screen.png'), window_size)
-
-# Buttons frames
-button_image = pygame.transform.scale(pygame.image.load('graphics/button_back.png'), (230, 80))
-small_button_image = pygame.transform.scale(pygame.image.load('graphics/button_back.png'), (150, 50))
-game_button = pygame.transform.scale(pygame.image.load('graphics/interact_button.png'), (130, 50))
-game_button1 = pygame.transform.scale(pygame.image.load('graphics/interact_button.png'), (90, 45))
-item_frame = pygame.transform.scale(pygame.image.load('graphics/item_frame.png'), (170, 170))
-item_frame1 = pygame.transform.scale(pygame.image.load('graphics/item_frame.png'), (120, 120))
-
-# Game Signs Images
-wooden_sign1 = pygame.transform.scale(pygame.image.load('graphics/wooden_sign1.png'), (900, 800))
-wooden_sign2 = pygame.transform.scale(pygame.image.load('graphics/wooden_sign2.png'), (900, 800))
-wooden_sign3 = pygame.transform.scale(pygame.image.load('graphics/wooden_sign3.png'), (900, 800))
-
-# Player Hearts Images
-full_heart = pygame.transform.scale(pygame.image.load('graphics/full_heart.png'), (40, 40))
-half_heart = pygame.transform.scale(pygame.image.load('graphics/half_heart.png'), (40, 40))
-empty_heart = pygame.transform.scale(pygame.image.load('graphics/empty_heart.png'), (40, 40))
 
 # Start screen rect
-start_button_image = button_image
-menu_button_image = button_image
-exit_button_image = button_image
-start_button_rect = start_button_image.get_rect()
-menu_button_rect = menu_button_image.get_rect()
-exit_button_rect = exit_button_image.get_rect()
-small_button_rect = small_button_image.get_rect()
+start_button_rect = pygame.Rect((0, 0), BUTTON_SIZE)
+menu_button_rect = pygame.Rect((0, 0), BUTTON_SIZE)
+exit_button_rect = pygame.Rect((0, 0), BUTTON_SIZE)
+small_button_rect = pygame.Rect((0, 0), SMALL_BUTTON_SIZE)
 start_button_rect.x, start_button_rect.y = window_size[0] / 2.5, 650
 menu_button_rect.x, menu_button_rect.y = window_size[0] / 2.5, 750
 exit_button_rect.x, exit_button_rect.y = window_size[0] / 2.5, 850
 
 # Game Screen rect
-game_button_size = game_button.get_size()
-small_button_size = small_button_image.get_size()
+game_button_size = GAME_BUTTON_SIZE
+small_button_size = SMALL_BUTTON_SIZE
 interact_button_rect = pygame.Rect(1350, 500, *game_button_size)
 pick_up_button_rect = pygame.Rect(1350, 600, *game_button_size)
 use_item_button_rect = pygame.Rect(1350, 700, *game_button_size)
@@ -113,146 +450,3 @@ campfire_materials = ['Matchbox', 'Logs', 'Rock']
 
 # Menu Screen Rect
 reveal_rect = pygame.Rect(1200, 750, *game_button_size)
-
-# Fonts
-dash_180 = pygame.font.Font('graphics/dashhorizon.otf', 180)
-pixel_150 = pygame.font.Font('graphics/pixelboy.ttf', 150)
-pixel_100 = pygame.font.Font('graphics/pixelboy.ttf', 100)
-pixel_70 = pygame.font.Font('graphics/pixelboy.ttf', 70)
-pixel_50 = pygame.font.Font('graphics/pixelboy.ttf', 50)
-pixel_40 = pygame.font.Font('graphics/pixelboy.ttf', 40)
-pixel_35 = pygame.font.Font('graphics/pixelboy.ttf', 35)
-pixel_30 = pygame.font.Font('graphics/pixelboy.ttf', 30)
-pixel_24 = pygame.font.Font('graphics/pixelboy.ttf', 24)
-steph_30 = pygame.font.Font('graphics/Stepalange.otf', 30)
-steph_24 = pygame.font.Font('graphics/Stepalange.otf', 24)
-steph_20 = pygame.font.Font('graphics/Stepalange.otf', 20)
-steph_15 = pygame.font.Font('graphics/Stepalange.otf', 15)
-
-# Pathway Images and Rotations
-pathway_hori_image = pygame.image.load('graphics/pathway_hori.png')
-pathway_vert_image = pygame.image.load('graphics/pathway_vert.png')
-orig_l_curve_image = pygame.image.load('graphics/L_curve.png')
-t_path_image = pygame.image.load('graphics/T_path.png')
-all_path_image = pygame.image.load('graphics/all_path.png')
-
-orig_l_curve_image = pygame.transform.scale(orig_l_curve_image, (50, 50))
-pathway_hori_image = pygame.transform.scale(pathway_hori_image, (55, 45))
-pathway_vert_image = pygame.transform.scale(pathway_vert_image, (45, 55))
-t_path_image = pygame.transform.scale(t_path_image, (50, 45))
-all_path_image = pygame.transform.scale(all_path_image, (50, 50))
-
-inverse_l_image = pygame.transform.rotate(orig_l_curve_image, 90)
-up_left_l_image = pygame.transform.rotate(orig_l_curve_image, 270)
-up_right_l_image = pygame.transform.rotate(orig_l_curve_image, 180)
-upside_down_t_image = pygame.transform.rotate(t_path_image, 180)
-right_t_image = pygame.transform.rotate(t_path_image, 90)
-
-l_curve_image = pygame.transform.scale(orig_l_curve_image, (50, 45))
-inverse_l_image = pygame.transform.scale(inverse_l_image, (50, 45))
-up_right_l_image = pygame.transform.scale(up_right_l_image, (45, 50))
-
-# Campfire Images
-campfire_image = pygame.transform.scale(pygame.image.load('graphics/campfire_img.png'), (40, 40))
-campfire_base = pygame.transform.scale(pygame.image.load('graphics/campfire_base.png'), (40, 40))
-
-campfire_images = [
-    pygame.transform.scale(pygame.image.load('graphics/campfire_img.png'), (40, 40)),
-    pygame.transform.scale(pygame.image.load('graphics/campfire_1.png'), (40, 40)),
-    pygame.transform.scale(pygame.image.load('graphics/campfire_2.png'), (40, 40)),
-    pygame.transform.scale(pygame.image.load('graphics/campfire_3.png'), (40, 40))
-]
-
-# Selection Screen Images
-off_switch = pygame.transform.scale(pygame.image.load('graphics/off_switch.png'), (80, 100))
-on_switch = pygame.transform.scale(pygame.image.load('graphics/on_switch.png'), (80, 100))
-
-check_mark = pygame.transform.scale(pygame.image.load('graphics/check_mark.png'), (100, 60))
-difficulty_scale = pygame.transform.scale(pygame.image.load('graphics/difficulty_scale.png'), (400, 80))
-difficulty_check = pygame.transform.scale(pygame.image.load('graphics/diff_check.png'), (50, 50))
-
-example_man = pygame.transform.scale(pygame.image.load('graphics/man_down_1.png'), (200, 250))
-example_girl = pygame.transform.scale(pygame.image.load('graphics/girl_down_1.png'), (200, 250))
-
-man_dead = pygame.transform.scale(pygame.image.load('graphics/male_dead.png'), (40, 30))
-girl_dead = pygame.transform.scale(pygame.image.load('graphics/girl_dead.png'), (40, 30))
-
-# Male and Female Images
-man_up_0 = pygame.transform.scale(pygame.image.load('graphics/man_up_0.png'), (30, 40))
-man_up_1 = pygame.transform.scale(pygame.image.load('graphics/man_up_1.png'), (30, 40))
-man_up_2 = pygame.transform.scale(pygame.image.load('graphics/man_up_2.png'), (30, 40))
-girl_up_0 = pygame.transform.scale(pygame.image.load('graphics/girl_up_0.png'), (30, 40))
-girl_up_1 = pygame.transform.scale(pygame.image.load('graphics/girl_up_1.png'), (30, 40))
-girl_up_2 = pygame.transform.scale(pygame.image.load('graphics/girl_up_2.png'), (30, 40))
-
-man_down_0 = pygame.transform.scale(pygame.image.load('graphics/man_down_0.png'), (30, 40))
-man_down_1 = pygame.transform.scale(pygame.image.load('graphics/man_down_1.png'), (30, 40))
-man_down_2 = pygame.transform.scale(pygame.image.load('graphics/man_down_2.png'), (30, 40))
-girl_down_0 = pygame.transform.scale(pygame.image.load('graphics/girl_down_0.png'), (30, 40))
-girl_down_1 = pygame.transform.scale(pygame.image.load('graphics/girl_down_1.png'), (30, 40))
-girl_down_2 = pygame.transform.scale(pygame.image.load('graphics/girl_down_2.png'), (30, 40))
-
-man_right_0 = pygame.transform.scale(pygame.image.load('graphics/man_right_0.png'), (30, 40))
-man_right_1 = pygame.transform.scale(pygame.image.load('graphics/man_right_1.png'), (30, 40))
-man_right_2 = pygame.transform.scale(pygame.image.load('graphics/man_right_2.png'), (30, 40))
-girl_right_0 = pygame.transform.scale(pygame.image.load('graphics/girl_right_0.png'), (30, 40))
-girl_right_1 = pygame.transform.scale(pygame.image.load('graphics/girl_right_1.png'), (30, 40))
-girl_right_2 = pygame.transform.scale(pygame.image.load('graphics/girl_right_2.png'), (30, 40))
-
-man_left_0 = pygame.transform.scale(pygame.image.load('graphics/man_left_0.png'), (30, 40))
-man_left_1 = pygame.transform.scale(pygame.image.load('graphics/man_left_1.png'), (30, 40))
-man_left_2 = pygame.transform.scale(pygame.image.load('graphics/man_left_2.png'), (30, 40))
-girl_left_0 = pygame.transform.scale(pygame.image.load('graphics/girl_left_0.png'), (30, 40))
-girl_left_1 = pygame.transform.scale(pygame.image.load('graphics/girl_left_1.png'), (30, 40))
-girl_left_2 = pygame.transform.scale(pygame.image.load('graphics/girl_left_2.png'), (30, 40))
-
-man_down = [man_down_1, man_down_0, man_down_2]
-man_up = [man_up_1, man_up_0, man_up_2]
-man_left = [man_left_1, man_left_0, man_left_2]
-man_right = [man_right_1, man_right_0, man_right_2]
-man_dead1 = [man_dead]
-
-girl_down = [girl_down_1, girl_down_0, girl_down_2]
-girl_up = [girl_up_1, girl_up_0, girl_up_2]
-girl_left = [girl_left_1, girl_left_0, girl_left_2]
-girl_right = [girl_right_1, girl_right_0, girl_right_2]
-girl_dead1 = [girl_dead]
-
-
-# GAME TILES
-
-chest_image = pygame.transform.scale(pygame.image.load('graphics/chest.png'), (40, 40))
-sign_tile_image = pygame.transform.scale(pygame.image.load('graphics/sign_tile.png'), (40, 40))
-
-grass_tile_image = pygame.transform.scale(pygame.image.load('graphics/green_grass_tile.png'), (50, 50))
-flower_grass_tile_image = pygame.transform.scale(pygame.image.load('graphics/flower_grass_tile.png'), (50, 50))
-pathway_tile_image = pygame.transform.scale(pygame.image.load('graphics/pathways_tile.png'), (50, 50))
-individual_tree_image = pygame.transform.scale(pygame.image.load('graphics/individual_tree.png'), (44, 44))
-water_tile_image = pygame.transform.scale(pygame.image.load('graphics/water_tile.png'), (50, 50))
-bridge_tile_image = pygame.transform.scale(pygame.image.load('graphics/bridge_tile.png'), (50, 50))
-hill_tile_image = pygame.transform.scale(pygame.image.load('graphics/hill_tile.png'), (200, 190))
-red_bushes_image = pygame.transform.scale(pygame.image.load('graphics/red_bushes.png'), (40, 40))
-white_bushes_image = pygame.transform.scale(pygame.image.load('graphics/white_bushes.png'), (40, 40))
-purple_bushes_image = pygame.transform.scale(pygame.image.load('graphics/purple_bushes.png'), (40, 40))
-blue_bushes_image = pygame.transform.scale(pygame.image.load('graphics/blue_bushes.png'), (40, 40))
-tulips_image = pygame.transform.scale(pygame.image.load('graphics/tulips.png'), (40, 40))
-ground_vern_image = pygame.transform.scale(pygame.image.load('graphics/ground_vern.png'), (40, 40))
-
-
-# Item Images
-rock_image = pygame.transform.scale(pygame.image.load('graphics/rock.png'), (30, 30))
-w_rock_image = pygame.transform.scale(pygame.image.load('graphics/w_rock_image.png'), (30, 30))
-blue_key_image = pygame.transform.scale(pygame.image.load('graphics/blue_key.png'), (15, 25))
-gold_key_image = pygame.transform.scale(pygame.image.load('graphics/gold_key.png'), (15, 25))
-copper_key_image = pygame.transform.scale(pygame.image.load('graphics/copper_key.png'), (15, 25))
-wood_key_image = pygame.transform.scale(pygame.image.load('graphics/wood_key.png'), (15, 25))
-matchbox_image = pygame.transform.scale(pygame.image.load('graphics/matchbox.png'), (30, 30))
-w_matchbox_image = pygame.transform.scale(pygame.image.load('graphics/w_matchbox_img.png'), (30, 30))
-logs_image = pygame.transform.scale(pygame.image.load('graphics/logs_image.png'), (40, 25))
-w_logs_image = pygame.transform.scale(pygame.image.load('graphics/w_logs_image.png'), (40, 25))
-orange_fruit_image = pygame.transform.scale(pygame.image.load('graphics/orange_fruit.png'), (25, 25))
-pear_fruit_image = pygame.transform.scale(pygame.image.load('graphics/pear_fruit.png'), (25, 25))
-apple_fruit_image = pygame.transform.scale(pygame.image.load('graphics/apple_fruit.png'), (25, 25))
-w_campfire_image = pygame.transform.scale(pygame.image.load('graphics/w_campfire_img.png'), (90, 90))
-flaregun_image = pygame.transform.scale(pygame.image.load('graphics/flare_gun.png'), (55, 55))
-jewel_bag = pygame.transform.scale(pygame.image.load('graphics/jewel_bag.png'), (55, 55))
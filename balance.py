@@ -0,0 +1,247 @@
+"""
+This module plays many randomised games headlessly (see simulation.py) for every combination of map,
+difficulty and dark mode, across a pool of processes, to show how hard each difficulty is.
+
+Every game shuffles the items with its own seed and is played by a bot that walks the shortest way to what it
+needs (see reachability.Navigator): the four keys, or every item with the 'all' strategy, then the chest and
+the flare site. It stops to think for a random time between actions, eats fruit when it has lost more than a
+fruit's worth of health and crafts and sits by the campfire when its health runs low. In dark mode it only
+knows about the items, the chest and the flare site it has seen in the light around it, and explores the
+nearest unseen cells until it finds them.
+
+For every combination the report gives the share of games won, the time to win and the lowest health reached
+along the way, the health margin, as percentiles.
+
+Run the simulator with:
+    python balance.py [--runs N] [--maps map1 map2 ...] [--difficulties easy medium hard] [--dark on|off|both]
+                      [--interval DIFFICULTY=MILLISECONDS ...] [--strategy keys|all] [--think SECONDS]
+                      [--workers N] [--json FILE]
+
+Functions:
+- visible_offsets: Returns the cell offsets lit by a light of a radius.
+- get_navigator: Returns the navigator of a map, shared by every game in a process.
+- play: Plays one game with the bot and returns how it went.
+- play_batch: Plays the games of a batch.
+- percentiles: Returns percentiles of a list of values.
+- summarise: Returns the report of the games of one combination.
+- main: Plays the games of every combination across a process pool and prints the report.
+"""
+import argparse
+import itertools
+import json
+import math
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from lighting import LIGHT_RADII
+from reachability import *
+from simulation import *
+
+PERCENTILES = [5, 25, 50, 75, 95]
+HISTOGRAM_BIN = 10
+BATCH_SIZE = 50
+
+# The navigator and the reachable cells of every map a process has played on
+navigators = {}
+reachable = {}
+
+
+def visible_offsets(radius: int) -> list[tuple[int, int]]:
+    """
+    Returns the offsets of the cells lit by a light of a radius around the player's cell: the cells whose centre
+    is less than half a tile further than the radius.
+    """
+    reach = int(radius / TILE_SIZE) + 1
+    return [(offset_x, offset_y) for offset_x in range(-reach, reach + 1) for offset_y in range(-reach, reach + 1)
+            if math.hypot(offset_x, offset_y) * TILE_SIZE <= radius + TILE_SIZE / 2]
+
+
+def get_navigator(game_map) -> Navigator:
+    """
+    Returns the navigator of a map, shared by every game played on the map in this process, and works out the
+    cells of the map the player can reach.
+    """
+    if game_map.name not in navigators:
+        navigators[game_map.name] = Navigator(game_map)
+        reachable[game_map.name] = frozenset(reachable_cells(game_map))
+    return navigators[game_map.name]
+
+
+def play(map_name: str, difficulty: str, dark_mode: bool, seed: int, interval: int = None, strategy: str = 'keys',
+         think: float = 1.0) -> dict:
+    """
+    Plays one game with the bot and returns whether it was won or lost, or the bot got stuck, the seconds it
+    took and the lowest and final health.
+    """
+    simulation = new_game(map_name, difficulty, seed, dark_mode=dark_mode)
+    if interval is not None:
+        simulation.health_decrement_interval = interval
+    rng = random.Random(seed)
+    player, game_state = simulation.player, simulation.game_state
+    navigator = get_navigator(simulation.game_map)
+    rows = simulation.game_map.to_rows()
+    sites = {tile: {(x, y) for y, row in enumerate(rows) for x, code in enumerate(row) if code == tile}
+             for tile in (CHEST_TILE, FLARE_TILE)}
+    unseen = set(reachable[simulation.game_map.name]) if dark_mode else set()
+    offsets = visible_offsets(LIGHT_RADII[difficulty])
+    lowest = player.health
+
+    def position():
+        return player.player_x, player.player_y
+
+    def look(path):
+        for node in path:
+            for cell_x, cell_y in navigator.foot_cells(node):
+                unseen.difference_update((cell_x + offset_x, cell_y + offset_y) for offset_x, offset_y in offsets)
+
+    def walk_to(path, cell):
+        nonlocal lowest
+        look(path[:1])
+        for direction, pixels in navigator.walk(position(), path, cell):
+            simulation.run(pixels, {direction})
+            lowest = min(lowest, player.health)
+            if simulation.over:
+                return
+        look(path)
+
+    def pause():
+        nonlocal lowest
+        simulation.run(round(rng.expovariate(1 / think) / SIMULATION_STEP) if think else 0)
+        lowest = min(lowest, player.health)
+
+    while not simulation.over:
+        if player.health <= MAX_HEALTH - FRUIT_HEALTH:
+            fruit = next((fruit for fruit in FRUITS if fruit in player.inventory), None)
+            if fruit is not None:
+                simulation.eat(fruit)
+                pause()
+                continue
+        if 'Campfire' not in player.inventory:
+            simulation.craft_campfire()
+        if 'Campfire' in player.inventory and player.health <= 3 and simulation.place_campfire() == 'campfire':
+            while game_state.is_campfire() and not simulation.over and player.health <= MAX_HEALTH:
+                simulation.step()
+            continue
+
+        if 'FlareGun' in player.inventory:
+            wanted, action = sites[FLARE_TILE], simulation.fire_flare
+        elif all(key in player.inventory for key in CHEST_KEYS):
+            wanted, action = sites[CHEST_TILE], simulation.interact
+        else:
+            wanted = {cell for cell, item in game_state.items.items()
+                      if strategy == 'all' or item.name in CHEST_KEYS}
+            action = simulation.pick_up
+        known = {cell for cell in wanted if cell not in unseen}
+
+        if known:
+            distances = {cell: navigator.distance(position(), cell) for cell in known}
+            cell = min(known, key=lambda cell: (distances[cell] is None, distances[cell] or 0, cell))
+            path = navigator.path_to(position(), cell)
+            if path is None:
+                break
+            walk_to(path, cell)
+            if not simulation.over:
+                action()
+                pause()
+        else:
+            cell, path = navigator.path_to_nearest(position(), unseen)
+            if path is None:
+                break
+            walk_to(path, cell)
+
+    return {'outcome': 'won' if simulation.won else 'lost' if simulation.lost else 'stuck',
+            'seconds': simulation.clock.now() / 1000, 'lowest health': lowest, 'health': player.health}
+
+
+def play_batch(job) -> list[dict]:
+    """
+    Plays the games of a (map, difficulty, dark mode, seeds, interval, strategy, think) batch.
+    """
+    map_name, difficulty, dark_mode, seeds, interval, strategy, think = job
+    return [play(map_name, difficulty, dark_mode, seed, interval, strategy, think) for seed in seeds]
+
+
+def percentiles(values, points=PERCENTILES) -> dict[str, float]:
+    """
+    Returns percentiles of a list of values, by the nearest rank, or an empty dict if there are none.
+    """
+    values = sorted(values)
+    if not values:
+        return {}
+    return {f'p{point}': values[min(len(values) - 1, max(0, math.ceil(point / 100 * len(values)) - 1))]
+            for point in points}
+
+
+def summarise(games: list[dict]) -> dict:
+    """
+    Returns the report of the games of one combination: the share won, lost and stuck, the time to win as
+    percentiles and a histogram of HISTOGRAM_BIN second bins, and the lowest health reached as percentiles.
+    """
+    times = [game['seconds'] for game in games if game['outcome'] == 'won']
+    histogram = {}
+    for seconds in times:
+        start = int(seconds // HISTOGRAM_BIN * HISTOGRAM_BIN)
+        histogram[start] = histogram.get(start, 0) + 1
+    return {'runs': len(games),
+            'won': sum(game['outcome'] == 'won' for game in games) / len(games),
+            'lost': sum(game['outcome'] == 'lost' for game in games) / len(games),
+            'stuck': sum(game['outcome'] == 'stuck' for game in games) / len(games),
+            'time to win': percentiles(times),
+            'time to win histogram': {f'{start}-{start + HISTOGRAM_BIN}': count
+                                      for start, count in sorted(histogram.items())},
+            'health margin': percentiles([game['lowest health'] for game in games])}
+
+
+def main(arguments=None):
+    """
+    Plays the games of every combination across a process pool and prints the report.
+    """
+    parser = argparse.ArgumentParser(description='Simulate Forest of Echoes games to balance the difficulties.')
+    parser.add_argument('--runs', type=int, default=1000, help='games per combination')
+    parser.add_argument('--maps', nargs='+', default=['map1', 'map2', 'map3'])
+    parser.add_argument('--difficulties', nargs='+', choices=list(LIGHT_RADII), default=list(LIGHT_RADII))
+    parser.add_argument('--dark', choices=['on', 'off', 'both'], default='both')
+    parser.add_argument('--interval', nargs='*', default=[], metavar='DIFFICULTY=MILLISECONDS',
+                        help='health decrement intervals to try instead of the game\'s')
+    parser.add_argument('--strategy', choices=['keys', 'all'], default='keys')
+    parser.add_argument('--think', type=float, default=1.0, help='mean seconds the bot thinks between actions')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--json', help='write the report to this file')
+    options = parser.parse_args(arguments)
+
+    intervals = {difficulty: int(milliseconds) for difficulty, milliseconds in
+                 (interval.split('=') for interval in options.interval)}
+    dark_modes = {'on': [True], 'off': [False], 'both': [False, True]}[options.dark]
+    combinations = list(itertools.product(options.maps, options.difficulties, dark_modes))
+    jobs = [(map_name, difficulty, dark_mode, range(start, min(start + BATCH_SIZE, options.seed + options.runs)),
+             intervals.get(difficulty), options.strategy, options.think)
+            for map_name, difficulty, dark_mode in combinations
+            for start in range(options.seed, options.seed + options.runs, BATCH_SIZE)]
+
+    games = {combination: [] for combination in combinations}
+    with ProcessPoolExecutor(options.workers) as pool:
+        for job, batch in zip(jobs, pool.map(play_batch, jobs)):
+            games[job[:3]].extend(batch)
+
+    report = []
+    print(f'{"map":<8}{"difficulty":<11}{"dark":<6}{"won":>7}{"lost":>7}{"stuck":>7}   '
+          f'{"time to win p5/p50/p95":<26}{"health margin p5/p50":<20}')
+    for (map_name, difficulty, dark_mode), combination_games in games.items():
+        summary = summarise(combination_games)
+        report.append({'map': map_name, 'difficulty': difficulty, 'dark mode': dark_mode,
+                       'interval': intervals.get(difficulty, HEALTH_DECREMENT_INTERVALS[difficulty]), **summary})
+        times = summary['time to win']
+        margin = summary['health margin']
+        time_text = f'{times["p5"]:.0f}/{times["p50"]:.0f}/{times["p95"]:.0f} s' if times else '-'
+        print(f'{map_name:<8}{difficulty:<11}{"on" if dark_mode else "off":<6}{summary["won"]:>7.1%}'
+              f'{summary["lost"]:>7.1%}{summary["stuck"]:>7.1%}   {time_text:<26}'
+              f'{margin["p5"]:.1f}/{margin["p50"]:.1f}')
+    if options.json:
+        with open(options.json, 'w') as json_file:
+            json.dump(report, json_file, indent=1)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,58 @@
+"""
+Measures the time to load every scene's assets from the asset pack and from the source images.
+
+Run from anywhere with:
+    python benchmarks/asset_load_time.py [runs]
+
+Build the pack first with python assetpack.py. Every run is a fresh interpreter.
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LOAD_ALL = '''
+import time
+import pygame
+start = time.perf_counter()
+import assets
+decodes = []
+load = pygame.image.load
+pygame.image.load = lambda *args: decodes.append(args) or load(*args)
+for scene in assets.SCENE_ASSETS:
+    assets.load_scene_assets(scene)
+for gender in ('man', 'girl'):
+    for direction in ('down', 'up', 'left', 'right', 'dead1'):
+        assets.load_asset(f'{gender}_{direction}')
+print(time.perf_counter() - start, len(decodes))
+'''
+
+
+def load_all(use_pack) -> tuple[float, int]:
+    """
+    Returns the seconds a fresh interpreter needs to import assets.py and load every asset, and the number of
+    image files it decoded.
+    """
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy', PYGAME_HIDE_SUPPORT_PROMPT='1',
+               FOREST_ASSET_PACK='1' if use_pack else '0')
+    result = subprocess.run([sys.executable, '-c', LOAD_ALL], cwd=ROOT, env=env, capture_output=True, text=True,
+                            check=True)
+    seconds, decodes = result.stdout.split()
+    return float(seconds), int(decodes)
+
+
+def main():
+    """
+    Prints the median load time with and without the pack.
+    """
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    for label, use_pack in (('source images', False), ('asset pack', True)):
+        results = [load_all(use_pack) for _ in range(runs)]
+        median = statistics.median(seconds for seconds, _ in results)
+        print(f'{label}: median {median * 1000:.0f} ms, {results[0][1]} image decodes')
+
+
+if __name__ == '__main__':
+    main()
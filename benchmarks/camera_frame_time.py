@@ -0,0 +1,79 @@
+"""
+Measures the frame time of display_map while the player crosses maps of growing size, from the shipped 22x14
+maps to a synthetic 2000x2000 map.
+
+Run from anywhere with:
+    python benchmarks/camera_frame_time.py [frames]
+
+The player moves 4 pixels right and 3 down every frame, so on the synthetic maps the camera scrolls every
+frame and the cached map layer is rebuilt every few cells. The synthetic maps are random mixes of the tiles
+of the shipped maps with a hill in the top-right corner.
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('FOREST_HEADLESS', '1')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from set import *
+
+SYNTHETIC_SIZES = [200, 2000]
+
+
+def synthetic_map(size) -> MapGrid:
+    """
+    Returns a square map of random tiles with a 4x4 hill in the top-right corner.
+    """
+    codes = [1] * 12 + [0, 2, 5, 10, 11, 12, 20, 21, 27]
+    tiles = bytearray(random.choice(codes) for _ in range(size * size))
+    for y in range(4):
+        for x in range(size - 4, size):
+            tiles[y * size + x] = HILL_TILE
+    return MapGrid(f'synthetic{size}', size, size, tiles)
+
+
+def time_frames(player, screen, game_state, frames) -> tuple[float, float]:
+    """
+    Returns the mean and the slowest frame time of display_map in milliseconds.
+    """
+    times = []
+    for _ in range(frames):
+        player.save_position()
+        player.player_x += 4
+        player.player_y += 3
+        start = time.perf_counter()
+        display_map(player, screen, game_state)
+        times.append(time.perf_counter() - start)
+    return sum(times) * 1000 / frames, max(times) * 1000
+
+
+def main():
+    """
+    Prints the display_map frame times for every map size.
+    """
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    random.seed(16)
+    screen = init_display()
+    game_state = GameState()
+    game_state.set_gender('male')
+    game_state.map_selector('map1')
+    maps = [load_game_map(game_state)] + [synthetic_map(size) for size in SYNTHETIC_SIZES]
+
+    for grid in maps:
+        game_state.map = grid.name
+        game_state.map_grid = grid
+        game_state.map_layer = None
+        if grid.name != 'map1':
+            game_state.items = {}
+        player = initialize_player(game_state)
+        display_map(player, screen, game_state)
+        mean, slowest = time_frames(player, screen, game_state, frames)
+        print(f'{grid.name} ({grid.width}x{grid.height}): {mean:.3f} ms/frame, slowest {slowest:.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Measures chunk streaming while the player walks across chunked maps of growing size: the chunks held in
+memory, the lookups answered from memory and from disk, the chunks loaded ahead by the loader thread and the
+chunk load latency.
+
+Run from anywhere with:
+    python benchmarks/chunk_streaming.py [frames]
+
+The synthetic maps are written to a temporary directory. Every frame moves the player 10 pixels right and 7
+down, streams the chunks around it, runs the collision check at its position and draws the map, as the game
+screen does.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('FOREST_HEADLESS', '1')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from set import *
+from mapformat import chunked_map_path, write_chunked_map
+
+SYNTHETIC_SIZES = [100, 1000, 4000]
+
+
+def main():
+    """
+    Prints the streaming statistics and frame time for every map size.
+    """
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    random.seed(17)
+    screen = init_display()
+    codes = bytes([1] * 12 + [0, 2, 5, 10, 11, 12, 20, 21, 27])
+    with tempfile.TemporaryDirectory() as directory:
+        for size in SYNTHETIC_SIZES:
+            name = os.path.join(directory, f'synthetic{size}')
+            write_chunked_map(chunked_map_path(name), size, size, bytes(random.choices(codes, k=size * size)),
+                              BLOCKED_TILES)
+
+            game_state = GameState()
+            game_state.set_gender('male')
+            game_state.map = name
+            game_state.items = {}
+            player = initialize_player(game_state)
+            game_map = load_game_map(game_state)
+            peak_chunks = 0
+            start = time.perf_counter()
+            for _ in range(frames):
+                player.save_position()
+                player.player_x += 10
+                player.player_y += 7
+                game_map.stream(player.get_player_grid_location())
+                player.can_stand_at(game_map, player.player_x, player.player_y)
+                display_map(player, screen, game_state)
+                peak_chunks = max(peak_chunks, len(game_map.chunks))
+            frame_time = (time.perf_counter() - start) * 1000 / frames
+
+            statistics = game_map.statistics()
+            chunk_bytes = 2 * game_map.chunk_size ** 2
+            print(f'{size}x{size}: {frame_time:.3f} ms/frame, peak {peak_chunks} chunks '
+                  f'({peak_chunks * chunk_bytes / 1024:.0f} KiB of {size * size * 2 / 1024:.0f} KiB), '
+                  f'{statistics["Hits"]} hits, {statistics["Misses"]} misses, {statistics["Prefetches"]} prefetched, '
+                  f'{statistics["Evictions"]} evicted, load {statistics["Mean Load"] * 1e6:.0f} us mean / '
+                  f'{statistics["Slowest Load"] * 1e6:.0f} us slowest')
+            game_state.close_map()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Measures the cold-start time from interpreter start to the first presented start-screen frame.
+
+Run from anywhere with:
+    python benchmarks/cold_start.py [runs] [repository root]
+
+Every run is a fresh interpreter, so nothing is cached between runs. Passing the root of another checkout
+measures that tree instead, which is how before/after figures are compared.
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIRST_FRAME = '''
+import time
+start = time.perf_counter()
+from set import *
+screen = init_display() if 'init_display' in globals() else screen
+display_start(screen)
+pygame.display.flip()
+print(time.perf_counter() - start)
+'''
+
+
+def cold_start(root) -> float:
+    """
+    Returns the seconds a fresh interpreter needs to import the game and present the start screen.
+    """
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy', PYGAME_HIDE_SUPPORT_PROMPT='1')
+    result = subprocess.run([sys.executable, '-c', FIRST_FRAME], cwd=root, env=env, capture_output=True,
+                            text=True, check=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    """
+    Prints the median and best cold-start time over several runs.
+    """
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    root = os.path.abspath(sys.argv[2]) if len(sys.argv) > 2 else ROOT
+    times = [cold_start(root) for _ in range(runs)]
+    print(f'{root}: median {statistics.median(times) * 1000:.0f} ms, best {min(times) * 1000:.0f} ms '
+          f'over {runs} runs')
+
+
+if __name__ == '__main__':
+    main()
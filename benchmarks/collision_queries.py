@@ -0,0 +1,95 @@
+"""
+Measures collision queries per second with the passability bitmap, against the collision check the game
+used before it: list-of-rows lookups against a list literal, one pixel at a time.
+
+Run from anywhere with:
+    python benchmarks/collision_queries.py [queries]
+
+Before timing, every sweep is checked against walking the same distance one pixel at a time with the old
+check, so the figures only count if both paths agree.
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('FOREST_HEADLESS', '1')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from set import *
+
+DIRECTIONS = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+
+
+def old_can_stand_at(game_map, new_x, new_y) -> bool:
+    """
+    The collision check the game used before the passability bitmap.
+    """
+    grid_x_right = (new_x - 180) // 50
+    grid_y_bottom = (new_y - 60) // 50
+    grid_x_left = (new_x - 195) // 50
+    grid_y_top = (new_y - 75) // 50
+    return game_map[grid_y_bottom][grid_x_right] not in [0, 2, 98] and game_map[grid_y_top][grid_x_left] not in [
+        0, 2, 98]
+
+
+def old_walk(game_map, x, y, step_x, step_y, distance) -> int:
+    """
+    Walks one pixel at a time with the old check and returns the pixels walked.
+    """
+    for moved in range(distance):
+        if not old_can_stand_at(game_map, x + step_x * (moved + 1), y + step_y * (moved + 1)):
+            return moved
+    return distance
+
+
+def rate(queries, function, *args) -> float:
+    """
+    Returns the number of calls of the function per second.
+    """
+    start = time.perf_counter()
+    for _ in range(queries):
+        function(*args)
+    return queries / (time.perf_counter() - start)
+
+
+def main():
+    """
+    Prints the point query and sweep rates of both paths for every map.
+    """
+    queries = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    random.seed(14)
+    game_state = GameState()
+    game_state.set_gender('male')
+    for map_name in ['map1', 'map2', 'map3']:
+        game_state.map_selector(map_name)
+        grid = load_game_map(game_state)
+        rows = grid.to_rows()
+        player = initialize_player(game_state)
+
+        starts = []
+        while len(starts) < 200:
+            x, y = random.randrange(250, 1250), random.randrange(150, 760)
+            if old_can_stand_at(rows, x, y):
+                starts.append((x, y))
+        for x, y in starts:
+            player.player_x, player.player_y = x, y
+            for step_x, step_y in DIRECTIONS:
+                for distance in (1, 7, 50, 400):
+                    assert player.sweep(grid, step_x, step_y, distance) == old_walk(rows, x, y, step_x, step_y,
+                                                                                    distance)
+
+        x, y = starts[0]
+        player.player_x, player.player_y = x, y
+        old_point = rate(queries, old_can_stand_at, rows, x, y)
+        new_point = rate(queries, player.can_stand_at, grid, x, y)
+        old_sweep = rate(queries // 50, old_walk, rows, x, y, 1, 0, 200)
+        new_sweep = rate(queries // 50, player.sweep, grid, 1, 0, 200)
+        print(f'{map_name}: point queries {old_point / 1e6:.2f}M/s before, {new_point / 1e6:.2f}M/s after; '
+              f'200 px sweeps {old_sweep / 1e3:.1f}k/s before, {new_sweep / 1e3:.1f}k/s after')
+
+
+if __name__ == '__main__':
+    main()
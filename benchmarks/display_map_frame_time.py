@@ -0,0 +1,64 @@
+"""
+Measures the frame time of display_map with and without the cached static map layer.
+
+Run from anywhere with:
+    python benchmarks/display_map_frame_time.py [frames]
+
+The uncached figure repeats what display_map did before the layer cache: read and parse the map file,
+then blit the grass grid and every tile on each frame.
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from set import *
+
+
+def uncached_frame(player, screen, game_state):
+    """
+    Draws one map frame the way display_map did before the static layer cache.
+    """
+    with open(game_state.current_map(), 'r') as map_file:
+        game_map = load_map(map_file)
+    camera = game_state.camera
+    draw_map_tiles(screen, MapGrid.from_rows(game_map), pygame.Rect(camera.to_world(0, 0), camera.view.bottomright),
+                   camera.world_view())
+    for (x, y), item in game_state.items.items():
+        screen.blit(get_item_image(item.name), (210 + (x * 50), 110 + (y * 50)))
+    screen.blit(player.current_image, (player.player_x, player.player_y))
+
+
+def time_frames(draw, frames, *args) -> float:
+    """
+    Returns the mean time in milliseconds of drawing the given number of frames.
+    """
+    start = time.perf_counter()
+    for _ in range(frames):
+        draw(*args)
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def main():
+    """
+    Prints the uncached and cached display_map frame times for every map.
+    """
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    screen = init_display()
+    game_state = GameState()
+    game_state.set_gender('male')
+    for map_name in ['map1', 'map2', 'map3']:
+        game_state.map_selector(map_name)
+        player = initialize_player(game_state)
+        before = time_frames(uncached_frame, frames, player, screen, game_state)
+        after = time_frames(display_map, frames, player, screen, game_state)
+        print(f'{map_name}: before {before:.3f} ms/frame, after {after:.3f} ms/frame ({before / after:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
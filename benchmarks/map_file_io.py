@@ -0,0 +1,105 @@
+"""
+Counts how often the map file is opened per game frame and per map-dependent click.
+
+Run from anywhere with:
+    python benchmarks/map_file_io.py [frames] [repository root]
+
+A frame draws the map and moves the player one simulation step. The clicks are the interact button, placing a
+campfire and firing the flare gun, which all look up the tile under the player. Passing the root of another
+checkout measures that tree instead.
+"""
+import builtins
+import os
+import sys
+import time
+
+os.environ.setdefault('FOREST_HEADLESS', '1')
+ROOT = sys.argv[2] if len(sys.argv) > 2 else os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from set import *
+
+MAP_FILES = {'map1', 'map2', 'map3'}
+
+
+class OpenCounter:
+    """
+    Counts the map files opened while it is installed.
+
+    Instance Attributes:
+    - opens: the number of map files opened
+    """
+    opens: int
+
+    def __init__(self) -> None:
+        self.opens = 0
+        self.open = builtins.open
+
+    def __enter__(self):
+        def counting_open(file, *args, **kwargs):
+            if os.path.basename(str(file)) in MAP_FILES:
+                self.opens += 1
+            return self.open(file, *args, **kwargs)
+
+        builtins.open = counting_open
+        return self
+
+    def __exit__(self, *exc_info):
+        builtins.open = self.open
+
+
+class HeldKeys:
+    """
+    Stands in for pygame.key.get_pressed() with a fixed set of keys held down.
+
+    Instance Attributes:
+    - held: the keys held down
+    """
+    held: set[int]
+
+    def __init__(self, *held: int) -> None:
+        self.held = set(held)
+
+    def __getitem__(self, key: int) -> bool:
+        return key in self.held
+
+
+def main():
+    """
+    Prints the map file opens and time per frame and per click for every map.
+    """
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    screen = init_display() if 'init_display' in globals() else globals()['screen']
+    game_state = GameState()
+    game_state.set_gender('male')
+    for map_name in ['map1', 'map2', 'map3']:
+        game_state.map_selector(map_name)
+        player = initialize_player(game_state)
+        game_map = load_game_map(game_state)
+        get_map_layer(game_state)
+        keys = HeldKeys(pygame.K_s)
+
+        with OpenCounter() as counter:
+            start = time.perf_counter()
+            for _ in range(frames):
+                player.handle_movement(game_map, 1 / 120, keys)
+                display_map(player, screen, game_state)
+            frame_time = (time.perf_counter() - start) * 1000 / frames
+        frame_opens = counter.opens / frames
+
+        with OpenCounter() as counter:
+            start = time.perf_counter()
+            for _ in range(frames):
+                interact_checker(player, game_state)
+                campfire_valid_loc(player.get_player_grid_code(game_state))
+                player.get_player_grid_code(game_state) == 77
+            click_time = (time.perf_counter() - start) * 1000 / (3 * frames)
+        click_opens = counter.opens / (3 * frames)
+
+        print(f'{map_name}: {frame_opens:.2f} map opens/frame ({frame_time:.3f} ms), '
+              f'{click_opens:.2f} map opens/click ({click_time:.4f} ms)')
+
+
+if __name__ == '__main__':
+    main()
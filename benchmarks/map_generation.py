@@ -0,0 +1,48 @@
+"""
+Measures how fast mapgen.py generates and writes solvable maps of growing size and difficulty, in one
+process and across a process pool.
+
+Run from anywhere with:
+    python benchmarks/map_generation.py [count]
+
+The maps are written to a temporary directory.
+"""
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from mapgen import *
+
+SIZES = [(22, 14), (60, 40), (150, 100)]
+
+
+def main():
+    """
+    Prints the maps generated per second for every size and difficulty, serially and across the pool.
+    """
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    workers = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as directory, ProcessPoolExecutor(workers) as pool:
+        for width, height in SIZES:
+            for difficulty in DIFFICULTIES:
+                jobs = [(seed, width, height, difficulty, directory) for seed in range(count)]
+                start = time.perf_counter()
+                for job in jobs:
+                    generate_and_write(job)
+                serial = time.perf_counter() - start
+
+                start = time.perf_counter()
+                list(pool.map(generate_and_write, jobs, chunksize=max(1, count // (4 * workers))))
+                parallel = time.perf_counter() - start
+                print(f'{width}x{height} {difficulty}: {count / serial:.0f} maps/s in one process, '
+                      f'{count / parallel:.0f} maps/s across {workers} workers')
+
+
+if __name__ == '__main__':
+    main()
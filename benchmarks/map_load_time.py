@@ -0,0 +1,94 @@
+"""
+Measures how long a map takes to load from the text format and from the binary map format, for the shipped
+maps and for synthetic maps of growing size.
+
+Run from anywhere with:
+    python benchmarks/map_load_time.py [repeats]
+
+The synthetic maps are written to a temporary directory in both formats. Every binary load is checked against
+the text load of the same map, so the figures only count if both formats give the same grid.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('FOREST_HEADLESS', '1')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from data import *
+from mapformat import convert_map
+
+SYNTHETIC_SIZES = [100, 300, 1000]
+
+
+def load_text(path) -> MapGrid:
+    """
+    Parses a text map.
+    """
+    with open(path, 'r') as map_data:
+        return MapGrid.parse(map_data, path)
+
+
+def load_binary(path) -> MapGrid:
+    """
+    Memory-maps the binary version of a map.
+    """
+    return MapGrid.from_binary(MapFile(binary_map_path(path)), path)
+
+
+def best_time(repeats, function, *args) -> float:
+    """
+    Returns the fastest of several calls of the function, in milliseconds.
+    """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(*args)
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def write_synthetic_map(path, size):
+    """
+    Writes a square text map of random tile codes from the shipped maps.
+    """
+    codes = [0, 1, 2, 3, 4, 5, 9, 10, 11, 77, 98]
+    with open(path, 'w') as map_data:
+        for _ in range(size):
+            map_data.write(' '.join(str(random.choice(codes)) for _ in range(size)) + '\n')
+
+
+def main():
+    """
+    Prints the load time of every map in both formats.
+    """
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    random.seed(15)
+    with tempfile.TemporaryDirectory() as directory:
+        maps = []
+        for map_name in ['map1', 'map2', 'map3']:
+            path = os.path.join(directory, map_name)
+            with open(map_name, 'r') as source, open(path, 'w') as copy:
+                copy.write(source.read())
+            maps.append((map_name, path))
+        for size in SYNTHETIC_SIZES:
+            path = os.path.join(directory, f'synthetic{size}')
+            write_synthetic_map(path, size)
+            maps.append((f'{size}x{size}', path))
+
+        for label, path in maps:
+            convert_map(path)
+            text_grid, binary_grid = load_text(path), load_binary(path)
+            assert text_grid.tiles == binary_grid.tiles and text_grid.passable == binary_grid.passable
+            text_time = best_time(repeats, load_text, path)
+            binary_time = best_time(repeats, load_binary, path)
+            print(f'{label}: text {text_time:.3f} ms, binary {binary_time:.3f} ms '
+                  f'({text_time / binary_time:.0f}x faster)')
+
+
+if __name__ == '__main__':
+    main()
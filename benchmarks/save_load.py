@@ -0,0 +1,68 @@
+"""
+Measures how long saving and loading a game session takes (see savegame.py): copying the session on the game's
+thread, encoding and writing it on the save writer's thread, memory-mapping and decoding a save, and restoring
+it into a running game, on each of the shipped maps part way through a game.
+
+Run from anywhere with:
+    python benchmarks/save_load.py [repeats]
+"""
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from savegame import *
+
+
+def timed(action, repeats: int) -> tuple[float, float]:
+    """
+    Runs an action a number of times and returns the mean and slowest milliseconds it took.
+    """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        action()
+        times.append((time.perf_counter() - start) * 1000)
+    return sum(times) / len(times), max(times)
+
+
+def main():
+    """
+    Prints the mean and slowest milliseconds of every part of saving and loading, for every shipped map.
+    """
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    frame = 1000 / 60
+    with tempfile.TemporaryDirectory() as directory:
+        path = slot_path('benchmark', directory)
+        for map_name in ('map1', 'map2', 'map3'):
+            simulation = new_game(map_name, 'easy', 0)
+            run_script(simulation, [('walk', 'down', 1), ('pick_up',), ('walk', 'right', 2), ('wait', 20)])
+            writer = SaveWriter()
+            session = capture_session(simulation)
+            write_session(path, session)
+
+            results = {
+                'capture': timed(lambda: capture_session(simulation), repeats),
+                'save call': timed(lambda: writer.save(path, capture_session(simulation)), repeats),
+            }
+            writer.close()
+            results |= {
+                'encode': timed(lambda: encode_session(session), repeats),
+                'write': timed(lambda: write_session(path, session), repeats),
+                'load': timed(lambda: load_session(path), repeats),
+                'restore': timed(lambda: simulation.restore(load_session(path)['snapshot']), repeats),
+                'start from save': timed(lambda: start_session(load_session(path)), max(1, repeats // 10)),
+            }
+            print(f'{map_name}: {os.path.getsize(path)} byte save, {writer.writes} background writes, '
+                  f'{writer.write_time / max(writer.writes, 1) * 1000:.3f} ms each')
+            for name, (mean, slowest) in results.items():
+                print(f'    {name:<16}{mean:8.3f} ms mean {slowest:8.3f} ms slowest'
+                      f'  {mean / frame:6.2%} of a 60 FPS frame')
+
+
+if __name__ == '__main__':
+    main()
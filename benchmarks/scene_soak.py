@@ -0,0 +1,112 @@
+"""
+Soak test for the scene stack: runs thousands of screen transitions through one SceneManager and checks that
+the Python stack depth, the scene stack and the memory held stay flat.
+
+Run from anywhere with:
+    python benchmarks/scene_soak.py [transitions]
+
+Every transition is followed by one frame of the scene it opened. Music files that are not in the checkout
+are skipped.
+"""
+import gc
+import os
+import sys
+import tracemalloc
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import main as game
+from main import *
+
+play_music = game.play_music
+game.play_music = lambda track, volume: play_music(track, volume) if os.path.exists(track) else None
+
+
+def frame_depth(frame) -> int:
+    """
+    Returns the number of Python frames below a frame.
+    """
+    depth = 0
+    while frame is not None:
+        depth += 1
+        frame = frame.f_back
+    return depth
+
+
+def cycle(manager, game_state, player, game_map, simulation):
+    """
+    Yields one round of the game's screen transitions: start, selection, intro, game, inventory, use, win
+    and menu, returning to the start screen.
+    """
+    yield lambda: manager.push(SelectionScene(game_state))
+    yield lambda: manager.replace(IntroScene(game_state, player, game_map))
+    yield lambda: manager.replace(GameScene(game_state, player, game_map))
+    yield lambda: manager.push(InventoryScene(simulation))
+    yield manager.pop
+    yield lambda: manager.push(UseScene(simulation))
+    yield manager.pop
+    yield lambda: manager.replace(WinScene(game_state))
+    yield manager.pop
+    yield lambda: manager.push(MenuScene())
+    yield manager.pop
+
+
+def main():
+    """
+    Runs the transitions and prints the stack depth, scene count and memory at checkpoints.
+    """
+    transitions = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    game_state = GameState()
+    game_state.set_gender('male')
+    game_state.map_selector('map1')
+    player = initialize_player(game_state)
+    game_map = load_game_map(game_state)
+    simulation = Simulation(game_state, player)
+
+    deepest = []
+    frame_code = {scene.frame.__code__ for scene in Scene.__subclasses__()}
+
+    def profile(frame, event, arg):
+        if event == 'call' and frame.f_code in frame_code:
+            deepest.append(frame_depth(frame))
+            del deepest[:-1]
+
+    manager = SceneManager(init_display(), clock, 0)
+    manager.push(StartScene(game_state))
+    manager.apply_transitions()
+
+    tracemalloc.start()
+    baseline = None
+    sys.setprofile(profile)
+    done = 0
+    while done < transitions:
+        for transition in cycle(manager, game_state, player, game_map, simulation):
+            player.health = 7
+            transition()
+            manager.apply_transitions()
+            manager.run_frame()
+            done += 1
+            if done == 1000 or done % 2000 == 0 or done == transitions:
+                sys.setprofile(None)
+                gc.collect()
+                memory = tracemalloc.get_traced_memory()[0]
+                baseline = baseline or memory
+                scenes = sum(isinstance(obj, Scene) for obj in gc.get_objects())
+                print(f'{done:6} transitions: python stack {deepest[-1]} frames, scene stack {len(manager.stack)}, '
+                      f'{scenes} live scenes, traced memory {memory / 1024:.0f} KiB '
+                      f'({(memory - baseline) / 1024:+.0f} KiB since 1000)')
+                sys.setprofile(profile)
+            if done == transitions:
+                break
+    sys.setprofile(None)
+    print(f'{manager.transitions} transitions applied, recursion limit {sys.getrecursionlimit()}')
+
+
+if __name__ == '__main__':
+    main()
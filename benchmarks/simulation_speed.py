@@ -0,0 +1,64 @@
+"""
+Measures how many simulation steps the headless game rules (see simulation.py) run per millisecond: waiting
+until the player runs out of health, walking around the shipped maps, and a scripted game that picks up every
+item, crafts and places the campfire, opens the chest and fires the flare gun.
+
+Run from anywhere with:
+    python benchmarks/simulation_speed.py [games]
+"""
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from simulation import *
+
+
+def visit(simulation: Simulation, cell):
+    """
+    Puts the player on a cell, as walking there would.
+    """
+    simulation.player.player_x = MAP_ORIGIN[0] + cell[0] * TILE_SIZE - PLAYER_FOOT[0] + TILE_SIZE // 2
+    simulation.player.player_y = MAP_ORIGIN[1] + cell[1] * TILE_SIZE - PLAYER_FOOT[1] + TILE_SIZE // 2
+
+
+def scripted_game(map_name: str, seed: int) -> Simulation:
+    """
+    Plays a game that picks up every item, waits by the campfire, opens the chest and fires the flare gun.
+    """
+    simulation = new_game(map_name, 'hard', seed)
+    rows = simulation.game_map.to_rows()
+    for cell in list(simulation.game_state.items):
+        visit(simulation, cell)
+        run_script(simulation, [('pick_up',), ('walk', 'left', 0.5), ('wait', 5)])
+    visit(simulation, (1, 1))
+    run_script(simulation, [('craft',), ('place_campfire',), ('wait', 15)])
+    for code, action in ((CHEST_TILE, 'interact'), (FLARE_TILE, 'fire_flare')):
+        visit(simulation, next((x, y) for y, row in enumerate(rows) for x, tile in enumerate(row) if tile == code))
+        run_script(simulation, [(action,)])
+    return simulation
+
+
+def main():
+    """
+    Prints the steps run per millisecond for every kind of game.
+    """
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    for name, play in (('waiting', lambda map_name, seed: new_game(map_name, 'easy', seed).run(10 ** 9)),
+                       ('walking', lambda map_name, seed: new_game(map_name, 'easy', seed).run(6000, {'down'})),
+                       ('scripted', scripted_game)):
+        steps = 0
+        start = time.perf_counter()
+        for seed in range(games):
+            for map_name in ('map1', 'map2', 'map3'):
+                result = play(map_name, seed)
+                steps += result if isinstance(result, int) else result.clock.steps
+        elapsed = time.perf_counter() - start
+        print(f'{name}: {steps} steps in {elapsed * 1000:.0f} ms, {steps / elapsed / 1000:.0f} steps/ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Measures the time spent decoding sound effects when every play decodes its file, against the shared sound bank.
+
+Run from anywhere with:
+    python benchmarks/sound_load_time.py [plays]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import pygame
+
+from assets import GAME_SOUNDS
+from data import *
+
+
+def decode_every_play(sound_files, plays) -> list[float]:
+    """
+    Returns the seconds taken by each play when every play decodes its sound file, as the game used to.
+    """
+    times = []
+    for play in range(plays):
+        start = time.perf_counter()
+        sound = pygame.mixer.Sound(sound_files[play % len(sound_files)])
+        sound.set_volume(0.2)
+        sound.play()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def play_from_bank(sound_files, plays) -> list[float]:
+    """
+    Returns the seconds taken by each play through the shared sound bank, after preloading it.
+    """
+    sound_bank.preload(sound_files)
+    times = []
+    for play in range(plays):
+        start = time.perf_counter()
+        sound_bank.play(sound_files[play % len(sound_files)], 0.2)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main():
+    """
+    Prints the mean and worst play time of both paths and the bank's load statistics.
+    """
+    plays = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    sound_files = [sound_file for sound_file in GAME_SOUNDS if os.path.exists(sound_file)]
+    for label, measure in (('decode every play', decode_every_play), ('sound bank', play_from_bank)):
+        times = measure(sound_files, plays)
+        print(f'{label}: mean {sum(times) / len(times) * 1000:.3f} ms, worst {max(times) * 1000:.3f} ms per play')
+    pygame.mixer.stop()
+
+    statistics = sound_bank.statistics()
+    print(f"sound bank: {statistics['Sounds']} sounds decoded in {statistics['Load Time'] * 1000:.1f} ms, "
+          f"{statistics['Plays']} plays")
+    if statistics['Slowest Load']:
+        sound_file, seconds = statistics['Slowest Load']
+        print(f'slowest decode: {sound_file} ({seconds * 1000:.1f} ms)')
+
+
+if __name__ == '__main__':
+    main()
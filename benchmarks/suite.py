@@ -0,0 +1,228 @@
+"""
+Times the hot drawing and game logic functions off-screen, on the shipped maps and on synthetic maps up to
+1000x1000, at every difficulty, and writes the results as JSON that a later run can be compared against.
+
+Run from anywhere with:
+    python benchmarks/suite.py [--maps map1 map2 map3] [--sizes 100 250 500 1000] [--difficulties easy ...]
+                               [--benchmarks display_map ...] [--min-time SECONDS] [--json FILE]
+                               [--baseline FILE] [--threshold FRACTION] [--min-delta MILLISECONDS]
+
+Every benchmark runs for at least --min-time seconds (and at least MIN_RUNS times) and reports the median,
+mean, 95th percentile and fastest milliseconds per call. With --baseline, the medians are compared with the
+ones of an earlier --json file, and the suite exits with status 1 if any benchmark got slower by more than
+--threshold (a fraction of the baseline) and --min-delta milliseconds, so timer noise on the fastest
+benchmarks isn't flagged. The --json and --baseline files are found from the directory the suite is run from,
+the --maps from the root of the repository.
+
+The synthetic maps are random mixes of the tiles of the shipped maps with ITEM_COUNT item cells, written as
+text maps to a temporary directory and converted into binary maps, as the shipped maps are. load_map parses
+the text map; load_game_map loads the map as the game does, from the binary map.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ['FOREST_HEADLESS'] = '1'
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CALLER_DIRECTORY = os.getcwd()
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from set import *
+from mapformat import convert_map
+from mapgen import ITEM_COUNT, write_generated_map
+
+RESULTS_VERSION = 1
+MIN_RUNS = 3
+SHIPPED_MAPS = ['map1', 'map2', 'map3']
+SYNTHETIC_SIZES = [100, 250, 500, 1000]
+SYNTHETIC_CODES = [1] * 12 + [0, 2, 5, 10, 11, 12, 20, 21, 27]
+INVENTORY = {'Apple': 'Food Item: Gives +2 health', 'Pear': 'Food Item: Gives +2 health',
+             'Matchbox': 'Crafting Item', 'Logs': 'Crafting Item', 'Rock': 'Crafting Item',
+             'Blue Key': 'Key', 'FlareGun': 'Escape Item'}
+# How far the player moves between two display_map calls, so the camera scrolls and the map layer is rebuilt
+# as it would be while walking
+CAMERA_STEP = (4, 3)
+BENCHMARKS = ['display_map', 'display_mask', 'display_inventory', 'display_items', 'display_hearts', 'load_map',
+              'load_game_map', 'get_player_grid_code', 'interact_checker', 'handle_movement']
+
+
+def caller_path(path: str) -> str:
+    """
+    Returns a path given on the command line as an absolute path, found from the directory the suite was run
+    from rather than the root of the repository it changes to.
+    """
+    return os.path.join(CALLER_DIRECTORY, path)
+
+
+def synthetic_map(directory: str, size: int) -> str:
+    """
+    Writes a square map of random tiles, with open ground around the spawn and ITEM_COUNT item cells, as a
+    text map and a binary map, and returns the path of the text map.
+    """
+    rng = random.Random(size)
+    rows = [[rng.choice(SYNTHETIC_CODES) for _ in range(size)] for _ in range(size)]
+    for y in range(4):
+        for x in range(4):
+            rows[y][x] = 1
+    items = rng.sample([(x, y) for x, y in ((rng.randrange(size), rng.randrange(size)) for _ in range(100))
+                        if rows[y][x] == 1], ITEM_COUNT)
+    path = os.path.join(directory, f'synthetic{size}')
+    write_generated_map(path, rows, items)
+    convert_map(path)
+    return path
+
+
+def time_calls(function, min_time: float) -> dict[str, float]:
+    """
+    Calls a function for at least min_time seconds and MIN_RUNS times and returns the median, mean, 95th
+    percentile and fastest milliseconds per call and the number of calls.
+    """
+    times = []
+    deadline = time.perf_counter() + min_time
+    while len(times) < MIN_RUNS or time.perf_counter() < deadline:
+        start = time.perf_counter()
+        function()
+        times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+    return {'median_ms': statistics.median(times), 'mean_ms': statistics.fmean(times),
+            'p95_ms': times[min(len(times) - 1, int(len(times) * 0.95))], 'min_ms': times[0], 'runs': len(times)}
+
+
+def benchmarks(screen, game_state: GameState, player: Player) -> dict:
+    """
+    Returns the benchmarks of one map and difficulty, named as in BENCHMARKS, as functions of no arguments.
+    """
+    grid = load_game_map(game_state)
+    bounds = (MAP_ORIGIN[0] + grid.width * TILE_SIZE - 2 * TILE_SIZE,
+              MAP_ORIGIN[1] + grid.height * TILE_SIZE - 2 * TILE_SIZE)
+    keys = key_state({'right'})
+
+    def display_map_step():
+        player.save_position()
+        player.player_x = MAP_ORIGIN[0] + (player.player_x - MAP_ORIGIN[0] + CAMERA_STEP[0]) % bounds[0]
+        player.player_y = MAP_ORIGIN[1] + (player.player_y - MAP_ORIGIN[1] + CAMERA_STEP[1]) % bounds[1]
+        display_map(player, screen, game_state)
+
+    def load_map_text():
+        with open(game_state.map, 'r') as map_data:
+            load_map(map_data)
+
+    def load_game_map_fresh():
+        game_state.close_map()
+        load_game_map(game_state)
+
+    def handle_movement():
+        player.player_x, player.player_y = PLAYER_SPAWN
+        player.handle_movement(grid, SIMULATION_STEP, keys, 0)
+
+    return {
+        'display_map': display_map_step,
+        'display_mask': lambda: display_mask(player, game_state, False, screen),
+        'display_inventory': lambda: display_inventory(screen, False, player),
+        'display_items': lambda: display_items(screen, 100, window_size, player.inventory),
+        'display_hearts': lambda: display_hearts(player, screen),
+        'load_map': load_map_text,
+        'load_game_map': load_game_map_fresh,
+        'get_player_grid_code': lambda: player.get_player_grid_code(game_state),
+        'interact_checker': lambda: interact_checker(player, game_state),
+        'handle_movement': handle_movement,
+    }
+
+
+def run_suite(maps: list[str], difficulties: list[str], names: list[str], min_time: float) -> dict:
+    """
+    Runs the benchmarks on every map at every difficulty and returns the results, keyed by
+    map/difficulty/benchmark.
+    """
+    screen = init_display()
+    for scene in ('game', 'inventory'):
+        load_scene_assets(scene)
+    results = {}
+    for map_path in maps:
+        for difficulty in difficulties:
+            game_state = GameState()
+            game_state.set_gender('male')
+            game_state.set_difficulty(difficulty)
+            game_state.map_selector(map_path, 0)
+            player = initialize_player(game_state)
+            player.inventory.update(INVENTORY)
+            player.health = 4.5
+            grid = load_game_map(game_state)
+            display_map(player, screen, game_state)
+            suite = benchmarks(screen, game_state, player)
+            for name in names:
+                key = f'{os.path.basename(map_path)}/{difficulty}/{name}'
+                results[key] = {'map size': [grid.width, grid.height], **time_calls(suite[name], min_time)}
+                print(f'{key:<42}{results[key]["median_ms"]:10.4f} ms median {results[key]["p95_ms"]:10.4f} ms p95'
+                      f'  ({results[key]["runs"]} runs)')
+            game_state.close_map()
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float, min_delta: float) -> list[str]:
+    """
+    Prints how the median of every benchmark changed from the baseline and returns the benchmarks that got
+    slower by more than the threshold and min_delta milliseconds.
+    """
+    regressions = []
+    print(f'\n{"benchmark":<42}{"baseline":>12}{"current":>12}{"change":>9}')
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        before, after = baseline[key]['median_ms'], result['median_ms']
+        change = after / before - 1 if before else 0.0
+        regressed = change > threshold and after - before > min_delta
+        if regressed:
+            regressions.append(key)
+        print(f'{key:<42}{before:12.4f}{after:12.4f}{change:9.1%}{"  REGRESSION" if regressed else ""}')
+    return regressions
+
+
+def main(arguments=None) -> int:
+    """
+    Runs the suite, writes the results and compares them with a baseline. Returns 1 if any benchmark
+    regressed.
+    """
+    parser = argparse.ArgumentParser(description='Time the hot rendering and game logic of Forest of Echoes.')
+    parser.add_argument('--maps', nargs='*', default=SHIPPED_MAPS)
+    parser.add_argument('--sizes', nargs='*', type=int, default=SYNTHETIC_SIZES, help='synthetic map sizes')
+    parser.add_argument('--difficulties', nargs='+', choices=list(HEALTH_DECREMENT_INTERVALS),
+                        default=list(HEALTH_DECREMENT_INTERVALS))
+    parser.add_argument('--benchmarks', nargs='+', choices=BENCHMARKS, default=BENCHMARKS)
+    parser.add_argument('--min-time', type=float, default=0.1, help='seconds to run every benchmark for')
+    parser.add_argument('--json', type=caller_path, help='write the results to this file')
+    parser.add_argument('--baseline', type=caller_path, help='compare the results with the ones in this file')
+    parser.add_argument('--threshold', type=float, default=0.2, help='slowdown flagged as a regression')
+    parser.add_argument('--min-delta', type=float, default=0.01, help='milliseconds a regression must exceed')
+    options = parser.parse_args(arguments)
+
+    with tempfile.TemporaryDirectory() as directory:
+        maps = options.maps + [synthetic_map(directory, size) for size in options.sizes]
+        results = run_suite(maps, options.difficulties, options.benchmarks, options.min_time)
+
+    report = {'version': RESULTS_VERSION, 'python': platform.python_version(), 'pygame': pygame.version.ver,
+              'platform': platform.platform(), 'min_time': options.min_time, 'results': results}
+    if options.json:
+        with open(options.json, 'w') as json_file:
+            json.dump(report, json_file, indent=1)
+    if options.baseline:
+        with open(options.baseline, 'r') as baseline_file:
+            baseline = json.load(baseline_file)
+        if baseline.get('version') != RESULTS_VERSION:
+            print(f'{options.baseline} holds version {baseline.get("version")} results, not {RESULTS_VERSION}')
+            return 1
+        regressions = compare(results, baseline['results'], options.threshold, options.min_delta)
+        print(f'\n{len(regressions)} regressions beyond {options.threshold:.0%}')
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
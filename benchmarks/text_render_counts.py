@@ -0,0 +1,56 @@
+"""
+Counts the text renders each display function still sends to the font once the text cache is warm.
+
+Run from anywhere with:
+    python benchmarks/text_render_counts.py [frames]
+"""
+import os
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from set import *
+
+
+def main():
+    """
+    Prints the font renders and cache hits per frame for every screen.
+    """
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    screen = init_display()
+    game_state = GameState()
+    game_state.set_gender('male')
+    game_state.map_selector('map1')
+    player = initialize_player(game_state)
+    player.inventory['Apple'] = 'Food Item: Gives +2 health'
+    timer = Timer()
+    start_time = pygame.time.get_ticks()
+
+    screens = {
+        'start': lambda: display_start(screen),
+        'selection': lambda: display_selection(screen, game_state, None, 0, 0),
+        'intro': lambda: display_intro(screen, start_time - 30000),
+        'menu': lambda: display_menu(screen, True),
+        'inventory': lambda: display_inventory(screen, False, player),
+        'use': lambda: display_use_text(False, 0, 0, game_button_rect, 0, screen, None),
+        'win': lambda: display_win(screen, game_state, timer),
+        'gameover': lambda: display_gameover(screen, game_state, timer),
+        'game buttons': lambda: display_buttons(screen, game_state),
+    }
+    for name, draw in screens.items():
+        draw()
+        text_cache.reset_statistics()
+        for _ in range(frames):
+            draw()
+        stats = text_cache.statistics()
+        print(f"{name}: {stats['Misses'] / frames:.2f} font renders/frame, {stats['Hits'] / frames:.1f} cache hits/frame")
+    stats = text_cache.statistics()
+    print(f"cache: {stats['Entries']} surfaces, {stats['Memory'] / 1024:.0f} KiB")
+
+
+if __name__ == '__main__':
+    main()
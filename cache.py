@@ -0,0 +1,149 @@
+"""
+This module contains the surface caches shared by the display functions.
+
+Functions:
+- surface_bytes: Returns the number of bytes of pixel data held by a surface.
+- render_cached: Renders text through the shared text cache.
+- scaled_sprite: Returns a scaled variant of an image through the shared sprite registry.
+
+Classes:
+- TextCache: A bounded least-recently-used cache of rendered text surfaces.
+- SpriteRegistry: Produces each scaled variant of an image once and reuses it.
+"""
+from collections import OrderedDict
+
+import pygame
+
+
+class TextCache:
+    """
+    A bounded least-recently-used cache of rendered text surfaces, keyed on (font, text, antialias, color).
+
+    Instance Attributes:
+    - max_entries: the number of surfaces kept before the least recently used one is dropped
+    - surfaces: the cached surfaces, ordered from least to most recently used
+    - hits: the number of renders answered from the cache
+    - misses: the number of renders that had to be drawn by the font
+    - memory: the number of bytes of pixel data held by the cached surfaces
+    """
+    max_entries: int
+    surfaces: OrderedDict
+    hits: int
+    misses: int
+    memory: int
+
+    def __init__(self, max_entries: int = 512) -> None:
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.memory = 0
+
+    def render(self, font: pygame.font.Font, text: str, antialias: bool, color) -> pygame.Surface:
+        """
+        Return the rendered surface for the text, drawing it with the font only if it is not cached.
+        """
+        key = (font, text, antialias, tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        self.memory += surface_bytes(surface)
+        if len(self.surfaces) > self.max_entries:
+            _, dropped = self.surfaces.popitem(last=False)
+            self.memory -= surface_bytes(dropped)
+        return surface
+
+    def statistics(self) -> dict:
+        """
+        Return the hit and miss counts, number of entries and memory held by the cache.
+        """
+        return {'Hits': self.hits, 'Misses': self.misses, 'Entries': len(self.surfaces), 'Memory': self.memory}
+
+    def reset_statistics(self):
+        """
+        Reset the hit and miss counters, keeping the cached surfaces.
+        """
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        """
+        Drop every cached surface.
+        """
+        self.surfaces.clear()
+        self.memory = 0
+
+
+def surface_bytes(surface: pygame.Surface) -> int:
+    """
+    Return the number of bytes of pixel data held by a surface.
+    """
+    return surface.get_pitch() * surface.get_height()
+
+
+text_cache = TextCache()
+
+
+def render_cached(font: pygame.font.Font, text: str, antialias: bool, color) -> pygame.Surface:
+    """
+    Renders text through the shared text cache. The returned surface is shared and must not be drawn on.
+    """
+    return text_cache.render(font, text, antialias, color)
+
+
+class SpriteRegistry:
+    """
+    Produces each (image, size) variant of a sprite once and hands back the same surface afterwards.
+
+    Instance Attributes:
+    - variants: the scaled surfaces, keyed by (source image, size)
+    - hits: the number of variants answered from the registry
+    - misses: the number of variants that had to be scaled
+    """
+    variants: dict
+    hits: int
+    misses: int
+
+    def __init__(self) -> None:
+        self.variants = {}
+        self.hits = 0
+        self.misses = 0
+
+    def scaled(self, image: pygame.Surface, size) -> pygame.Surface:
+        """
+        Return the image scaled to the given size, scaling it only the first time the size is asked for.
+        """
+        key = (image, tuple(size))
+        variant = self.variants.get(key)
+        if variant is not None:
+            self.hits += 1
+            return variant
+
+        self.misses += 1
+        variant = pygame.transform.scale(image, size)
+        self.variants[key] = variant
+        return variant
+
+    def statistics(self) -> dict:
+        """
+        Return the hit and miss counts, number of variants and memory held by the registry.
+        """
+        memory = sum(surface_bytes(variant) for variant in self.variants.values())
+        return {'Hits': self.hits, 'Misses': self.misses, 'Entries': len(self.variants), 'Memory': memory}
+
+
+sprite_registry = SpriteRegistry()
+
+
+def scaled_sprite(image: pygame.Surface, size) -> pygame.Surface:
+    """
+    Returns a scaled variant of an image through the shared sprite registry. The returned surface is shared
+    and must not be drawn on.
+    """
+    return sprite_registry.scaled(image, size)
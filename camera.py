@@ -0,0 +1,122 @@
+"""
+This module contains the camera that decides which part of the map the game screen shows.
+
+Positions on the map are world coordinates: pixels of the map as if it were drawn whole, with the top-left
+corner of cell (0, 0) at MAP_ORIGIN. The player's position is in world coordinates. The camera keeps the
+player in the middle of the viewport, without showing anything past the edges of the map, and converts
+between world, screen and grid coordinates. A map of 22x14 tiles fills the default viewport exactly, so the
+shipped maps never scroll and world and screen coordinates stay the same for them.
+
+Functions:
+- world_to_grid: Returns the cell of the map under a world position.
+
+Classes:
+- Camera: The part of the map shown on the screen.
+"""
+import pygame
+
+TILE_SIZE = 50
+
+# World position of the top-left corner of cell (0, 0)
+MAP_ORIGIN = (200, 100)
+
+# The framed area of the screen the map is shown in, and the width of its frame
+VIEWPORT = (185, 85, 1130, 730)
+BORDER_WIDTH = 15
+
+# Offset from the top-left corner of the player's image to the point that decides which cell it stands on
+PLAYER_FOOT = (15, 32)
+
+
+def world_to_grid(x: float, y: float) -> tuple[int, int]:
+    """
+    Returns the column and row of the map cell under a world position.
+    """
+    return int((x - MAP_ORIGIN[0]) // TILE_SIZE), int((y - MAP_ORIGIN[1]) // TILE_SIZE)
+
+
+class Camera:
+    """
+    The part of the map shown on the screen. A screen position is the world position minus the scroll.
+
+    Instance Attributes:
+    - viewport: the framed area of the screen the map is shown in, frame included
+    - view: the area inside the frame the map is drawn in
+    - scroll_x: the horizontal offset from world to screen coordinates
+    - scroll_y: the vertical offset from world to screen coordinates
+    - moved: whether the last follow scrolled the view
+    """
+    viewport: pygame.Rect
+    view: pygame.Rect
+    scroll_x: int
+    scroll_y: int
+    moved: bool
+
+    def __init__(self, viewport=VIEWPORT, border=BORDER_WIDTH) -> None:
+        self.viewport = pygame.Rect(viewport)
+        self.view = self.viewport.inflate(-2 * border, -2 * border)
+        self.scroll_x = MAP_ORIGIN[0] - self.view.left
+        self.scroll_y = MAP_ORIGIN[1] - self.view.top
+        self.moved = False
+
+    def follow(self, x: float, y: float, map_width: int, map_height: int) -> bool:
+        """
+        Scroll so the world position (x, y) is in the middle of the view, as far as the edges of a map of
+        map_width x map_height cells allow. A map smaller than the view stays at its top-left corner. Returns
+        whether the view scrolled.
+        """
+        scroll_x = self.clamp(round(x) - self.view.centerx, MAP_ORIGIN[0] - self.view.left,
+                              map_width * TILE_SIZE - self.view.width)
+        scroll_y = self.clamp(round(y) - self.view.centery, MAP_ORIGIN[1] - self.view.top,
+                              map_height * TILE_SIZE - self.view.height)
+        self.moved = (scroll_x, scroll_y) != (self.scroll_x, self.scroll_y)
+        self.scroll_x, self.scroll_y = scroll_x, scroll_y
+        return self.moved
+
+    @staticmethod
+    def clamp(scroll: int, start: int, overflow: int) -> int:
+        """
+        Keep a scroll between the first scroll showing the map's edge and the last one, overflow pixels further.
+        """
+        return start + min(max(scroll - start, 0), max(overflow, 0))
+
+    def to_screen(self, x: float, y: float) -> tuple[int, int]:
+        """
+        Return the screen position of a world position.
+        """
+        return round(x) - self.scroll_x, round(y) - self.scroll_y
+
+    def to_world(self, x: int, y: int) -> tuple[int, int]:
+        """
+        Return the world position of a screen position.
+        """
+        return x + self.scroll_x, y + self.scroll_y
+
+    def screen_to_grid(self, x: int, y: int) -> tuple[int, int]:
+        """
+        Return the column and row of the map cell shown at a screen position.
+        """
+        return world_to_grid(*self.to_world(x, y))
+
+    def grid_to_screen(self, column: int, row: int) -> tuple[int, int]:
+        """
+        Return the screen position of the top-left corner of a map cell.
+        """
+        return (MAP_ORIGIN[0] + column * TILE_SIZE - self.scroll_x,
+                MAP_ORIGIN[1] + row * TILE_SIZE - self.scroll_y)
+
+    def world_view(self) -> pygame.Rect:
+        """
+        Return the world area shown in the view.
+        """
+        return self.view.move(self.scroll_x, self.scroll_y)
+
+    def visible_cells(self, margin: int = 1) -> tuple[int, int, int, int]:
+        """
+        Return the first and last column and row of the cells in the view, widened by margin cells on every
+        side. The range is not clipped to the map.
+        """
+        area = self.world_view()
+        left, top = world_to_grid(area.left, area.top)
+        right, bottom = world_to_grid(area.right - 1, area.bottom - 1)
+        return left - margin, top - margin, right + margin, bottom + margin
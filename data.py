@@ -4,20 +4,38 @@ game state management, and item interactions in a Pygame-based game.
 
 Functions:
 - play_music: Plays background music.
-- play_sound_effect: Plays a sound effect.
-- load_map: Loads a map from a text file-like object.
-- load_game_map: Loads the game map from a local file.
+- play_sound_effect: Plays a sound effect through the shared sound bank.
+- item_coordinates_path: Returns the path of the item coordinates of a generated map.
+- load_item_coordinates: Returns the item coordinates written with a generated map.
+- set_items: Chooses and sets the items on the map.
+- load_map: Loads a map from a text file-like object or a binary map file.
+- is_up_to_date: Returns whether a converted map is not older than its text map.
+- load_binary_map: Returns the grid of a binary map, or None if it is corrupt.
+- load_game_map: Returns the shared grid of the current map, loading the map file only once.
+- get_triggers: Returns the trigger index of the current map.
 
 Classes:
+- SoundBank: Decodes every sound effect once and keeps the decoded sounds.
 - Item: Represents an item within the game.
 - World: Represents the game world, including the map layout and item placements.
+- MapGrid: A parsed map stored as one byte per tile.
+- TriggerIndex: The triggers of every cell of a map.
 - Player: Represents the player in the game, including their position, inventory, and movement.
 - Timer: A timer class for managing time-related operations in the game.
 - GameState: Manages the overall game state, including game settings and player stats."""
 from typing import TextIO
+import io
+import json
+import os
 
 import pygame
 import random
+import time
+
+from camera import *
+from mapformat import MapFile, binary_map_path, chunked_map_path
+from profiler import span
+from streaming import ChunkedMap
 
 
 def play_music(track, volume):
@@ -29,13 +47,70 @@ def play_music(track, volume):
     pygame.mixer.music.play(-1)
 
 
+class SoundBank:
+    """
+    Decodes every sound effect once and keeps the decoded sounds.
+
+    Instance Attributes:
+    - sounds: the decoded sounds, keyed by sound file
+    - load_times: the seconds spent decoding each sound file
+    - plays: the number of sounds played through the bank
+    """
+    sounds: dict[str, pygame.mixer.Sound]
+    load_times: dict[str, float]
+    plays: int
+
+    def __init__(self) -> None:
+        self.sounds = {}
+        self.load_times = {}
+        self.plays = 0
+
+    def get(self, sound_file) -> pygame.mixer.Sound:
+        """
+        Return the decoded sound for a file, decoding it the first time it is asked for.
+        """
+        sound = self.sounds.get(sound_file)
+        if sound is None:
+            start = time.perf_counter()
+            sound = pygame.mixer.Sound(sound_file)
+            self.load_times[sound_file] = time.perf_counter() - start
+            self.sounds[sound_file] = sound
+        return sound
+
+    def preload(self, sound_files):
+        """
+        Decode every given sound file ahead of its first use.
+        """
+        for sound_file in sound_files:
+            self.get(sound_file)
+
+    def play(self, sound_file, volume):
+        """
+        Play a sound once at the given volume. The volume is applied to the channel it plays on, so other
+        plays of the same sound keep their own volume.
+        """
+        channel = self.get(sound_file).play()
+        if channel is not None:
+            channel.set_volume(volume)
+        self.plays += 1
+        return channel
+
+    def statistics(self) -> dict:
+        """
+        Return the number of decoded sounds, the time spent decoding them and the number of plays.
+        """
+        return {'Sounds': len(self.sounds), 'Load Time': sum(self.load_times.values()), 'Plays': self.plays,
+                'Slowest Load': max(self.load_times.items(), key=lambda entry: entry[1], default=None)}
+
+
+sound_bank = SoundBank()
+
+
 def play_sound_effect(sound_file, volume):
     """
-    Plays a sound effect.
+    Plays a sound effect through the shared sound bank.
     """
-    sound = pygame.mixer.Sound(sound_file)
-    sound.set_volume(volume)
-    sound.play()
+    sound_bank.play(sound_file, volume)
 
 
 class Item:
@@ -78,12 +153,42 @@ class World:
         self.locations = {}
 
 
+# The game simulates in fixed steps of SIMULATION_STEP seconds, whatever the frame rate. A frame that took longer
+# than MAX_FRAME_TIME (a stall, a dragged window) only advances the simulation by MAX_FRAME_TIME.
+SIMULATION_STEP = 1 / 120
+MAX_FRAME_TIME = 0.25
+
+# Where the player starts, in world coordinates
+PLAYER_SPAWN = (260, 150)
+
+# Walking speed in pixels per second and campfire healing in health per second
+PLAYER_SPEED = 120
+CAMPFIRE_HEAL_RATE = 0.6
+
+# The two corners of the player checked for collisions, relative to its position, shifted so that dividing by
+# TILE_SIZE gives the cell they are on
+PROBE_OFFSETS = ((5 - MAP_ORIGIN[0], 25 - MAP_ORIGIN[1]), (20 - MAP_ORIGIN[0], 40 - MAP_ORIGIN[1]))
+
+MOVEMENT_KEYS = [(pygame.K_w, pygame.K_UP, 'up', 0, -1), (pygame.K_s, pygame.K_DOWN, 'down', 0, 1),
+                 (pygame.K_a, pygame.K_LEFT, 'left', -1, 0), (pygame.K_d, pygame.K_RIGHT, 'right', 1, 0)]
+
+
 class Player:
     """
     Represents the player in the game, including their position, inventory, and movement.
+
+    Instance Attributes:
+    - player_x, player_y: the position of the top-left corner of the player's image, in world coordinates
+      (see camera.py)
+    - previous_x, previous_y: the position at the start of the last simulation step, used to interpolate
+      the drawn position between steps
+    - move_remainder: the part of a pixel walked but not yet moved
     """
     player_x: int
     player_y: int
+    previous_x: int
+    previous_y: int
+    move_remainder: float
     player_code: list[int]
     player_images: dict[str, list[pygame.Surface]]
     inventory: dict[str, str]
@@ -94,6 +199,8 @@ class Player:
         """
         self.player_y = player_y
         self.player_x = player_x
+        self.previous_x, self.previous_y = player_x, player_y
+        self.move_remainder = 0.0
         self.player_code = player_code
         self.inventory = {
             # 'Apple': 'Food Item: Gives +2 health',
@@ -130,22 +237,14 @@ class Player:
         """
         Calculate and returns the player's grid location based on the player's current x,y position.
         """
-        new_x, new_y = self.player_x, self.player_y
-        return [((new_x - 185) // 50), ((new_y - 68) // 50)]
+        return list(world_to_grid(self.player_x + PLAYER_FOOT[0], self.player_y + PLAYER_FOOT[1]))
 
     def get_player_grid_code(self, game_state):
         """
         Calculate and returns the player's grid code based on the player's current grid position.
         """
-        map_name = game_state.current_map()
-        map_file_path = f'{map_name}'
-        with open(map_file_path, 'r') as file:
-            lines = file.readlines()
-            map_grid = [line.strip().split() for line in lines]
-
-        x, y = self.get_player_grid_location()[0], self.get_player_grid_location()[1]
-
-        return int(map_grid[y][x])
+        x, y = self.get_player_grid_location()
+        return load_game_map(game_state).tile_at(x, y)
 
     def item_to_inventory(self, item: Item) -> None:
         """
@@ -159,33 +258,74 @@ class Player:
         """
         del self.inventory[title]
 
-    def handle_movement(self, game_map):
+    def save_position(self):
+        """
+        Remember the current position as the start of a new simulation step.
+        """
+        self.previous_x, self.previous_y = self.player_x, self.player_y
+
+    def render_position(self, alpha: float = 1.0) -> tuple[int, int]:
         """
-        Handle player movement based on keyboard inputs and update position and animation.
+        Return the position to draw the player at, alpha of the way from the start of the last simulation step
+        to the current position.
         """
-        keys = pygame.key.get_pressed()
-        step = 1
-        new_x, new_y = self.player_x, self.player_y
+        return (round(self.previous_x + (self.player_x - self.previous_x) * alpha),
+                round(self.previous_y + (self.player_y - self.previous_y) * alpha))
+
+    def can_stand_at(self, game_map, new_x, new_y) -> bool:
+        """
+        Return whether the player fits at a position: both of its probe corners lie on passable tiles.
+        """
+        (left, top), (right, bottom) = PROBE_OFFSETS
+        width, passable = game_map.width, game_map.passable
+        left_x, top_y = (new_x + left) // TILE_SIZE, (new_y + top) // TILE_SIZE
+        right_x, bottom_y = (new_x + right) // TILE_SIZE, (new_y + bottom) // TILE_SIZE
+        return (0 <= left_x and right_x < width and 0 <= top_y and bottom_y < game_map.height
+                and passable[top_y * width + left_x] and passable[bottom_y * width + right_x])
+
+    def sweep(self, game_map, step_x: int, step_y: int, distance: int) -> int:
+        """
+        Return how many of the next distance pixels the player can walk by (step_x, step_y) per pixel before
+        running into a blocked tile.
+
+        The result is the same as checking every pixel in turn, but positions are only checked where one of the
+        probe corners enters a new tile, so a long step costs one check per tile crossed and can't pass through
+        a tree or water tile.
+        """
+        moved = 0
+        while moved < distance:
+            new_x, new_y = self.player_x + step_x * (moved + 1), self.player_y + step_y * (moved + 1)
+            if not self.can_stand_at(game_map, new_x, new_y):
+                break
+            run = TILE_SIZE
+            for offset_x, offset_y in PROBE_OFFSETS:
+                within = (new_x + offset_x) % TILE_SIZE if step_x else (new_y + offset_y) % TILE_SIZE
+                run = min(run, within if step_x + step_y < 0 else TILE_SIZE - 1 - within)
+            moved = min(distance, moved + 1 + run)
+        return moved
+
+    @span('Player.handle_movement')
+    def handle_movement(self, game_map, dt: float, keys=None, now: float = None):
+        """
+        Handle player movement based on keyboard inputs for a simulation step of dt seconds and update position
+        and animation. The player walks PLAYER_SPEED pixels per second and stops at the first blocked tile in
+        its way, however far it moves in one step. The animation runs on the time given in milliseconds, or on
+        pygame's clock.
+        """
+        if keys is None:
+            keys = pygame.key.get_pressed()
+        step_x, step_y = 0, 0
         moving = False
 
-        if keys[pygame.K_w] or keys[pygame.K_UP]:
-            new_y -= step
-            self.direction = 'up'
-            moving = True
-        elif keys[pygame.K_s] or keys[pygame.K_DOWN]:
-            new_y += step
-            self.direction = 'down'
-            moving = True
-        elif keys[pygame.K_a] or keys[pygame.K_LEFT]:
-            new_x -= step
-            self.direction = 'left'
-            moving = True
-        elif keys[pygame.K_d] or keys[pygame.K_RIGHT]:
-            new_x += step
-            self.direction = 'right'
-            moving = True
-
-        now = pygame.time.get_ticks()
+        for key, arrow_key, direction, direction_x, direction_y in MOVEMENT_KEYS:
+            if keys[key] or keys[arrow_key]:
+                step_x, step_y = direction_x, direction_y
+                self.direction = direction
+                moving = True
+                break
+
+        if now is None:
+            now = pygame.time.get_ticks()
         if moving:
             if now - self.last_update > 100:
                 self.last_update = now
@@ -194,21 +334,291 @@ class Player:
         else:
             self.frame_index = 0
             self.current_image = self.player_images[self.direction][self.frame_index]
+            self.move_remainder = 0.0
+            return
+
+        self.move_remainder += PLAYER_SPEED * dt
+        pixels = int(self.move_remainder + 1e-9)
+        self.move_remainder = max(self.move_remainder - pixels, 0.0)
+        moved = self.sweep(game_map, step_x, step_y, pixels)
+        self.player_x += step_x * moved
+        self.player_y += step_y * moved
+        if moved < pixels:
+            self.move_remainder = 0.0
+
+    @span('Player.walk')
+    def walk(self, game_map, dt: float, keys, times):
+        """
+        Handle player movement for a simulation step of dt seconds at each of the given times in milliseconds, with
+        the same keys held, as calling save_position and handle_movement for every step would, but sweeping the
+        whole walk at once.
+        """
+        moving = [(step_x, step_y, direction) for key, arrow_key, direction, step_x, step_y in MOVEMENT_KEYS
+                  if keys[key] or keys[arrow_key]]
+        if not moving:
+            self.save_position()
+            self.handle_movement(game_map, dt, keys, times[-1])
+            return
+        step_x, step_y, self.direction = moving[0]
+        images = self.player_images[self.direction]
+
+        reach = self.sweep(game_map, step_x, step_y, int(self.move_remainder + PLAYER_SPEED * dt * len(times)) + 1)
+        walked = before = 0
+        for now in times:
+            if now - self.last_update > 100:
+                self.last_update = now
+                self.frame_index = (self.frame_index + 1) % len(images)
+                self.current_image = images[self.frame_index]
+            self.move_remainder += PLAYER_SPEED * dt
+            pixels = int(self.move_remainder + 1e-9)
+            self.move_remainder = max(self.move_remainder - pixels, 0.0)
+            before = walked
+            walked += min(pixels, reach - walked)
+            if walked - before < pixels:
+                self.move_remainder = 0.0
+        self.previous_x, self.previous_y = self.player_x + step_x * before, self.player_y + step_y * before
+        self.player_x += step_x * walked
+        self.player_y += step_y * walked
+
+
+class MapGrid:
+    """
+    A parsed map stored as one byte per tile, row after row, in a single bytearray.
+
+    The grid can still be read like the old list of rows: grid[y][x] returns the tile code, through a view of
+    the row rather than a copy. Which tiles can be walked on is worked out once, when the grid is built, unless
+    it is given, as it is by the collision layer of a binary map.
+
+    Instance Attributes:
+    - name: the map file the grid was parsed from
+    - width: the number of tiles in a row
+    - height: the number of rows
+    - tiles: the tile codes, row after row
+    - passable: 1 for every tile that can be walked on and 0 for every blocked tile, row after row
+    """
+    name: str
+    width: int
+    height: int
+    tiles: bytearray
+    passable: bytearray
+
+    def __init__(self, name: str, width: int, height: int, tiles: bytearray, passable: bytearray = None) -> None:
+        if len(tiles) != width * height:
+            raise ValueError(f'{name}: expected {width * height} tiles, got {len(tiles)}')
+        self.name = name
+        self.width = width
+        self.height = height
+        self.tiles = tiles
+        self.passable = bytearray(tiles.translate(PASSABLE_TABLE)) if passable is None else passable
+
+    @classmethod
+    def from_rows(cls, rows: list[list[int]], name: str = ''):
+        """
+        Build a grid from a list of rows of tile codes. Raises ValueError if the rows differ in length.
+        """
+        width = len(rows[0]) if rows else 0
+        if any(len(row) != width for row in rows):
+            raise ValueError(f'{name}: rows differ in length')
+        return cls(name, width, len(rows), bytearray(tile for row in rows for tile in row))
 
-        grid_x_right = (new_x - 180) // 50
-        grid_y_bottom = (new_y - 60) // 50
-        grid_x_left = (new_x - 195) // 50
-        grid_y_top = (new_y - 75) // 50
+    @classmethod
+    def parse(cls, map_data: TextIO, name: str = ''):
+        """
+        Parse a map from a text file-like object with one row of whitespace-separated tile codes per line.
+        """
+        return cls.from_rows(load_map(map_data), name)
+
+    @classmethod
+    def from_binary(cls, map_file: MapFile, name: str = ''):
+        """
+        Build a grid from the layers of a binary map, taking which tiles can be walked on from its collision layer.
+        """
+        return cls(name, map_file.width, map_file.height, map_file.tiles(), map_file.passable())
 
-        if game_map[grid_y_bottom][grid_x_right] not in [0, 2, 98] and game_map[grid_y_top][grid_x_left] not in [0, 2,
-                                                                                                                 98]:
-            self.player_x, self.player_y = new_x, new_y
+    def in_bounds(self, x: int, y: int) -> bool:
+        """
+        Return whether (x, y) is a tile of the grid.
+        """
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def tile_at(self, x: int, y: int) -> int:
+        """
+        Return the code of the tile at column x, row y. Negative indices count from the end, like list indices.
+        """
+        if not -self.width <= x < self.width or not -self.height <= y < self.height:
+            raise IndexError(f'tile ({x}, {y}) is outside the {self.width}x{self.height} map {self.name}')
+        return self.tiles[(y % self.height) * self.width + x % self.width]
+
+    def is_passable(self, x: int, y: int) -> bool:
+        """
+        Return whether the tile at column x, row y can be walked on. Tiles outside the grid are blocked.
+        """
+        return 0 <= x < self.width and 0 <= y < self.height and self.passable[y * self.width + x] == 1
+
+    def row(self, y: int) -> memoryview:
+        """
+        Return a read-only view of row y.
+        """
+        start = (y % self.height) * self.width
+        return memoryview(self.tiles)[start:start + self.width].toreadonly()
+
+    def __getitem__(self, y: int) -> memoryview:
+        if not -self.height <= y < self.height:
+            raise IndexError(f'row {y} is outside the map {self.name}')
+        return self.row(y)
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __iter__(self):
+        for y in range(self.height):
+            yield self.row(y)
+
+    def to_rows(self) -> list[list[int]]:
+        """
+        Return the grid as a list of rows of tile codes.
+        """
+        return [list(row) for row in self]
+
+    def stream(self, cell):
+        """
+        Load the part of the map around a cell ahead of need. The whole grid is always in memory, so there is
+        nothing to load; a ChunkedMap (see streaming.py) loads its chunks here.
+        """
+
+    def close(self):
+        """
+        Release the map file. A grid holds no file open.
+        """
+
+
+# Tiles the player can't walk on (trees, water and the hill), tiles the interact button reacts to, the tile the
+# flare gun is fired from, the tiles the hill stands on and the tiles a campfire can't be placed on
+BLOCKED_TILES = {0, 2, 98}
+INTERACTION_TILES = {4: 'Chest', 6: 'sign1', 7: 'sign2', 8: 'sign3'}
+CHEST_TILE = 4
+FLARE_TILE = 77
+HILL_TILE = 98
+CAMPFIRE_BLOCKED_TILES = {2, 3, 4, 5, 6, 7, 8, 10, 11, 12, 13, 14, 15, 16}
+
+# Byte translation table from a tile code to 1 if the tile can be walked on, 0 if it is blocked
+PASSABLE_TABLE = bytes(code not in BLOCKED_TILES for code in range(256))
+
+
+class TriggerIndex:
+    """
+    The triggers of every cell of a map, kept up to date as items are picked up and campfires are placed, so
+    every interaction is a single lookup. The triggers a cell's tile gives it are read from TILE_TRIGGERS when
+    the cell is looked up, so building the index is only as slow as the number of items and costs no memory
+    per cell, on a MapGrid or a ChunkedMap alike. Only the cells whose triggers differ from their tile's, the
+    cells with an item or a campfire, are kept.
+
+    The triggers of a cell are a frozen set of names: 'Chest', 'sign1', 'sign2' or 'sign3' for the interact button,
+    'pickup' when an item lies there, 'flare' where the flare gun can be fired and 'campfire' where a campfire
+    can be placed.
+
+    Instance Attributes:
+    - map_grid: the map the triggers belong to
+    - cells: the triggers of every cell with an item on it or a campfire placed on it, keyed by (x, y)
+    """
+    map_grid: MapGrid
+    cells: dict[tuple[int, int], frozenset[str]]
+
+    def __init__(self, map_grid: MapGrid, items) -> None:
+        self.map_grid = map_grid
+        self.cells = {}
+        for cell in items:
+            self.cells[tuple(cell)] = self.at(cell) | {'pickup'}
+
+    @staticmethod
+    def tile_triggers(tile: int) -> frozenset[str]:
+        """
+        Return the triggers a tile gives its cell.
+        """
+        triggers = set()
+        if tile in INTERACTION_TILES:
+            triggers.add(INTERACTION_TILES[tile])
+        if tile == FLARE_TILE:
+            triggers.add('flare')
+        if tile not in CAMPFIRE_BLOCKED_TILES:
+            triggers.add('campfire')
+        return frozenset(triggers)
+
+    def at(self, cell) -> frozenset[str]:
+        """
+        Return the triggers of a cell.
+        """
+        cell = tuple(cell)
+        triggers = self.cells.get(cell)
+        if triggers is None:
+            if not self.map_grid.in_bounds(*cell):
+                return NO_TRIGGERS
+            return TILE_TRIGGERS[self.map_grid.tile_at(*cell)]
+        return triggers
+
+    def interaction(self, cell) -> str:
+        """
+        Return what the interact button does on a cell: 'Chest', 'sign1', 'sign2', 'sign3' or 'Error'.
+        """
+        triggers = self.at(cell)
+        for interaction in INTERACTION_TILES.values():
+            if interaction in triggers:
+                return interaction
+        return 'Error'
+
+    def can_pick_up(self, cell) -> bool:
+        """
+        Return whether an item lies on a cell.
+        """
+        return 'pickup' in self.at(cell)
+
+    def can_fire_flare(self, cell) -> bool:
+        """
+        Return whether the flare gun can be fired from a cell.
+        """
+        return 'flare' in self.at(cell)
+
+    def can_place_campfire(self, cell) -> bool:
+        """
+        Return whether a campfire can be placed on a cell.
+        """
+        return 'campfire' in self.at(cell)
+
+    def enabled_buttons(self, cell) -> dict[str, bool]:
+        """
+        Return whether the interact and pick up buttons do anything on a cell.
+        """
+        triggers = self.at(cell)
+        return {'interact': any(interaction in triggers for interaction in INTERACTION_TILES.values()),
+                'pick up': 'pickup' in triggers}
+
+    def item_picked_up(self, cell):
+        """
+        Forget the item that was picked up from a cell.
+        """
+        if 'pickup' in self.at(cell):
+            self.cells[tuple(cell)] = self.at(cell) - {'pickup'}
+
+    def campfire_placed(self, cell):
+        """
+        Mark a cell as holding a campfire, so no second campfire can be placed on it.
+        """
+        if 'campfire' in self.at(cell):
+            self.cells[tuple(cell)] = self.at(cell) - {'campfire'}
+
+
+# The triggers every tile code gives its cell, and the triggers of a cell outside the map
+TILE_TRIGGERS = tuple(TriggerIndex.tile_triggers(code) for code in range(256))
+NO_TRIGGERS = frozenset()
 
 
 def load_map(map_data: TextIO) -> list[list[int]]:
     """
     Loads a map from a text file-like object and converts it into a list of integer lists representing the game map.
+    A file opened in binary mode is read as a binary map (see mapformat.py).
     """
+    if isinstance(map_data, (io.RawIOBase, io.BufferedIOBase)):
+        return MapGrid.from_binary(MapFile(map_data)).to_rows()
 
     map_list = []
     for line in map_data:
@@ -217,18 +627,55 @@ def load_map(map_data: TextIO) -> list[list[int]]:
     return map_list
 
 
-def load_game_map(game_state):
+def is_up_to_date(converted_path: str, text_path: str) -> bool:
+    """
+    Returns whether a converted map exists and is not older than the text map it was converted from.
+    """
+    return os.path.exists(converted_path) and (not os.path.exists(text_path)
+                                               or os.path.getmtime(converted_path) >= os.path.getmtime(text_path))
+
+
+def load_binary_map(binary_path: str, map_name: str) -> MapGrid:
+    """
+    Returns the grid of a binary map, or None if the binary map is corrupt or not of this format.
+    """
+    try:
+        return MapGrid.from_binary(MapFile(binary_path), map_name)
+    except ValueError:
+        return None
+
+
+def load_game_map(game_state) -> MapGrid:
     """
-    Loads the game map from a local file.
+    Returns the grid of the current map, shared through the game state. The map file is only loaded when the
+    map has changed since the last load. The chunked version of the map is streamed (see streaming.py), or else
+    the binary version is memory-mapped, instead of parsing the text map when it exists and is not older than
+    the text map. A chunked or binary map that is corrupt or not of this format is passed over for the next one.
     """
-    game_map_data = []
     map_name = game_state.current_map()
-    map_file_path = f'{map_name}'
-    with open(map_file_path, 'r') as map_data:
-        for line in map_data:
-            row = [int(num) for num in line.split()]
-            game_map_data.append(row)
-    return game_map_data
+    if game_state.map_grid is None or game_state.map_grid.name != map_name:
+        game_state.close_map()
+        chunked_path, binary_path = chunked_map_path(map_name), binary_map_path(map_name)
+        if is_up_to_date(chunked_path, map_name):
+            try:
+                game_state.map_grid = ChunkedMap(chunked_path, map_name)
+            except ValueError:
+                pass
+        if game_state.map_grid is None and is_up_to_date(binary_path, map_name):
+            game_state.map_grid = load_binary_map(binary_path, map_name)
+        if game_state.map_grid is None:
+            with open(map_name, 'r') as map_data:
+                game_state.map_grid = MapGrid.parse(map_data, map_name)
+        game_state.triggers = TriggerIndex(game_state.map_grid, game_state.items)
+    return game_state.map_grid
+
+
+def get_triggers(game_state) -> TriggerIndex:
+    """
+    Returns the trigger index of the current map, built when the map is loaded.
+    """
+    load_game_map(game_state)
+    return game_state.triggers
 
 
 class Timer:
@@ -273,16 +720,44 @@ class Timer:
         self.elapsed_time = 0
         self.running = False
 
+    def set_time(self, seconds: float):
+        """
+        Stop the timer at a time in seconds, as when a saved game is loaded.
+        """
+        self.start_ticks = pygame.time.get_ticks()
+        self.elapsed_time = seconds * 1000
+        self.running = False
+
+
+# Predefined item coordinates for each map
+ITEM_COORDINATES = {
+    'map1': [(2, 10), (5, 12), (12, 1), (10, 3), (12, 5), (19, 5), (20, 8), (12, 12), (20, 12), (1, 9)],
+    'map2': [(20, 12), (8, 1), (1, 6), (7, 9), (7, 4), (14, 1), (6, 12), (8, 6), (20, 7), (1, 12)],
+    'map3': [(5, 3), (14, 6), (20, 12), (10, 1), (13, 8), (8, 9), (1, 4), (17, 7), (16, 3), (6, 12)],
+}
 
-def set_items(map_value):
+
+def item_coordinates_path(map_path: str) -> str:
     """
-    Chooses and sets the items on the map
+    Returns the path of the item coordinates written with a generated map.
     """
-    # Predefined coordinates for each map
-    coordinates_map1 = [(2, 10), (5, 12), (12, 1), (10, 3), (12, 5), (19, 5), (20, 8), (12, 12), (20, 12), (1, 9)]
-    coordinates_map2 = [(20, 12), (8, 1), (1, 6), (7, 9), (7, 4), (14, 1), (6, 12), (8, 6), (20, 7), (1, 12)]
-    coordinates_map3 = [(5, 3), (14, 6), (20, 12), (10, 1), (13, 8), (8, 9), (1, 4), (17, 7), (16, 3), (6, 12)]
+    return map_path + '.items.json'
+
 
+def load_item_coordinates(map_path: str) -> list[tuple[int, int]]:
+    """
+    Returns the item coordinates written with a generated map (see mapgen.py), or none if there are none.
+    """
+    if not os.path.exists(item_coordinates_path(map_path)):
+        return []
+    with open(item_coordinates_path(map_path), 'r') as items_file:
+        return [tuple(item) for item in json.load(items_file)['items']]
+
+
+def set_items(map_value, rng=random):
+    """
+    Chooses and sets the items on the map, shuffled with the given random number generator
+    """
     # Items available
     items = [
         Item("Apple", 'Food Item: Gives +2 health'),
@@ -298,14 +773,10 @@ def set_items(map_value):
     ]
 
     # Shuffle the items
-    random.shuffle(items)
+    rng.shuffle(items)
 
-    # Select the coordinate list based on the map
-    coordinates = {
-        'map1': coordinates_map1,
-        'map2': coordinates_map2,
-        'map3': coordinates_map3
-    }.get(map_value, [])
+    # Select the coordinate list based on the map, or read the one written with a generated map
+    coordinates = ITEM_COORDINATES.get(map_value) or load_item_coordinates(map_value)
 
     # Assign shuffled items to the coordinates
     return {coord: item for coord, item in zip(coordinates, items)}
@@ -325,8 +796,15 @@ class GameState:
         self.campfire_locations = []
         self.statistics = {'Health Lost': 0, 'Health Gained': 0}
         self.map = 'None'
+        self.seed = None
         self.items = set_items(self.map)
         self.help_tracker = 0
+        self.map_layer = None
+        self.map_layer_name = 'None'
+        self.map_layer_area = None
+        self.map_grid = None
+        self.triggers = None
+        self.camera = Camera()
 
     def remove_item(self, location):
         """
@@ -334,6 +812,8 @@ class GameState:
         """
         if location in self.items:
             self.items.pop(location)
+        if self.triggers is not None:
+            self.triggers.item_picked_up(location)
 
     def current_map(self) -> str:
         """
@@ -341,19 +821,26 @@ class GameState:
         """
         return self.map
 
-    def map_selector(self, value):
+    def map_selector(self, value, seed=None):
         """
-        f
+        Select the map, map1, map2, map3 or the path of a generated map, reshuffle its items with a seed, or a new
+        random one, and drop the cached map layer and grid. The seed is kept so the game can be replayed.
         """
+        self.map_layer = None
+        self.close_map()
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
         if value == 'map1':
             self.map = 'map1'
-            self.items = set_items('map1')
+            self.items = set_items('map1', random.Random(self.seed))
         elif value == 'map2':
             self.map = 'map2'
-            self.items = set_items('map2')
+            self.items = set_items('map2', random.Random(self.seed))
         elif value == 'map3':
             self.map = 'map3'
-            self.items = set_items('map3')
+            self.items = set_items('map3', random.Random(self.seed))
+        elif os.path.exists(value):
+            self.map = value
+            self.items = set_items(value, random.Random(self.seed))
 
     def health_lost_adder(self):
         """
@@ -372,6 +859,8 @@ class GameState:
         Record the player's current grid location as a campfire location.
         """
         self.campfire_locations.append(player.get_player_grid_location())
+        if self.triggers is not None:
+            self.triggers.campfire_placed(player.get_player_grid_location())
 
     def campfire_location(self):
         """
@@ -390,6 +879,16 @@ class GameState:
         self.end = False
         self.map = 'None'
         self.help_tracker = 0
+        self.map_layer = None
+        self.close_map()
+
+    def close_map(self):
+        """
+        Close the current map's grid, so the next load_game_map loads the map again.
+        """
+        if self.map_grid is not None:
+            self.map_grid.close()
+        self.map_grid = None
 
     def end_game(self):
         """
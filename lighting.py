@@ -0,0 +1,128 @@
+"""
+This module contains the light mask used to darken the map in dark mode.
+
+The mask is allocated once and reused every frame. Lights are stamped into it from cutouts that are drawn
+once per radius, and only the areas stamped on the previous frame are darkened again before the next one.
+Any number of lights can be stamped per frame.
+
+With SOFT_LIGHT (set the FOREST_SOFT_LIGHT environment variable to 1) the mask carries per-pixel alpha and
+every light fades out towards its edge instead of ending in a hard colorkey edge.
+
+Functions:
+- draw_hard_cutout: Draws a hard-edged light cutout.
+- draw_soft_cutout: Draws a light cutout with a radial falloff.
+
+Classes:
+- LightMask: A reusable darkness mask with light cutouts.
+"""
+import os
+
+import pygame
+
+SOFT_LIGHT = os.environ.get('FOREST_SOFT_LIGHT', '0') == '1'
+
+# Light radius around the player for each difficulty, and around a lit campfire
+LIGHT_RADII = {'easy': 80, 'medium': 60, 'hard': 40}
+CAMPFIRE_LIGHT_RADIUS = 100
+
+DARKNESS = (0, 0, 0)
+LIGHT_KEY = (255, 255, 255)
+
+
+def draw_hard_cutout(radius: int) -> pygame.Surface:
+    """
+    Draws a hard-edged light cutout. Stamping it writes the mask colorkey inside the circle only.
+    """
+    cutout = pygame.Surface((2 * radius + 2, 2 * radius + 2))
+    cutout.fill(DARKNESS)
+    pygame.draw.circle(cutout, LIGHT_KEY, (radius + 1, radius + 1), radius)
+    cutout.set_colorkey(DARKNESS)
+    return cutout
+
+
+def draw_soft_cutout(radius: int) -> pygame.Surface:
+    """
+    Draws a light cutout whose darkness rises from fully clear at the centre to fully dark at the edge.
+    """
+    cutout = pygame.Surface((2 * radius + 2, 2 * radius + 2), pygame.SRCALPHA)
+    cutout.fill((*DARKNESS, 255))
+    for ring in range(radius, 0, -1):
+        alpha = int(255 * (ring / radius) ** 2)
+        pygame.draw.circle(cutout, (*DARKNESS, alpha), (radius + 1, radius + 1), ring)
+    return cutout
+
+
+class LightMask:
+    """
+    A reusable darkness mask with light cutouts.
+
+    Instance Attributes:
+    - size: the size of the mask in pixels
+    - soft: whether lights fade out towards their edge
+    - surface: the preallocated mask, created on first use
+    - radii: the light radii whose cutouts are drawn when the mask is allocated
+    - cutouts: the precomputed light cutouts, keyed by radius
+    - stamped: the areas of the mask lit on the last frame
+    """
+    size: tuple[int, int]
+    soft: bool
+    radii: tuple[int, ...]
+    surface: pygame.Surface
+    cutouts: dict[int, pygame.Surface]
+    stamped: list[pygame.Rect]
+
+    def __init__(self, size=(1130, 715), soft=SOFT_LIGHT, radii=(*LIGHT_RADII.values(), CAMPFIRE_LIGHT_RADIUS)):
+        self.size = size
+        self.soft = soft
+        self.radii = radii
+        self.surface = None
+        self.cutouts = {}
+        self.stamped = []
+
+    def allocate(self):
+        """
+        Allocate the mask and draw the cutouts for the configured radii.
+        """
+        if self.soft:
+            self.surface = pygame.Surface(self.size, pygame.SRCALPHA)
+        else:
+            self.surface = pygame.Surface(self.size)
+            self.surface.set_colorkey(LIGHT_KEY)
+        self.surface.fill(self.darkness())
+        self.stamped = []
+        for radius in self.radii:
+            self.cutout(radius)
+
+    def darkness(self) -> tuple:
+        """
+        Return the colour of an unlit part of the mask.
+        """
+        return (*DARKNESS, 255) if self.soft else DARKNESS
+
+    def cutout(self, radius: int) -> pygame.Surface:
+        """
+        Return the cutout for a light radius, drawing it the first time the radius is used.
+        """
+        if radius not in self.cutouts:
+            self.cutouts[radius] = draw_soft_cutout(radius) if self.soft else draw_hard_cutout(radius)
+        return self.cutouts[radius]
+
+    def draw(self, screen, lights, position=(185, 85)):
+        """
+        Darken the mask again where it was lit, stamp every (centre, radius) light into it and blit it.
+        """
+        if self.surface is None:
+            self.allocate()
+        for rect in self.stamped:
+            self.surface.fill(self.darkness(), rect)
+        self.stamped = []
+
+        flags = pygame.BLEND_RGBA_MIN if self.soft else 0
+        for (x, y), radius in lights:
+            stamped = self.surface.blit(self.cutout(radius), (x - radius - 1, y - radius - 1), special_flags=flags)
+            self.stamped.append(stamped)
+
+        screen.blit(self.surface, position)
+
+
+light_mask = LightMask()
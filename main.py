@@ -3,549 +3,690 @@ This module contains the main game loop and supporting functions for a Pygame-ba
 
 The module performs the following tasks:
 - Initializes Pygame and sets up the game display, mixer, and timer.
-- Defines the main game screen function that handles the core game logic, including player inputs,
+- Defines the main game scene that handles the core game logic, including player inputs,
   game state updates, rendering, and audio management.
-- Provides additional screens for inventory management, item usage, game win, and gameover states.
-- Implements the main menu and selection screens where players can configure game settings and start the game.
-- Includes helper functions for stopping the campfire sound and managing game state transitions.
+- Provides additional scenes for inventory management, item usage, game win, and gameover states.
+- Implements the main menu and selection scenes where players can configure game settings and start the game.
+- Runs every scene from the single loop of a SceneManager (see scene.py). Scenes open each other with push,
+  pop and replace instead of calling each other, so moving between screens never grows the Python stack.
+- Records every game to a log in the FOREST_RECORD directory, when it is set, to be replayed with replay.py.
+- Saves games to save slots on a background thread and loads them from the start screen (see savegame.py).
 
 Functions:
-- game_screen: The main game screen where the game logic and player interactions are handled.
-- inventory_screen: The inventory screen where players can view and craft items.
-- use_screen: The screen where players can use specific items from their inventory.
-- win_screen: The screen displayed when the player wins the game.
-- gameover_screen: The screen displayed when the player loses the game.
-- menu_screen: The main menu screen of the game.
-- selection_screen: The screen where users choose game preferences.
-- start_screen: The starting screen of the game.
 - main: The main function that initializes the game state and starts the game.
+
+Classes:
+- GameScene: The main game screen where the game logic and player interactions are handled.
+- InventoryScene: The inventory screen where players can view and craft items.
+- UseScene: The screen where players can use specific items from their inventory.
+- WinScene: The screen displayed when the player wins the game.
+- GameoverScene: The screen displayed when the player loses the game.
+- MenuScene: The main menu screen of the game.
+- IntroScene: The introduction screen which explains the game story.
+- SelectionScene: The screen where users choose game preferences.
+- StartScene: The starting screen of the game.
 """
 
 import sys
+import assets
 from set import *
+from renderer import *
+from scene import *
+from replay import *
+from savegame import *
 
 timer = Timer()
 
+MOVEMENT_KEY_CODES = [pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN,
+                      pygame.K_a, pygame.K_w, pygame.K_s, pygame.K_d]
+SAVE_KEY_CODES = dict(zip([pygame.K_F1, pygame.K_F2, pygame.K_F3], SAVE_SLOTS))
+LOAD_KEY_CODES = {**SAVE_KEY_CODES, pygame.K_F4: AUTOSAVE_SLOT}
+
 
-def game_screen(game_state, player, current_game_map):
+class GameScene(Scene):
     """
     This screen is where the game itself is being played.
 
-    The function performs the following tasks:
-    - Initializes game states and variables.
-    - Handles player inputs (mouse and keyboard events).
-    - Updates player movement and interactions.
+    The scene performs the following tasks:
+    - Initializes game states and variables every time it is entered or resumed.
+    - Handles player inputs (mouse and keyboard events) and turns them into actions of the game's simulation
+      (see simulation.py).
+    - Steps the simulation, which moves the player and applies the game rules, in fixed steps independent of the
+      frame rate.
     - Manages audio effects and background music.
     - Renders game elements like the map, player, and UI components.
-    - Checks for game state changes like health updates, item pickups, and game end conditions.
+    - Shows the outcome of the player's actions and the end of the game.
+    - Saves the game to a save slot when asked to and autosaves it every AUTOSAVE_SECONDS of game time.
+    - Times the handling of events, the simulation steps and the flip of the display as spans of the profiler,
+      and shows the profiler's statistics when F12 is pressed (see profiler.py).
     """
 
-    if not timer.running:
-        timer.start()
-
-    last_update_time = pygame.time.get_ticks()
-
-    campfire_active = False
-    campfire_start = None
-    campfire_i = 0
-    is_campfire_sound = False
-
-    end_buffer = None
-
-    confirm_flag = False
-
-    msg_display = None
-    msg_start = 0
-    last_health_update_time = 0
-
-    dying_sound_played = False
-    footstep_sound = pygame.mixer.Sound(footsteps_sound)
-    footstep_sound.set_volume(0.25)
-    pressed_keys = set()
-
-    campfire_sound1 = pygame.mixer.Sound(campfire_sound)
-    campfire_sound1.set_volume(0.1)
-
-    health_decrement_interval = get_health_decrement(game_state)
-
-    dark_mode_temp_off = False
-    dark_mode_off_start = None
-
-    play_music(game_music, 0.4)
-    running_game = True
-    last_breath_time = pygame.time.get_ticks()
-    while running_game:
+    def __init__(self, game_state, player, current_game_map, session=None):
+        self.game_state = game_state
+        self.player = player
+        self.current_game_map = current_game_map
+        self.simulation = Simulation(game_state, player)
+        if session is not None:
+            self.simulation.restore(session['snapshot'])
+            timer.set_time(session['timer'])
+        self.next_autosave = self.simulation.clock.now() + AUTOSAVE_SECONDS * 1000
+        self.recorder = Recorder(recording_path(RECORD_DIRECTORY), self.simulation, timer) if RECORD_DIRECTORY else None
+
+    def enter(self):
+        """
+        Start the game, or start it again after the inventory or use screen.
+        """
+        load_scene_assets('game')
+        sound_bank.preload(GAME_SOUNDS)
+
+        if not timer.running:
+            timer.start()
+
+        self.last_update_time = pygame.time.get_ticks()
+
+        self.campfire_i = 0
+        self.is_campfire_sound = False
+
+        self.end_buffer = None
+
+        self.confirm_flag = False
+
+        self.msg_display = None
+        self.msg_start = 0
+
+        self.dying_sound_played = False
+        self.footstep_sound = sound_bank.get(footsteps_sound)
+        self.footstep_sound.set_volume(0.25)
+        self.pressed_keys = set()
+
+        self.campfire_sound1 = sound_bank.get(campfire_sound)
+        self.campfire_sound1.set_volume(0.1)
+
+        self.dark_mode_temp_off = False
+        self.dark_mode_off_start = None
+
+        self.renderer = DirtyRectRenderer() if DIRTY_RECTS else None
+
+        play_music(game_music, 0.4)
+        self.last_breath_time = pygame.time.get_ticks()
+        self.accumulator = 0.0
+
+    def resume(self):
+        """
+        Start the game again after the inventory or use screen was closed.
+        """
+        self.enter()
+
+    def leave_game(self):
+        """
+        Stop the timer, music, campfire and footsteps before another screen is opened on top of the game.
+        """
+        timer.stop()
+        play_sound_effect(select_sound, 0.2)
+        pygame.mixer.music.pause()
+        self.is_campfire_sound = pause_campfire(self.is_campfire_sound, self.campfire_sound1)
+        if self.footstep_sound.get_num_channels():
+            self.footstep_sound.stop()
+
+    def stop_recording(self):
+        """
+        Finish the recording of the game, if it is being recorded.
+        """
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+
+    def save(self, slot: str):
+        """
+        Save the game to a save slot. The game is copied now and written on the save writer's thread.
+        """
+        if not self.simulation.over:
+            save_writer.save(slot_path(slot), capture_session(self.simulation, timer))
+
+    def frame(self, screen, events):
+        """
+        Handle the events of one frame, advance the simulation and draw the game.
+        """
+        self.accumulator += min(self.manager.frame_time, MAX_FRAME_TIME)
         current_time = pygame.time.get_ticks()
-        if (current_time - last_breath_time) >= 1000 and not confirm_flag and running_game:
+        if (current_time - self.last_breath_time) >= 1000 and not self.confirm_flag:
             play_sound_effect(breathe_sound, 1)
-            last_breath_time = current_time
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                timer.stop()
-                pygame.quit()
-                sys.exit()
-            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                if small_button_rect.collidepoint(event.pos):
-                    play_sound_effect(select_sound, 0.2)
-                    msg_display = 'return'
-                    confirm_flag = True
-                if confirm_flag:
+            self.last_breath_time = current_time
+        with measure('events'):
+            for event in events:
+                if event.type == pygame.QUIT:
                     timer.stop()
-                    pygame.mixer.music.pause()
-                    if yes_button_rect.collidepoint(event.pos):
+                    self.stop_recording()
+                    self.save(AUTOSAVE_SLOT)
+                    self.manager.quit()
+                    return
+                elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    if small_button_rect.collidepoint(event.pos):
                         play_sound_effect(select_sound, 0.2)
-                        timer.reset()
+                        self.msg_display = 'return'
+                        self.confirm_flag = True
+                    if self.confirm_flag:
                         timer.stop()
-                        is_campfire_sound = pause_campfire(is_campfire_sound, campfire_sound1)
-                        running_game = False
-                        game_state.reset()
-                        start_screen(game_state)
-                    elif no_button_rect.collidepoint(event.pos):
-                        play_sound_effect(select_sound, 0.2)
-                        timer.start()
-                        pygame.mixer.music.unpause()
-                        msg_display = 'none'
-                        confirm_flag = False
+                        pygame.mixer.music.pause()
+                        if yes_button_rect.collidepoint(event.pos):
+                            play_sound_effect(select_sound, 0.2)
+                            timer.reset()
+                            timer.stop()
+                            self.is_campfire_sound = pause_campfire(self.is_campfire_sound, self.campfire_sound1)
+                            self.stop_recording()
+                            self.save(AUTOSAVE_SLOT)
+                            self.game_state.reset()
+                            self.manager.pop()
+                            return
+                        elif no_button_rect.collidepoint(event.pos):
+                            play_sound_effect(select_sound, 0.2)
+                            timer.start()
+                            pygame.mixer.music.unpause()
+                            self.msg_display = 'none'
+                            self.confirm_flag = False
+
+                    elif use_item_button_rect.collidepoint(event.pos):
+                        self.leave_game()
+                        self.manager.push(UseScene(self.simulation))
+                        return
+                    elif inventory_button_rect.collidepoint(event.pos):
+                        self.leave_game()
+                        self.manager.push(InventoryScene(self.simulation))
+                        return
+
+                    elif interact_button_rect.collidepoint(event.pos):
+                        self.msg_display = self.simulation.interact()
+                        self.msg_start = current_time
+                        if self.msg_display in {'interact error', 'key error'}:
+                            play_sound_effect(error_sound, 0.3)
+                        elif self.msg_display in {'sign1', 'sign2', 'sign3'}:
+                            play_sound_effect(sign_sound, 0.3)
+                        else:
+                            play_sound_effect(chest_sound, 0.4)
 
-                elif use_item_button_rect.collidepoint(event.pos):
-                    timer.stop()
-                    play_sound_effect(select_sound, 0.2)
-                    pygame.mixer.music.pause()
-                    is_campfire_sound = pause_campfire(is_campfire_sound, campfire_sound1)
-                    if footstep_sound.get_num_channels():
-                        footstep_sound.stop()
-                    use_screen(game_state, player, current_game_map)
-                    running_game = False
-                elif inventory_button_rect.collidepoint(event.pos):
-                    timer.stop()
-                    play_sound_effect(select_sound, 0.2)
-                    pygame.mixer.music.pause()
-                    is_campfire_sound = pause_campfire(is_campfire_sound, campfire_sound1)
-                    if footstep_sound.get_num_channels():
-                        footstep_sound.stop()
-                    inventory_screen(game_state, player, current_game_map)
-                    running_game = False
-
-                elif interact_button_rect.collidepoint(event.pos):
-                    if interact_checker(player, game_state) == 'Error':
-                        play_sound_effect(error_sound, 0.3)
-                        msg_display = 'interact error'
-                        msg_start = current_time
-                    elif interact_checker(player, game_state) in {'sign1', 'sign2', 'sign3'}:
-                        play_sound_effect(sign_sound, 0.3)
-                        msg_display = interact_checker(player, game_state)
-                        msg_start = current_time
-                    elif interact_checker(player, game_state) == 'Chest':
-                        if all(key in player.inventory for key in {'Wood Key', 'Gold Key', 'Blue Key', 'Copper Key'}):
-                            open_chest(player)
-                            msg_display = 'chest opened'
-                            msg_start = current_time
+                    elif pick_up_button_rect.collidepoint(event.pos):
+                        self.msg_display = self.simulation.pick_up()
+                        self.msg_start = current_time
+                        if self.msg_display == 'pick up':
+                            play_sound_effect(pickup_sound, 3)
                         else:
                             play_sound_effect(error_sound, 0.3)
-                            msg_display = 'key error'
-                            msg_start = current_time
-
-                elif pick_up_button_rect.collidepoint(event.pos):
-                    player_grid_pos = player.get_player_grid_location()
-                    player_grid_tuple = (player_grid_pos[0], player_grid_pos[1])
-                    items_on_ground = game_state.items
-                    if player_grid_tuple in items_on_ground:
-                        play_sound_effect(pickup_sound, 3)
-                        item = items_on_ground.pop(player_grid_tuple)
-                        game_state.remove_item(player_grid_tuple)
-                        player.item_to_inventory(item)
-                        msg_display = 'pick up'
-                        msg_start = current_time
-                    else:
-                        play_sound_effect(error_sound, 0.3)
-                        msg_display = 'pick up error'
-                        msg_start = current_time
 
-                elif help_button_rect.collidepoint(event.pos) and game_state.is_dark_mode():
-                    play_sound_effect(select_sound, 0.2)
-                    dark_mode_temp_off = True
-                    dark_mode_off_start = pygame.time.get_ticks()
-                    game_state.toggle_dark_mode()
-                    game_state.help_tracker += 1
-
-            elif event.type == pygame.KEYDOWN:
-                if event.key in [pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN,
-                                 pygame.K_a, pygame.K_w, pygame.K_s, pygame.K_d]:
-                    pressed_keys.add(event.key)
-                    if (not confirm_flag and not footstep_sound.get_num_channels() and not game_state.check_end()
-                            and not player.health < 0.5):
-                        footstep_sound.play(-1)
-
-            elif event.type == pygame.KEYUP:
-                if event.key in [pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN,
-                                 pygame.K_a, pygame.K_w, pygame.K_s, pygame.K_d]:
-                    pressed_keys.discard(event.key)
-                    if not pressed_keys:
-                        footstep_sound.stop()
+                    elif (help_button_rect.collidepoint(event.pos) and self.game_state.is_dark_mode()
+                          and not self.dark_mode_temp_off):
+                        play_sound_effect(select_sound, 0.2)
+                        self.dark_mode_temp_off = True
+                        self.dark_mode_off_start = pygame.time.get_ticks()
+                        self.simulation.ask_for_help()
+
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_F12 and profiler.enabled:
+                        profiler.overlay = not profiler.overlay
+                    elif event.key in SAVE_KEY_CODES and not self.confirm_flag:
+                        play_sound_effect(select_sound, 0.2)
+                        self.save(SAVE_KEY_CODES[event.key])
+                    elif event.key in MOVEMENT_KEY_CODES:
+                        self.pressed_keys.add(event.key)
+                        if (not self.confirm_flag and not self.footstep_sound.get_num_channels()
+                                and not self.game_state.check_end() and not self.player.health < 0.5):
+                            self.footstep_sound.play(-1)
+
+                elif event.type == pygame.KEYUP:
+                    if event.key in MOVEMENT_KEY_CODES:
+                        self.pressed_keys.discard(event.key)
+                        if not self.pressed_keys:
+                            self.footstep_sound.stop()
+
+        with measure('simulation'):
+            while self.accumulator >= SIMULATION_STEP:
+                if self.confirm_flag:
+                    self.player.save_position()
+                else:
+                    self.simulation.step(pygame.key.get_pressed())
+                self.accumulator -= SIMULATION_STEP
+        if AUTOSAVE_SECONDS and self.simulation.clock.now() >= self.next_autosave:
+            self.save(AUTOSAVE_SLOT)
+            self.next_autosave = self.simulation.clock.now() + AUTOSAVE_SECONDS * 1000
+        alpha = self.accumulator / SIMULATION_STEP
+        self.current_game_map.stream(self.player.get_player_grid_location())
 
         screen.fill(D_BLUE)
-        if not confirm_flag and not game_state.check_end() and not player.health < 0.5:
-            player.handle_movement(current_game_map)
 
-        display_time(timer, screen)
-        display_hearts(player, screen)
-        display_buttons(screen, game_state)
-        display_map(player, screen, game_state)
+        time_area = display_time(timer, screen)
+        hearts_area = display_hearts(self.player, screen)
+        buttons_enabled = get_triggers(self.game_state).enabled_buttons(self.player.get_player_grid_location())
+        help_area = display_buttons(screen, self.game_state, buttons_enabled, not self.dark_mode_temp_off)
+        map_areas = display_map(self.player, screen, self.game_state, alpha)
+        campfire_area = pygame.Rect(0, 0, 0, 0)
+        end_areas = []
 
-        if game_state.is_dark_mode() and not dark_mode_temp_off:
-            display_mask(player, game_state, campfire_active, screen)
-        display_messages(screen, msg_display, current_time, msg_start)
+        mask_drawn = self.game_state.is_dark_mode() and not self.dark_mode_temp_off
+        if mask_drawn:
+            display_mask(self.player, self.game_state, self.game_state.is_campfire(), screen)
+        message_areas = display_messages(screen, self.msg_display, current_time, self.msg_start)
 
-        if dark_mode_temp_off:
+        if self.dark_mode_temp_off:
             current_time = pygame.time.get_ticks()
-            if (current_time - dark_mode_off_start) >= 1000:
-                dark_mode_temp_off = False
-                game_state.toggle_dark_mode()
-
-        if game_state.is_campfire() and campfire_active is False:
-            campfire_active = True
-            campfire_start = current_time
-
-        if campfire_active and not is_campfire_sound:
-            campfire_sound1.play(-1)
-            is_campfire_sound = True
-
-        if not campfire_active and is_campfire_sound:
-            campfire_sound1.stop()
-            is_campfire_sound = False
-
-        if campfire_active == 1:
-            x = game_state.campfire_location()[0]
-            y = game_state.campfire_location()[1]
-            x1 = (x * 50) + 205
-            y1 = (y * 50) + 100
-            if current_time - campfire_start < 15000:
-                if (current_time - last_update_time) > 200:
-                    campfire_i = (campfire_i + 1) % len(campfire_images)
-                    last_update_time = current_time
-                screen.blit(campfire_images[campfire_i], (x1, y1))
-                if player.get_player_grid_location() == [x, y]:
-                    if player.health <= 7:
-                        player.health += 0.01
-                        game_state.health_gained_adder(0.01)
-                campfire_active = True
-            else:
-                screen.blit(campfire_base, (x1, y1))
-                game_state.toggle_campfire()
-                campfire_active = False
-
-        if game_state.check_end():
+            if (current_time - self.dark_mode_off_start) >= 1000:
+                self.dark_mode_temp_off = False
+
+        campfire_lit = self.game_state.is_campfire()
+        if campfire_lit and not self.is_campfire_sound:
+            self.campfire_sound1.play(-1)
+            self.is_campfire_sound = True
+
+        if not campfire_lit and self.is_campfire_sound:
+            self.campfire_sound1.stop()
+            self.is_campfire_sound = False
+
+        if campfire_lit:
+            cell_x, cell_y = self.game_state.camera.grid_to_screen(*self.game_state.campfire_location())
+            screen.set_clip(self.game_state.camera.view)
+            if (current_time - self.last_update_time) > 200:
+                self.campfire_i = (self.campfire_i + 1) % len(assets.campfire_images)
+                self.last_update_time = current_time
+            campfire_area = screen.blit(assets.campfire_images[self.campfire_i], (cell_x + 5, cell_y))
+            screen.set_clip(None)
+
+        if self.simulation.won:
             timer.stop()
-            is_campfire_sound = pause_campfire(is_campfire_sound, campfire_sound1)
-            if not end_buffer:
-                end_buffer = current_time
+            self.is_campfire_sound = pause_campfire(self.is_campfire_sound, self.campfire_sound1)
+            if not self.end_buffer:
+                self.end_buffer = current_time
 
-            if current_time - end_buffer <= 5000:
-                display_text(screen, 'win')
+            if current_time - self.end_buffer <= 5000:
+                end_areas = display_text(screen, 'win')
             else:
-                running_game = False
-                win_screen(game_state)
-
-        if player.health < 0.5 and not dying_sound_played:
-            play_sound_effect(dying_sound, 0.6)
-            dying_sound_played = True
-        if (current_time - last_health_update_time) > health_decrement_interval and not game_state.check_end():
-            if not confirm_flag:
-                player.health -= 0.5
-                game_state.health_lost_adder()
-                last_health_update_time = current_time
-        if player.health < 0.5:
-            player.kill_player()
+                self.stop_recording()
+                self.manager.replace(WinScene(self.game_state))
+                return
+
+        if self.simulation.lost:
+            if not self.dying_sound_played:
+                play_sound_effect(dying_sound, 0.6)
+                self.dying_sound_played = True
+            self.player.kill_player()
             timer.stop()
-            is_campfire_sound = pause_campfire(is_campfire_sound, campfire_sound1)
-            if not end_buffer:
-                end_buffer = current_time
-            if current_time - end_buffer <= 4000:
-                display_text(screen, 'lose')
+            self.is_campfire_sound = pause_campfire(self.is_campfire_sound, self.campfire_sound1)
+            if not self.end_buffer:
+                self.end_buffer = current_time
+            if current_time - self.end_buffer <= 4000:
+                end_areas = display_text(screen, 'lose')
             else:
-                running_game = False
-                gameover_screen(game_state, timer)
-
-        pygame.display.flip()
+                self.stop_recording()
+                self.manager.replace(GameoverScene(self.game_state, timer))
+                return
+
+        if profiler.overlay:
+            display_profiler(screen, profiler.statistics())
+
+        with measure('flip'):
+            if self.renderer:
+                self.renderer.track('time', time_area)
+                self.renderer.track('hearts', hearts_area)
+                self.renderer.track('help', help_area)
+                self.renderer.track('buttons', [interact_button_rect, pick_up_button_rect],
+                                    signature=tuple(buttons_enabled.values()))
+                self.renderer.track('items', map_areas[:-1])
+                self.renderer.track('player', map_areas[-1])
+                self.renderer.track('campfire', campfire_area)
+                self.renderer.track('messages', message_areas)
+                self.renderer.track('end', end_areas)
+                sign_shown = self.msg_display in {'sign1', 'sign2', 'sign3'} and current_time - self.msg_start <= 5000
+                if mask_drawn or sign_shown or self.confirm_flag or self.game_state.camera.moved or profiler.overlay:
+                    self.renderer.request_full()
+                self.renderer.present(screen)
+            else:
+                pygame.display.flip()
 
 
-def inventory_screen(game_state, player, current_game_map):
+class InventoryScene(Scene):
     """
     The inventory screen where players can view and craft items .
 
-    The function performs the following tasks:
+    The scene performs the following tasks:
     - Handles mouse click events for crafting and using items.
     - Calls the inventory display.
-    - Handles crafting
+    - Crafts through the game's simulation
     """
-    running_inventory = True
-    display_message = False
 
-    play_music(inventory_use_music, 0.3)
-    while running_inventory:
-        for event in pygame.event.get():
+    def __init__(self, simulation):
+        self.simulation = simulation
+        self.player = simulation.player
+        self.display_message = False
+
+    def enter(self):
+        """
+        Load the inventory assets and start its music.
+        """
+        load_scene_assets('inventory')
+        play_music(inventory_use_music, 0.3)
+
+    def frame(self, screen, events):
+        """
+        Handle the clicks of one frame and draw the inventory.
+        """
+        for event in events:
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 if small_button_rect.collidepoint(event.pos):
                     play_sound_effect(select_sound, 0.2)
                     pygame.mixer.music.stop()
-                    running_inventory = False
-                    game_screen(game_state, player, current_game_map)
+                    self.manager.pop()
+                    return
                 if craft_button_rect.collidepoint(event.pos):
-                    if all(key in player.inventory for key in campfire_materials):
+                    if self.simulation.craft_campfire():
                         play_sound_effect(select_sound, 0.2)
-                        player.remove_item_from_inventory('Matchbox')
-                        player.remove_item_from_inventory('Logs')
-                        player.remove_item_from_inventory('Rock')
                         play_sound_effect(craft_sound, 0.4)
-                        player.inventory['Campfire'] = 'Heating Mechanism: Allows you to regain health'
-                        display_message = True
+                        self.display_message = True
                     else:
                         play_sound_effect(error_sound, 0.3)
 
-        display_inventory(screen, display_message, player)
+        display_inventory(screen, self.display_message, self.player)
 
         pygame.display.flip()
 
 
-def use_screen(game_state, player, current_game_map):
+class UseScene(Scene):
     """
     The use screen where players can use specific items from their inventory.
-    This function handles the display and interaction for using items like fruits,
+    This scene handles the display and interaction for using items like fruits,
     campfires, and flare guns. It allows players to use items and returns to the main
     game screen after using an item.
 
-    The function performs the following tasks:
+    The scene performs the following tasks:
     - Handles mouse click events for selecting and using items.
-    - Updates player health and inventory based on used items.
+    - Uses the items through the game's simulation, which updates player health and inventory.
     - calls the use screen display
     """
 
-    running_use = True
-    certain_button = False
-    indicator = 0
-    which_msg = None
-    msg_start = 0
-
-    play_music(inventory_use_music, 0.5)
-    while running_use:
+    def __init__(self, simulation):
+        self.simulation = simulation
+        self.player = simulation.player
+        self.certain_button = False
+        self.indicator = 0
+        self.which_msg = None
+        self.msg_start = 0
+
+    def enter(self):
+        """
+        Load the use screen assets and start its music.
+        """
+        load_scene_assets('use')
+        play_music(inventory_use_music, 0.5)
+
+    def frame(self, screen, events):
+        """
+        Handle the clicks of one frame and draw the use screen.
+        """
         current_time = pygame.time.get_ticks()
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 if small_button_rect.collidepoint(event.pos):
                     play_sound_effect(select_sound, 0.2)
                     pygame.mixer.music.stop()
-                    game_screen(game_state, player, current_game_map)
-                    running_use = False
-                if pear_rect.collidepoint(event.pos) and 'Pear' in player.inventory:
+                    self.manager.pop()
+                    return
+                if pear_rect.collidepoint(event.pos) and 'Pear' in self.player.inventory:
                     play_sound_effect(select_sound, 0.2)
-                    indicator = 1
-                    msg_start = current_time
-                    certain_button = True
-                if apple_rect.collidepoint(event.pos) and 'Apple' in player.inventory:
+                    self.indicator = 1
+                    self.msg_start = current_time
+                    self.certain_button = True
+                if apple_rect.collidepoint(event.pos) and 'Apple' in self.player.inventory:
                     play_sound_effect(select_sound, 0.2)
-                    indicator = 2
-                    msg_start = current_time
-                    certain_button = True
-                if orange_rect.collidepoint(event.pos) and 'Orange' in player.inventory:
+                    self.indicator = 2
+                    self.msg_start = current_time
+                    self.certain_button = True
+                if orange_rect.collidepoint(event.pos) and 'Orange' in self.player.inventory:
                     play_sound_effect(select_sound, 0.2)
-                    indicator = 3
-                    msg_start = current_time
-                    certain_button = True
-                if campfire_rect.collidepoint(event.pos) and 'Campfire' in player.inventory:
+                    self.indicator = 3
+                    self.msg_start = current_time
+                    self.certain_button = True
+                if campfire_rect.collidepoint(event.pos) and 'Campfire' in self.player.inventory:
                     play_sound_effect(select_sound, 0.2)
-                    indicator = 4
-                    msg_start = current_time
-                    certain_button = True
-                if flaregun_rect.collidepoint(event.pos) and 'FlareGun' in player.inventory:
+                    self.indicator = 4
+                    self.msg_start = current_time
+                    self.certain_button = True
+                if flaregun_rect.collidepoint(event.pos) and 'FlareGun' in self.player.inventory:
                     play_sound_effect(select_sound, 0.2)
-                    indicator = 5
-                    msg_start = current_time
-                    certain_button = True
-                if certain_button and game_button_rect.collidepoint(event.pos):
-                    certain_button = False
-                    if indicator in {1, 2, 3}:
+                    self.indicator = 5
+                    self.msg_start = current_time
+                    self.certain_button = True
+                if self.certain_button and game_button_rect.collidepoint(event.pos):
+                    self.certain_button = False
+                    if self.indicator in {1, 2, 3}:
                         play_sound_effect(select_sound, 0.2)
                         play_sound_effect(eat_sound, 0.5)
-                        player.remove_item_from_inventory(
-                            'Pear' if indicator == 1 else 'Apple' if indicator == 2 else 'Orange')
-                        if player.health >= 5:
-                            game_state.health_gained_adder(7 - player.health)
-                            player.health = 7
-                        else:
-                            game_state.health_gained_adder(2)
-                            player.health += 2
-                        which_msg = 'fruit'
-                        msg_start = current_time
-                    elif indicator == 4:
-                        if campfire_valid_loc(player.get_player_grid_code(game_state)):
+                        self.which_msg = self.simulation.eat(FRUITS[self.indicator - 1])
+                        self.msg_start = current_time
+                    elif self.indicator == 4:
+                        self.which_msg = self.simulation.place_campfire()
+                        self.msg_start = current_time
+                        if self.which_msg == 'campfire':
                             play_sound_effect(select_sound, 0.2)
                             play_sound_effect(place_sound, 0.5)
-                            player.remove_item_from_inventory('Campfire')
-                            which_msg = 'campfire'
-                            msg_start = current_time
-                            game_state.set_campfire_location(player)
-                            game_state.toggle_campfire()
                         else:
                             play_sound_effect(error_sound, 0.3)
-                            which_msg = 'error'
-                            msg_start = current_time
-                    elif indicator == 5:
-                        if player.get_player_grid_code(game_state) == 77:
+                    elif self.indicator == 5:
+                        if self.simulation.fire_flare() == 'win':
                             play_sound_effect(select_sound, 0.2)
                             play_sound_effect(flaregun_sound, 0.3)
-                            player.remove_item_from_inventory('FlareGun')
-                            game_state.end_game()
-                            if game_state.is_dark_mode():
-                                game_state.toggle_dark_mode()
-                            game_screen(game_state, player, current_game_map)
+                            self.manager.pop()
+                            return
                         else:
                             play_sound_effect(error_sound, 0.3)
-                            which_msg = 'error1'
-                            msg_start = current_time
+                            self.which_msg = 'error1'
+                            self.msg_start = current_time
 
-        display_use_text(certain_button, current_time, msg_start, game_button_rect, indicator, screen,
-                         which_msg)
-        display_items(screen, 400, window_size, player.inventory)
+        display_use_text(self.certain_button, current_time, self.msg_start, game_button_rect, self.indicator, screen,
+                         self.which_msg)
+        display_items(screen, 400, window_size, self.player.inventory)
 
         pygame.display.flip()
 
 
-def win_screen(game_state):
+class WinScene(Scene):
     """
-    This function handles the win screen where players are congratulated for winning.
+    This scene handles the win screen where players are congratulated for winning.
     It allows players to return to the main menu and reset the game state.
 
-    The function performs the following tasks:
+    The scene performs the following tasks:
     - Renders the win screen with congratulatory messages.
     """
-    running_win = True
-    play_music(win_music, 0.1)
-    while running_win:
-        for event in pygame.event.get():
+
+    def __init__(self, game_state):
+        self.game_state = game_state
+
+    def enter(self):
+        """
+        Load the win screen assets and start its music.
+        """
+        load_scene_assets('win')
+        play_music(win_music, 0.1)
+
+    def frame(self, screen, events):
+        """
+        Handle the clicks of one frame and draw the win screen.
+        """
+        for event in events:
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 if small_button_rect.collidepoint(event.pos):
                     play_sound_effect(select_sound, 0.2)
-                    running_win = False
                     timer.reset()
-                    game_state.reset()
-                    start_screen(game_state)
+                    self.game_state.reset()
+                    pygame.mixer.music.stop()
+                    self.manager.pop()
+                    return
 
-        display_win(screen, game_state, timer)
+        display_win(screen, self.game_state, timer)
 
         pygame.display.flip()
 
 
-def gameover_screen(game_state, timer):
+class GameoverScene(Scene):
     """
     The screen displayed when the player loses the game.
 
-    This function handles the game over screen where players are informed that they have lost.
+    This scene handles the game over screen where players are informed that they have lost.
     It allows players to return to the main menu and reset the game state.
 
-    The function performs the following tasks:
+    The scene performs the following tasks:
     - Renders the game over screen with failure messages.
     """
-    running_end = True
-    play_music(lose_music, 0.2)
-    while running_end:
-        for event in pygame.event.get():
+
+    def __init__(self, game_state, timer):
+        self.game_state = game_state
+        self.timer = timer
+
+    def enter(self):
+        """
+        Load the game over screen assets and start its music.
+        """
+        load_scene_assets('gameover')
+        play_music(lose_music, 0.2)
+
+    def frame(self, screen, events):
+        """
+        Handle the clicks of one frame and draw the game over screen.
+        """
+        for event in events:
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 if small_button_rect.collidepoint(event.pos):
                     play_sound_effect(select_sound, 0.2)
-                    running_end = False
-                    game_state.reset()
-                    timer.reset()
-                    start_screen(game_state)
+                    self.game_state.reset()
+                    self.timer.reset()
+                    pygame.mixer.music.stop()
+                    self.manager.pop()
+                    return
 
-        display_gameover(screen, game_state, timer)
+        display_gameover(screen, self.game_state, self.timer)
 
         pygame.display.flip()
 
 
-def menu_screen():
+class MenuScene(Scene):
     """
     The main menu screen of the game.
 
-    This function handles the main menu where players can see the introduction story, key binds and spoilers
+    This scene handles the main menu where players can see the introduction story, key binds and spoilers
 
-    The function performs the following tasks:
+    The scene performs the following tasks:
     - Renders the main menu screen with options.
     """
-    running_menu = True
-    reveal = False
-    while running_menu:
-        for event in pygame.event.get():
+
+    def __init__(self):
+        self.reveal = False
+
+    def enter(self):
+        """
+        Load the menu assets.
+        """
+        load_scene_assets('menu')
+
+    def frame(self, screen, events):
+        """
+        Handle the clicks of one frame and draw the menu.
+        """
+        for event in events:
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 if small_button_rect.collidepoint(event.pos):
                     play_sound_effect(select_sound, 0.2)
-                    running_menu = False
+                    self.manager.pop()
+                    return
                 if reveal_rect.collidepoint(event.pos):
                     play_sound_effect(select_sound, 0.2)
-                    reveal = True
+                    self.reveal = True
 
-        display_menu(screen, reveal)
+        display_menu(screen, self.reveal)
 
         pygame.display.flip()
 
 
-def intro_screen(game_state, player, current_game_map):
+class IntroScene(Scene):
     """
     The introduction screen which explains the game story to the character.
     """
-    running_intro = True
-    start_time = pygame.time.get_ticks()
-    play_music(inventory_use_music, 0.2)
-    while running_intro:
-        display_intro(screen, start_time)
-        for event in pygame.event.get():
+
+    def __init__(self, game_state, player, current_game_map):
+        self.game_state = game_state
+        self.player = player
+        self.current_game_map = current_game_map
+
+    def enter(self):
+        """
+        Load the intro assets and start its music.
+        """
+        load_scene_assets('intro')
+        self.start_time = pygame.time.get_ticks()
+        play_music(inventory_use_music, 0.2)
+
+    def frame(self, screen, events):
+        """
+        Handle the clicks of one frame and draw the story.
+        """
+        display_intro(screen, self.start_time)
+        for event in events:
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 if small_button_rect.collidepoint(event.pos):
                     play_sound_effect(select_sound, 0.2)
-                    running_intro = False
-                    game_state.reset()
-                    start_screen(game_state)
+                    self.game_state.reset()
+                    pygame.mixer.music.stop()
+                    self.manager.pop()
+                    return
                 elif proceed_rect.collidepoint(event.pos):
-                    running_intro = False
+                    pygame.mixer.music.stop()
+                    self.manager.replace(GameScene(self.game_state, self.player, self.current_game_map))
+                    return
 
         pygame.display.update()
-    pygame.mixer.music.stop()
-    game_screen(game_state, player, current_game_map)
 
 
-def selection_screen(game_state):
+class SelectionScene(Scene):
     """
     The selection screen where users choose game preferences.
 
-    This function handles the selection screen for setting up game preferences,
+    This scene handles the selection screen for setting up game preferences,
     including selecting gender, difficulty, dark mode, and map.
 
-    The function performs the following tasks:
+    The scene performs the following tasks:
     - Renders the selection screen with options and messages.
     """
-    running_selection = True
 
-    which_msg = None
-    msg_start = 0
-    while running_selection:
+    def __init__(self, game_state):
+        self.game_state = game_state
+        self.which_msg = None
+        self.msg_start = 0
+
+    def enter(self):
+        """
+        Load the selection screen assets.
+        """
+        load_scene_assets('selection')
+
+    def frame(self, screen, events):
+        """
+        Handle the clicks of one frame and draw the selection screen.
+        """
         current_time = pygame.time.get_ticks()
-        for event in pygame.event.get():
+        game_state = self.game_state
+        for event in events:
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 if small_button_rect.collidepoint(event.pos):
                     play_sound_effect(select_sound, 0.2)
-                    running_selection = False
-                    start_screen(game_state)
+                    self.manager.pop()
+                    return
                 elif proceed_rect.collidepoint(event.pos):
                     if game_state.current_gender() != 'None' and game_state.map != 'None':
                         play_sound_effect(select_sound, 0.2)
                         pygame.mixer.music.stop()
                         current_game_map = load_game_map(game_state)
+                        get_map_layer(game_state)
                         player = initialize_player(game_state)
-                        running_selection = False
-                        intro_screen(game_state, player, current_game_map)
+                        self.manager.replace(IntroScene(game_state, player, current_game_map))
+                        return
                     else:
                         play_sound_effect(error_sound, 0.3)
-                        which_msg = 'error'
-                        msg_start = current_time
+                        self.which_msg = 'error'
+                        self.msg_start = current_time
                 elif dark_mode_rect.collidepoint(event.pos):
                     play_sound_effect(select_sound, 0.2)
                     game_state.toggle_dark_mode()
@@ -573,35 +714,83 @@ def selection_screen(game_state):
                 elif map3_rect.collidepoint(event.pos):
                     play_sound_effect(select_sound, 0.2)
                     game_state.map_selector('map3')
-        display_selection(screen, game_state, which_msg, current_time, msg_start)
+        display_selection(screen, game_state, self.which_msg, current_time, self.msg_start)
 
         pygame.display.flip()
 
 
-def start_screen(game_state):
+class StartScene(Scene):
     """
     The starting screen of the game.
 
-    This function handles the initial screen where players can start the game, go to the menu,
-    or exit the game.
+    This scene handles the initial screen where players can start the game, go to the menu,
+    continue a saved game or exit the game. It stays at the bottom of the scene stack: every other screen
+    returns to it.
 
     - Renders the starting screen with options.
     """
-    running_start = True
-    play_music(start_music, 0.1)
-    while running_start:
-        for event in pygame.event.get():
-            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+
+    def __init__(self, game_state):
+        self.game_state = game_state
+
+    def enter(self):
+        """
+        Load the start screen assets and start its music.
+        """
+        load_scene_assets('start')
+        play_music(start_music, 0.1)
+
+    def resume(self):
+        """
+        Load the start screen assets again and restart its music if the screen that was closed stopped it.
+        """
+        load_scene_assets('start')
+        if not pygame.mixer.music.get_busy():
+            play_music(start_music, 0.1)
+
+    def load(self, slot: str) -> bool:
+        """
+        Continue the game saved in a save slot. Returns whether the slot held a game that could be loaded.
+        """
+        try:
+            session = load_session(slot_path(slot))
+        except (OSError, ValueError):
+            return False
+        game_state = self.game_state
+        game_state.reset()
+        game_state.set_difficulty(session['difficulty'])
+        game_state.set_gender(session['gender'])
+        game_state.map_selector(session['map'], session['seed'])
+        current_game_map = load_game_map(game_state)
+        get_map_layer(game_state)
+        player = initialize_player(game_state)
+        pygame.mixer.music.stop()
+        self.manager.push(GameScene(game_state, player, current_game_map, session))
+        return True
+
+    def frame(self, screen, events):
+        """
+        Handle the clicks and keys of one frame and draw the start screen.
+        """
+        for event in events:
+            if event.type == pygame.KEYDOWN and event.key in LOAD_KEY_CODES:
+                if self.load(LOAD_KEY_CODES[event.key]):
+                    play_sound_effect(select_sound, 0.2)
+                    return
+                play_sound_effect(error_sound, 0.3)
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 mouse_pos = pygame.mouse.get_pos()
                 if start_button_rect.collidepoint(mouse_pos):
                     play_sound_effect(select_sound, 0.2)
-                    selection_screen(game_state)
+                    self.manager.push(SelectionScene(self.game_state))
+                    return
                 elif menu_button_rect.collidepoint(mouse_pos):
                     play_sound_effect(select_sound, 0.2)
-                    menu_screen()
+                    self.manager.push(MenuScene())
+                    return
                 elif exit_button_rect.collidepoint(mouse_pos):
-                    pygame.quit()
-                    sys.exit()
+                    self.manager.quit()
+                    return
 
         display_start(screen)
         pygame.display.flip()
@@ -611,17 +800,26 @@ def main():
     """
     The main function that initializes the game state and starts the game.
 
-    This function sets up the initial game state and calls the start screen to begin the game.
+    This function sets up the initial game state and runs the scene manager from the start screen until the
+    player exits the game.
 
     The function performs the following tasks:
+    - Opens the game window, or the off-screen render target when headless.
     - Initializes the game state.
-    - Calls the start screen to display the initial game menu.
+    - Runs every screen of the game from one loop, starting with the start screen.
+    - Waits for the saves asked for to be written before the game exits.
+    - Writes the spans timed by the profiler, when it is on, before the game exits.
     """
 
+    screen = init_display()
     game_state = GameState()
-    start_screen(game_state)
+    SceneManager(screen, clock, FPS_CAP).run(StartScene(game_state))
+    save_writer.close()
+    if profiler.enabled:
+        profiler.export()
 
 
-main()
-pygame.quit()
-sys.exit()
+if __name__ == '__main__':
+    main()
+    pygame.quit()
+    sys.exit()
@@ -0,0 +1,216 @@
+"""
+This module checks that maps can be finished: that the player can reach every item cell, the chest and the
+flare site from the spawn, with the same collision rule as the movement code (see reachability.py).
+
+Items are shuffled onto the item cells of a map every game, so any item cell can hold one of the four keys the
+chest needs. A map soft-locks when the spawn is blocked, the chest or the flare site can't be reached or
+isn't there, an item cell can't be reached, or the map has fewer item cells than items.
+
+The item cells of map1, map2 and map3 are the ones set_items uses; every other map is checked with the item
+coordinates written next to it by mapgen.py. Maps are checked across a pool of processes, and every report is
+cached by a hash of the map, its item cells and CHECK_VERSION, so a map that hasn't changed isn't checked
+again on the next run.
+
+Check maps with:
+    python mapcheck.py [--cache FILE] [--workers N] [--json FILE] [map or directory ...]
+
+With no maps, the three shipped maps are checked. Exits with status 1 if any map soft-locks.
+
+Functions:
+- is_map_file: Returns whether a file is a map the checker reads.
+- find_maps: Returns the map files among paths and the files of directories.
+- map_items: Returns the item cells of a map.
+- content_hash: Returns the hash a map's report is cached by.
+- read_map: Reads a text, binary or chunked map.
+- check_map: Checks one map and returns its report.
+- check_maps: Checks maps across a process pool, reusing cached reports.
+- load_cache: Reads the cached reports.
+- save_cache: Writes the cached reports.
+- main: Checks the maps given on the command line and prints the maps that soft-lock.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from reachability import *
+from mapformat import CHUNK_EXTENSION, MAP_EXTENSION
+from mapgen import ITEM_COUNT
+
+# Bump when the rules of the check change, so every cached report is checked again
+CHECK_VERSION = 1
+DEFAULT_CACHE = '.mapcheck_cache.json'
+SHIPPED_MAPS = ['map1', 'map2', 'map3']
+TEXT_EXTENSIONS = {'', '.txt'}
+
+
+def is_map_file(path: str) -> bool:
+    """
+    Returns whether a file is a text, binary or chunked map, and not the item coordinates of a map.
+    """
+    extension = os.path.splitext(path)[1]
+    return (not path.endswith('.json') and os.path.basename(path) != DEFAULT_CACHE
+            and (extension in TEXT_EXTENSIONS or extension in {MAP_EXTENSION, CHUNK_EXTENSION}))
+
+
+def find_maps(paths) -> list[str]:
+    """
+    Returns the given map files and the map files of the given directories, searched recursively, in order.
+    """
+    maps = []
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, _, names in sorted(os.walk(path)):
+                maps.extend(os.path.join(directory, name) for name in sorted(names)
+                            if is_map_file(os.path.join(directory, name)))
+        else:
+            maps.append(path)
+    return maps
+
+
+def map_items(path: str) -> list[tuple[int, int]]:
+    """
+    Returns the item cells of a map: the ones set_items uses for a shipped map, or the ones written next to
+    a generated map. A binary or chunked map has the item cells of the text map it was converted from.
+    """
+    for extension in (MAP_EXTENSION, CHUNK_EXTENSION):
+        if path.endswith(extension):
+            path = path[:-len(extension)]
+    return ITEM_COORDINATES.get(os.path.basename(path)) or load_item_coordinates(path)
+
+
+def content_hash(path: str, items) -> str:
+    """
+    Returns the hash a map's report is cached by: the map file, its item cells and CHECK_VERSION.
+    """
+    digest = hashlib.sha256(f'{CHECK_VERSION}:{json.dumps([list(item) for item in items])}:'.encode())
+    with open(path, 'rb') as map_file:
+        for block in iter(lambda: map_file.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_map(path: str):
+    """
+    Reads a text, binary or chunked map into a grid with is_passable and rows of tile codes.
+    """
+    if path.endswith(CHUNK_EXTENSION):
+        chunked_map = ChunkedMap(path, path)
+        chunked_map.max_chunks = chunked_map.file.chunks_x * chunked_map.file.chunks_y
+        return chunked_map
+    if path.endswith(MAP_EXTENSION):
+        return MapGrid.from_binary(MapFile(path), path)
+    with open(path, 'r') as map_data:
+        return MapGrid.parse(map_data, path)
+
+
+def check_map(job) -> dict:
+    """
+    Checks one map from a (path, items) job and returns its report: the map's size, the number of cells the
+    player can reach, the item cells it can't reach and every way the map soft-locks.
+    """
+    path, items = job
+    game_map = read_map(path)
+    try:
+        cells = reachable_cells(game_map)
+        chests, flare_sites = [], []
+        for y, row in enumerate(game_map):
+            for x, tile in enumerate(row):
+                if tile == CHEST_TILE:
+                    chests.append((x, y))
+                elif tile == FLARE_TILE:
+                    flare_sites.append((x, y))
+    finally:
+        game_map.close()
+
+    unreachable_items = [list(item) for item in items if tuple(item) not in cells]
+    soft_locks = []
+    if not cells:
+        soft_locks.append(f'the spawn {PLAYER_SPAWN} is blocked')
+    if not chests:
+        soft_locks.append('there is no chest')
+    elif not any(chest in cells for chest in chests):
+        soft_locks.append(f'the chest at {chests[0]} is unreachable')
+    if not flare_sites:
+        soft_locks.append('there is no flare site')
+    elif not any(site in cells for site in flare_sites):
+        soft_locks.append(f'the flare site at {flare_sites[0]} is unreachable')
+    if unreachable_items:
+        soft_locks.append(f'{len(unreachable_items)} unreachable item cells can hold a key')
+    if len(set(map(tuple, items))) < ITEM_COUNT:
+        soft_locks.append(f'{len(set(map(tuple, items)))} item cells for {ITEM_COUNT} items')
+    return {'map': path, 'width': game_map.width, 'height': game_map.height, 'reachable': len(cells),
+            'unreachable_items': unreachable_items, 'soft_locks': soft_locks}
+
+
+def check_maps(paths, cache: dict, workers: int = None) -> tuple[list[dict], int]:
+    """
+    Checks maps across a process pool and returns their reports, in order, and the number of maps checked.
+    Maps whose hash is in the cache aren't checked again; the reports of the maps checked are added to it.
+    """
+    jobs = [(path, map_items(path)) for path in paths]
+    hashes = [content_hash(path, items) for path, items in jobs]
+    pending = [index for index, digest in enumerate(hashes) if digest not in cache]
+    if len(pending) > 1 and workers != 1:
+        with ProcessPoolExecutor(workers) as pool:
+            chunksize = max(1, len(pending) // (4 * (workers or os.cpu_count() or 1)))
+            reports = list(pool.map(check_map, [jobs[index] for index in pending], chunksize=chunksize))
+    else:
+        reports = [check_map(jobs[index]) for index in pending]
+    for index, report in zip(pending, reports):
+        cache[hashes[index]] = report
+    return [{**cache[digest], 'map': path} for path, digest in zip(paths, hashes)], len(pending)
+
+
+def load_cache(path: str) -> dict:
+    """
+    Reads the cached reports, keyed by content hash, or none if the cache doesn't exist or can't be read.
+    """
+    try:
+        with open(path, 'r') as cache_file:
+            return json.load(cache_file)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(path: str, cache: dict):
+    """
+    Writes the cached reports, replacing the old cache only once the new one is written.
+    """
+    with open(path + '.tmp', 'w') as cache_file:
+        json.dump(cache, cache_file)
+    os.replace(path + '.tmp', path)
+
+
+def main(arguments=None) -> int:
+    """
+    Checks the maps given on the command line, prints every map that soft-locks and a summary, and returns 1
+    if any map soft-locks.
+    """
+    parser = argparse.ArgumentParser(description='Check that Forest of Echoes maps can be finished.')
+    parser.add_argument('paths', nargs='*', default=SHIPPED_MAPS)
+    parser.add_argument('--cache', default=DEFAULT_CACHE)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--json', help='write every report to this file')
+    options = parser.parse_args(arguments)
+
+    cache = load_cache(options.cache)
+    reports, checked = check_maps(find_maps(options.paths), cache, options.workers)
+    save_cache(options.cache, cache)
+
+    failed = [report for report in reports if report['soft_locks']]
+    for report in failed:
+        print(f'{report["map"]}: {"; ".join(report["soft_locks"])}')
+        if report['unreachable_items']:
+            print(f'    unreachable items: {", ".join(map(str, map(tuple, report["unreachable_items"])))}')
+    if options.json:
+        with open(options.json, 'w') as json_file:
+            json.dump(reports, json_file, indent=1)
+    print(f'{len(reports)} maps, {checked} checked, {len(reports) - checked} cached, {len(failed)} soft-lock')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,316 @@
+"""
+This module contains the binary map format: a versioned file that stores a map as separate byte layers, read
+through a memory map instead of being parsed.
+
+The text maps (map1, map2, map3) keep one tile code per cell, which mixes ground, decorations, triggers and
+collision in one number. The binary format splits them into layers of one byte per cell:
+- terrain: the ground of the cell (grass, water, paths, bridge, hill), as tile code + 1
+- decoration: what stands on the ground (trees, chest, signs, bushes), as tile code + 1, 0 where there is none
+- collision: 1 where the player can't walk, 0 elsewhere
+- trigger: the tile code + 1 of cells the player can act on (chest, signs, flare site), 0 elsewhere
+
+Every cell has either a terrain or a decoration code, so the tile code of a cell is (terrain | decoration) - 1.
+load_game_map in data.py loads <map>.fmap instead of the text map when it exists and is not older than it.
+
+Maps too large to keep in memory are stored as a chunked map instead: the map is cut into squares of
+CHUNK_SIZE x CHUNK_SIZE cells stored one after the other, so a square can be read without reading the rest of
+the file. streaming.py loads the squares around the player as it moves. load_game_map loads <map>.fchunks
+this way when it exists and is not older than the text map.
+
+Convert the text maps with:
+    python mapformat.py map1 map2 map3
+or into chunked maps with:
+    python mapformat.py --chunked map1 map2 map3
+
+File layout (little-endian):
+- header: magic b'FOEMAP\\0\\0', format version (u16), tile-set version (u16), width (u32), height (u32),
+  CRC-32 of the layers (u32)
+- the terrain, decoration, collision and trigger layers, width * height bytes each, row after row
+
+Chunked file layout (little-endian):
+- header: magic b'FOECHNK\\0', format version (u16), tile-set version (u16), width (u32), height (u32),
+  chunk size (u32)
+- CRC-32 of every chunk (u32 each), chunk row after chunk row
+- the chunks in the same order, each the tile codes and then the collision layer of its cells, chunk size *
+  chunk size bytes each, row after row. Cells of the last chunks that lie past the edge of the map are trees.
+
+Functions:
+- binary_map_path: Returns the path of the binary version of a text map.
+- chunked_map_path: Returns the path of the chunked version of a text map.
+- split_layers: Splits the tile codes of a map into its layers.
+- write_map: Writes a map in the binary format.
+- write_chunked_map: Writes a map in the chunked format.
+- convert_map: Converts a text map into the binary or chunked format.
+
+Classes:
+- MapFile: A memory-mapped binary map.
+- ChunkFile: A chunked map read one chunk at a time.
+"""
+import mmap
+import os
+import struct
+import sys
+import threading
+import zlib
+from typing import BinaryIO
+
+MAP_MAGIC = b'FOEMAP\0\0'
+MAP_VERSION = 1
+MAP_EXTENSION = '.fmap'
+
+# Bump when the meaning of a tile code changes, so maps converted for the old codes are refused
+TILESET_VERSION = 1
+
+HEADER = struct.Struct('<8sHHIII')
+LAYERS = ['terrain', 'decoration', 'collision', 'trigger']
+
+CHUNK_MAGIC = b'FOECHNK\0'
+CHUNK_EXTENSION = '.fchunks'
+CHUNK_SIZE = 32
+CHUNK_HEADER = struct.Struct('<8sHHIII')
+CHUNK_CHECKSUM = struct.Struct('<I')
+
+DECORATION_TILES = {0, 4, 6, 7, 8, 11, 12, 13, 14, 15, 16}
+
+# Byte translation tables: tile code to code + 1 for one layer or 0 for the other, code + 1 back to code, and
+# collision to passable
+TERRAIN_TABLE = bytes(0 if code in DECORATION_TILES or code == 255 else code + 1 for code in range(256))
+DECORATION_TABLE = bytes(code + 1 if code in DECORATION_TILES else 0 for code in range(256))
+TILE_TABLE = bytes((code - 1) % 256 for code in range(256))
+PASSABLE_FROM_COLLISION = bytes([1, 0]) + bytes(254)
+
+
+def binary_map_path(text_path: str) -> str:
+    """
+    Returns the path of the binary version of a text map.
+    """
+    return text_path + MAP_EXTENSION
+
+
+def chunked_map_path(text_path: str) -> str:
+    """
+    Returns the path of the chunked version of a text map.
+    """
+    return text_path + CHUNK_EXTENSION
+
+
+def split_layers(tiles: bytes, blocked, triggers) -> list[bytes]:
+    """
+    Splits the tile codes of a map into its terrain, decoration, collision and trigger layers, given the
+    blocked tile codes and the trigger tile codes.
+    """
+    tiles = bytes(tiles)
+    if 255 in tiles:
+        raise ValueError('tile code 255 does not fit the binary map format')
+    collision_table = bytes(1 if code in blocked else 0 for code in range(256))
+    trigger_table = bytes(code + 1 if code in triggers else 0 for code in range(256))
+    return [tiles.translate(TERRAIN_TABLE), tiles.translate(DECORATION_TABLE), tiles.translate(collision_table),
+            tiles.translate(trigger_table)]
+
+
+def write_map(path: str, width: int, height: int, tiles: bytes, blocked, triggers):
+    """
+    Writes a map in the binary format. The file is written next to its destination and moved into place once
+    it is complete.
+    """
+    layers = split_layers(tiles, blocked, triggers)
+    checksum = 0
+    for layer in layers:
+        checksum = zlib.crc32(layer, checksum)
+
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'wb') as map_file:
+        map_file.write(HEADER.pack(MAP_MAGIC, MAP_VERSION, TILESET_VERSION, width, height, checksum))
+        for layer in layers:
+            map_file.write(layer)
+    os.replace(temporary_path, path)
+
+
+def write_chunked_map(path: str, width: int, height: int, tiles: bytes, blocked, chunk_size: int = CHUNK_SIZE):
+    """
+    Writes a map in the chunked format, given the blocked tile codes. The file is written next to its destination
+    and moved into place once it is complete.
+    """
+    tiles = bytes(tiles)
+    collision_table = bytes(1 if code in blocked else 0 for code in range(256))
+    chunks_x, chunks_y = -(-width // chunk_size), -(-height // chunk_size)
+    chunks = []
+    for chunk_y in range(chunks_y):
+        for chunk_x in range(chunks_x):
+            chunk = bytearray()
+            for y in range(chunk_y * chunk_size, (chunk_y + 1) * chunk_size):
+                start = chunk_x * chunk_size
+                row = tiles[y * width + start:y * width + min(start + chunk_size, width)] if y < height else b''
+                chunk += row + bytes(chunk_size - len(row))
+            chunks.append(bytes(chunk) + bytes(chunk).translate(collision_table))
+
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'wb') as map_file:
+        map_file.write(CHUNK_HEADER.pack(CHUNK_MAGIC, MAP_VERSION, TILESET_VERSION, width, height, chunk_size))
+        for chunk in chunks:
+            map_file.write(CHUNK_CHECKSUM.pack(zlib.crc32(chunk)))
+        for chunk in chunks:
+            map_file.write(chunk)
+    os.replace(temporary_path, path)
+
+
+class MapFile:
+    """
+    A memory-mapped binary map. The layers are views of the memory map, not copies.
+
+    Instance Attributes:
+    - path: the map file
+    - buffer: the memory map of the file
+    - width: the number of cells in a row
+    - height: the number of rows
+    - layers: a view of every layer, keyed by layer name
+    """
+    path: str
+    buffer: mmap.mmap
+    width: int
+    height: int
+    layers: dict[str, memoryview]
+
+    def __init__(self, source) -> None:
+        """
+        Memory-map a binary map, given its path or a file object opened on it in binary mode, and check it.
+        Raises ValueError if the file is not a binary map of this format and tile-set version or if its layers
+        don't match their checksum.
+        """
+        if isinstance(source, (str, os.PathLike)):
+            self.path = os.fspath(source)
+            with open(source, 'rb') as map_file:
+                self.buffer = mmap.mmap(map_file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self.path = str(getattr(source, 'name', '<map file>'))
+            self.buffer = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self.buffer) < HEADER.size:
+            raise ValueError(f'{self.path} is too short to be a binary map')
+        magic, version, tileset, self.width, self.height, checksum = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAP_MAGIC or version != MAP_VERSION:
+            raise ValueError(f'{self.path} is not a version {MAP_VERSION} binary map')
+        if tileset != TILESET_VERSION:
+            raise ValueError(f'{self.path} was converted for tile-set version {tileset}, not {TILESET_VERSION}')
+
+        size = self.width * self.height
+        if len(self.buffer) != HEADER.size + size * len(LAYERS):
+            raise ValueError(f'{self.path} does not hold {len(LAYERS)} layers of {self.width}x{self.height} cells')
+        data = memoryview(self.buffer)[HEADER.size:]
+        if zlib.crc32(data) != checksum:
+            raise ValueError(f'{self.path} is corrupt: its layers do not match their checksum')
+        self.layers = {name: data[index * size:(index + 1) * size] for index, name in enumerate(LAYERS)}
+
+    def tiles(self) -> bytearray:
+        """
+        Return the tile code of every cell, row after row, rebuilt from the terrain and decoration layers.
+        """
+        size = self.width * self.height
+        combined = (int.from_bytes(self.layers['terrain'], 'little')
+                    | int.from_bytes(self.layers['decoration'], 'little')).to_bytes(size, 'little')
+        return bytearray(combined.translate(TILE_TABLE))
+
+    def passable(self) -> bytearray:
+        """
+        Return 1 for every cell the player can walk on and 0 for every blocked cell, from the collision layer.
+        """
+        return bytearray(self.layers['collision'].tobytes().translate(PASSABLE_FROM_COLLISION))
+
+
+class ChunkFile:
+    """
+    A chunked map read one chunk at a time. Reads may come from several threads.
+
+    Instance Attributes:
+    - path: the map file
+    - width: the number of cells in a row of the map
+    - height: the number of rows of the map
+    - chunk_size: the number of cells along each side of a chunk
+    - chunks_x: the number of chunks in a row of chunks
+    - chunks_y: the number of rows of chunks
+    - checksums: the CRC-32 of every chunk, chunk row after chunk row
+    - data_start: the offset of the first chunk in the file
+    - file: the open map file
+    - lock: held while a chunk is read, so reads from several threads don't move the file position under each other
+    """
+    path: str
+    width: int
+    height: int
+    chunk_size: int
+    chunks_x: int
+    chunks_y: int
+    checksums: list[int]
+    data_start: int
+    file: BinaryIO
+    lock: threading.Lock
+
+    def __init__(self, path: str) -> None:
+        """
+        Open a chunked map and read its header. Raises ValueError if the file is not a chunked map of this format
+        and tile-set version.
+        """
+        self.path = path
+        self.file = open(path, 'rb')
+        self.lock = threading.Lock()
+        magic, version, tileset, self.width, self.height, self.chunk_size = CHUNK_HEADER.unpack(
+            self.file.read(CHUNK_HEADER.size).ljust(CHUNK_HEADER.size, b'\0'))
+        if magic != CHUNK_MAGIC or version != MAP_VERSION or self.chunk_size == 0:
+            self.file.close()
+            raise ValueError(f'{path} is not a version {MAP_VERSION} chunked map')
+        if tileset != TILESET_VERSION:
+            self.file.close()
+            raise ValueError(f'{path} was converted for tile-set version {tileset}, not {TILESET_VERSION}')
+
+        self.chunks_x = -(-self.width // self.chunk_size)
+        self.chunks_y = -(-self.height // self.chunk_size)
+        count = self.chunks_x * self.chunks_y
+        table = self.file.read(count * CHUNK_CHECKSUM.size)
+        self.data_start = CHUNK_HEADER.size + count * CHUNK_CHECKSUM.size
+        if (len(table) != count * CHUNK_CHECKSUM.size
+                or os.fstat(self.file.fileno()).st_size != self.data_start + count * 2 * self.chunk_size ** 2):
+            self.file.close()
+            raise ValueError(f'{path} does not hold {count} chunks of {self.chunk_size}x{self.chunk_size} cells')
+        self.checksums = [checksum for checksum, in CHUNK_CHECKSUM.iter_unpack(table)]
+
+    def read_chunk(self, chunk_x: int, chunk_y: int) -> tuple[bytes, bytes]:
+        """
+        Read the tile codes and the collision layer of a chunk. Raises ValueError if the chunk doesn't match its
+        checksum.
+        """
+        index = chunk_y * self.chunks_x + chunk_x
+        cells = self.chunk_size * self.chunk_size
+        with self.lock:
+            self.file.seek(self.data_start + index * 2 * cells)
+            chunk = self.file.read(2 * cells)
+        if zlib.crc32(chunk) != self.checksums[index]:
+            raise ValueError(f'{self.path} is corrupt: chunk ({chunk_x}, {chunk_y}) does not match its checksum')
+        return chunk[:cells], chunk[cells:]
+
+    def close(self):
+        """
+        Close the map file.
+        """
+        self.file.close()
+
+
+def convert_map(text_path: str, chunked: bool = False) -> str:
+    """
+    Converts a text map into the binary format, or the chunked format, next to it and returns the path written.
+    """
+    from data import BLOCKED_TILES, FLARE_TILE, INTERACTION_TILES, MapGrid
+
+    with open(text_path, 'r') as map_data:
+        grid = MapGrid.parse(map_data, text_path)
+    if chunked:
+        path = chunked_map_path(text_path)
+        write_chunked_map(path, grid.width, grid.height, grid.tiles, BLOCKED_TILES)
+    else:
+        path = binary_map_path(text_path)
+        write_map(path, grid.width, grid.height, grid.tiles, BLOCKED_TILES, {*INTERACTION_TILES, FLARE_TILE})
+    return path
+
+
+if __name__ == '__main__':
+    chunked = '--chunked' in sys.argv
+    for text_map in [argument for argument in sys.argv[1:] if argument != '--chunked'] or ['map1', 'map2', 'map3']:
+        print(f'Wrote {convert_map(text_map, chunked)}')
@@ -0,0 +1,207 @@
+"""
+This module generates forest maps in the tile codes of the hand-made maps, with the item coordinates that go
+with them, across a pool of processes.
+
+A generated map has a border of trees, the hill with the flare site in its top-right corner, rivers crossed
+by bridges, a path network joining the spawn, the chest, the three signs and the foot of the hill, scattered
+trees and ground cover, and one cell for every item. Only cells the player can reach are given items, and
+every map is checked with reachability.py before it is written: every item, the chest and the flare site can
+be reached from the spawn. A map that fails the check is generated again from the same random stream, so the
+same seed, size and difficulty always give the same map.
+
+Every map is written as a text map with a <map>.items.json holding its item coordinates, which set_items
+reads, and can be selected with GameState.map_selector by its path.
+
+Generate maps with:
+    python mapgen.py [--count N] [--seed S] [--width W] [--height H] [--difficulty easy|medium|hard]
+                     [--out DIRECTORY] [--workers N]
+
+Functions:
+- path_code: Returns the path tile that joins a cell to the given neighbours.
+- generate_map: Generates a solvable map and its item coordinates.
+- generate_attempt: Generates one map and places its items, if the map is solvable.
+- write_generated_map: Writes a generated map and its item coordinates.
+- generate_and_write: Generates one map of a batch and writes it.
+- main: Generates a batch of maps across a process pool.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from reachability import *
+
+# Tree density, river count per 14 rows and the chance of a cell of ground cover being decorated
+DIFFICULTIES = {
+    'easy': {'trees': 0.06, 'rivers': 0.5, 'decoration': 0.3},
+    'medium': {'trees': 0.12, 'rivers': 1, 'decoration': 0.35},
+    'hard': {'trees': 0.2, 'rivers': 1.5, 'decoration': 0.4},
+}
+MIN_WIDTH, MIN_HEIGHT = 12, 10
+MAX_ATTEMPTS = 100
+
+PLAIN_TILE = 50
+DECORATION_CODES = [10, 11, 12, 13, 14, 15, 16]
+WATER_TILE, BRIDGE_TILE, TREE_TILE = 2, 5, 0
+SIGN_TILES = [6, 7, 8]
+HILL_ROWS = [[98, 98, 98, 98], [98, 77, 77, 98], [98, 99, 99, 98], [98, 99, 99, 98]]
+ITEM_COUNT = 10
+
+# The path tile joining a cell to each set of neighbours it is linked to: up, down, left, right
+UP, DOWN, LEFT, RIGHT = 1, 2, 4, 8
+DIRECTIONS = {(0, -1): UP, (0, 1): DOWN, (-1, 0): LEFT, (1, 0): RIGHT}
+PATH_CODES = {
+    LEFT | RIGHT: 20, UP | DOWN: 21, UP | RIGHT: 22, UP | LEFT: 23, DOWN | RIGHT: 24, DOWN | LEFT: 25,
+    LEFT | RIGHT | DOWN: 26, UP | DOWN | LEFT | RIGHT: 27, LEFT | RIGHT | UP: 28, UP | DOWN | RIGHT: 29,
+}
+
+
+def path_code(neighbours: int) -> int:
+    """
+    Returns the path tile that joins a cell to the given neighbours. Dead ends continue straight, and the one
+    junction without a tile of its own, up, down and left, uses the crossing.
+    """
+    if neighbours in PATH_CODES:
+        return PATH_CODES[neighbours]
+    if neighbours == UP | DOWN | LEFT:
+        return 27
+    return 21 if neighbours & (UP | DOWN) else 20
+
+
+def generate_map(seed: int, width: int = 22, height: int = 14,
+                 difficulty: str = 'medium') -> tuple[list[list[int]], list[tuple[int, int]]]:
+    """
+    Generates a solvable map and its item coordinates. The same seed, size and difficulty always give the
+    same map. Raises ValueError for a map smaller than MIN_WIDTH x MIN_HEIGHT or an unknown difficulty.
+    """
+    if width < MIN_WIDTH or height < MIN_HEIGHT:
+        raise ValueError(f'maps must be at least {MIN_WIDTH}x{MIN_HEIGHT} cells, not {width}x{height}')
+    if difficulty not in DIFFICULTIES:
+        raise ValueError(f'unknown difficulty {difficulty!r}, expected one of {", ".join(DIFFICULTIES)}')
+    rng = random.Random(f'{seed}:{width}x{height}:{difficulty}')
+    for _ in range(MAX_ATTEMPTS):
+        rows, items = generate_attempt(rng, width, height, DIFFICULTIES[difficulty])
+        if items is not None:
+            return rows, items
+    raise ValueError(f'no solvable {width}x{height} {difficulty} map in {MAX_ATTEMPTS} attempts for seed {seed}')
+
+
+def generate_attempt(rng, width, height, settings) -> tuple[list[list[int]], list[tuple[int, int]]]:
+    """
+    Generates one map and places its items. Returns None for the items if the map isn't solvable.
+    """
+    spawn = world_to_grid(PLAYER_SPAWN[0] + PLAYER_FOOT[0], PLAYER_SPAWN[1] + PLAYER_FOOT[1])
+    hill_left = width - len(HILL_ROWS[0])
+    entrance = (hill_left + 1, len(HILL_ROWS))
+
+    rows = [[PLAIN_TILE] * width for _ in range(height)]
+    for y in range(height):
+        rows[y][0] = rows[y][width - 1] = TREE_TILE
+    rows[0] = [TREE_TILE] * width
+    rows[height - 1] = [TREE_TILE] * width
+    for y, hill_row in enumerate(HILL_ROWS):
+        rows[y][hill_left:] = hill_row
+
+    river_rows = set()
+    candidates = list(range(len(HILL_ROWS) + 2, height - 2))
+    for _ in range(min(round(settings['rivers'] * height / 14), len(candidates) // 4)):
+        y = rng.choice(candidates)
+        thickness = rng.choice([1, 1, 2]) if y + 1 in candidates else 1
+        for river_y in range(y, y + thickness):
+            river_rows.add(river_y)
+            rows[river_y][1:width - 1] = [WATER_TILE] * (width - 2)
+        candidates = [row for row in candidates if not y - 2 <= row <= y + thickness + 1]
+
+    node_rows = [y for y in range(1, height - 1) if y not in river_rows]
+    free = [(x, y) for y in node_rows for x in range(1, hill_left) if (x, y) != spawn]
+    objects = rng.sample(free, 1 + len(SIGN_TILES))
+
+    links = {spawn: 0}
+    route = objects[:]
+    rng.shuffle(route)
+    for (x, y), (end_x, end_y) in zip([spawn, *route], [*route, entrance]):
+        while (x, y) != (end_x, end_y):
+            step = (0, 1 if end_y > y else -1) if y != end_y else (1 if end_x > x else -1, 0)
+            links[(x, y)] |= DIRECTIONS[step]
+            x, y = x + step[0], y + step[1]
+            links[(x, y)] = links.get((x, y), 0) | DIRECTIONS[(-step[0], -step[1])]
+    path = set(links)
+
+    for (x, y), neighbours in links.items():
+        if rows[y][x] == WATER_TILE:
+            rows[y][x] = BRIDGE_TILE
+        elif rows[y][x] == PLAIN_TILE:
+            rows[y][x] = path_code(neighbours)
+    for (x, y), code in zip(objects, [CHEST_TILE, *SIGN_TILES]):
+        rows[y][x] = code
+
+    for y in range(1, height - 1):
+        for x in range(1, width - 1):
+            if rows[y][x] != PLAIN_TILE or (x, y) in path:
+                continue
+            roll = rng.random()
+            if roll < settings['trees']:
+                rows[y][x] = TREE_TILE
+            elif roll < settings['trees'] + settings['decoration']:
+                rows[y][x] = rng.choice(DECORATION_CODES)
+
+    reachable = reachable_cells(MapGrid.from_rows(rows))
+    flare_site = next((x, y) for y, row in enumerate(HILL_ROWS) for x, tile in enumerate(row, hill_left)
+                      if tile == FLARE_TILE)
+    spots = sorted((x, y) for x, y in reachable if rows[y][x] in {PLAIN_TILE, *DECORATION_CODES}
+                   and (x, y) not in path and (x, y) != spawn)
+    if objects[0] not in reachable or flare_site not in reachable or len(spots) < ITEM_COUNT:
+        return rows, None
+    return rows, rng.sample(spots, ITEM_COUNT)
+
+
+def write_generated_map(path: str, rows, items, **details):
+    """
+    Writes a generated map as a text map and its item coordinates to <map>.items.json, with any details of
+    how it was generated.
+    """
+    with open(path, 'w') as map_file:
+        for row in rows:
+            map_file.write('  '.join(f'{tile:>2}' for tile in row) + '\n')
+    with open(item_coordinates_path(path), 'w') as items_file:
+        json.dump({**details, 'items': [list(item) for item in items]}, items_file)
+
+
+def generate_and_write(job) -> str:
+    """
+    Generates one map of a batch from a (seed, width, height, difficulty, directory) job and writes it.
+    Returns the path written.
+    """
+    seed, width, height, difficulty, directory = job
+    rows, items = generate_map(seed, width, height, difficulty)
+    path = os.path.join(directory, f'forest_{difficulty}_{width}x{height}_{seed}')
+    write_generated_map(path, rows, items, seed=seed, width=width, height=height, difficulty=difficulty)
+    return path
+
+
+def main(arguments=None):
+    """
+    Generates a batch of maps across a process pool, one seed after the other from the first seed.
+    """
+    parser = argparse.ArgumentParser(description='Generate solvable Forest of Echoes maps.')
+    parser.add_argument('--count', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--width', type=int, default=22)
+    parser.add_argument('--height', type=int, default=14)
+    parser.add_argument('--difficulty', choices=list(DIFFICULTIES), default='medium')
+    parser.add_argument('--out', default='generated')
+    parser.add_argument('--workers', type=int, default=None)
+    options = parser.parse_args(arguments)
+
+    os.makedirs(options.out, exist_ok=True)
+    jobs = [(options.seed + index, options.width, options.height, options.difficulty, options.out)
+            for index in range(options.count)]
+    with ProcessPoolExecutor(options.workers) as pool:
+        for path in pool.map(generate_and_write, jobs, chunksize=max(1, len(jobs) // (4 * (os.cpu_count() or 1)))):
+            print(f'Wrote {path}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
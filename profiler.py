@@ -0,0 +1,241 @@
+"""
+This module times named spans of every frame: the drawing functions of set.py, the player's movement, the
+simulation steps, the handling of events and the flip of the display, so a slow frame can be traced to the
+code that made it slow.
+
+Profiling is turned on by setting the FOREST_PROFILE environment variable to 1. With it off, span leaves the
+functions it decorates as they are and measure hands out one shared span that does nothing, so the game runs
+as fast as it does without the profiler. With it on, every span is timed with perf_counter_ns and kept, up to
+MAX_EVENTS spans, and the time every span took in each of the last ROLLING_FRAMES frames gives its rolling
+mean, 95th percentile and maximum. F12 shows them over the game (see display_profiler in set.py), and the
+session is written as CSV and as a Chrome trace (chrome://tracing or ui.perfetto.dev) to PROFILE_DIRECTORY
+when the game exits.
+
+Functions:
+- span: Decorates a function to time every call as a named span.
+- measure: Returns a context manager that times a block as a named span.
+- percentile: Returns a percentile of sorted values by the nearest rank.
+
+Classes:
+- Span: Times one block as a named span.
+- NullSpan: A span that times nothing.
+- Profiler: Keeps the spans of every frame and their rolling statistics.
+"""
+import csv
+import functools
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+
+PROFILING = os.environ.get('FOREST_PROFILE', '0') == '1'
+PROFILE_DIRECTORY = os.environ.get('FOREST_PROFILE_DIR', 'profiles')
+ROLLING_FRAMES = 120
+MAX_EVENTS = 500_000
+FRAME_SPAN = 'frame'
+
+
+def percentile(values: list, point: float) -> float:
+    """
+    Returns a percentile of sorted values by the nearest rank, or 0 if there are none.
+    """
+    if not values:
+        return 0
+    return values[min(len(values) - 1, max(0, math.ceil(point / 100 * len(values)) - 1))]
+
+
+class Profiler:
+    """
+    Keeps the spans of every frame and their rolling statistics.
+
+    Instance Attributes:
+    - enabled: whether spans are timed
+    - overlay: whether the statistics are shown over the game
+    - events: the spans timed, oldest first, as (name, start, duration, depth, frame, thread) with times in
+      nanoseconds, at most MAX_EVENTS of them
+    - history: the nanoseconds every span took in each of the last ROLLING_FRAMES frames, keyed by name
+    - totals: the nanoseconds every span has taken so far in the current frame
+    - frame: the number of the current frame
+    - frame_start: when the current frame started, in nanoseconds, or None between frames
+    - depth: how many spans are open on the game's thread
+    - origin: the time the profiler was made, which the times of the trace are counted from
+    """
+    enabled: bool
+    overlay: bool
+    events: deque
+    history: dict[str, deque]
+    totals: dict[str, int]
+    frame: int
+    frame_start: int
+    depth: int
+    origin: int
+
+    def __init__(self, enabled: bool = PROFILING) -> None:
+        self.enabled = enabled
+        self.overlay = False
+        self.events = deque(maxlen=MAX_EVENTS)
+        self.history = {}
+        self.totals = {}
+        self.frame = 0
+        self.frame_start = None
+        self.depth = 0
+        self.origin = time.perf_counter_ns()
+
+    def enter(self) -> int:
+        """
+        Open a span and return when it started.
+        """
+        self.depth += 1
+        return time.perf_counter_ns()
+
+    def leave(self, name: str, start: int):
+        """
+        Close a span opened by enter and keep it.
+        """
+        duration = time.perf_counter_ns() - start
+        self.depth -= 1
+        self.events.append((name, start, duration, self.depth, self.frame, threading.get_ident()))
+        self.totals[name] = self.totals.get(name, 0) + duration
+
+    def begin_frame(self):
+        """
+        Start timing a frame.
+        """
+        if self.enabled:
+            self.totals = {}
+            self.frame_start = self.enter()
+
+    def end_frame(self):
+        """
+        Finish timing a frame and add the time every span took in it to their rolling statistics.
+        """
+        if self.frame_start is None:
+            return
+        self.leave(FRAME_SPAN, self.frame_start)
+        self.frame_start = None
+        for name, total in self.totals.items():
+            if name not in self.history:
+                self.history[name] = deque(maxlen=ROLLING_FRAMES)
+            self.history[name].append(total)
+        self.frame += 1
+
+    def statistics(self) -> dict[str, dict[str, float]]:
+        """
+        Return the rolling mean, 95th percentile and maximum milliseconds of every span, per frame it ran in,
+        and the number of those frames, slowest mean first.
+        """
+        report = {}
+        for name, history in self.history.items():
+            values = sorted(history)
+            report[name] = {'mean': sum(values) / len(values) / 1e6, 'p95': percentile(values, 95) / 1e6,
+                            'max': values[-1] / 1e6, 'frames': len(values)}
+        return dict(sorted(report.items(), key=lambda entry: -entry[1]['mean']))
+
+    def export_csv(self, path: str):
+        """
+        Write every span kept as a row of a CSV file, with times in milliseconds since the profiler was made.
+        """
+        with open(path, 'w', newline='') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(['frame', 'span', 'start_ms', 'duration_ms', 'depth', 'thread'])
+            for name, start, duration, depth, frame, thread in self.events:
+                writer.writerow([frame, name, f'{(start - self.origin) / 1e6:.4f}', f'{duration / 1e6:.4f}',
+                                 depth, thread])
+
+    def export_trace(self, path: str):
+        """
+        Write every span kept as a complete event of the Chrome trace format, which chrome://tracing and
+        Perfetto open.
+        """
+        events = [{'name': name, 'cat': 'frame' if name == FRAME_SPAN else 'span', 'ph': 'X', 'pid': os.getpid(),
+                   'tid': thread, 'ts': (start - self.origin) / 1000, 'dur': duration / 1000,
+                   'args': {'frame': frame}}
+                  for name, start, duration, depth, frame, thread in self.events]
+        with open(path, 'w') as trace_file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, trace_file)
+
+    def export(self, directory: str = PROFILE_DIRECTORY) -> list[str]:
+        """
+        Write the session as CSV and as a Chrome trace into a directory, named after the time, and return the
+        paths written. Nothing is written if no span was timed.
+        """
+        if not self.events:
+            return []
+        os.makedirs(directory, exist_ok=True)
+        stem = os.path.join(directory, time.strftime('profile-%Y%m%d-%H%M%S'))
+        self.export_csv(stem + '.csv')
+        self.export_trace(stem + '.json')
+        return [stem + '.csv', stem + '.json']
+
+
+class Span:
+    """
+    Times one block as a named span of the shared profiler, as a context manager.
+
+    Instance Attributes:
+    - name: the name of the span
+    - start: when the span was entered, in nanoseconds
+    """
+    __slots__ = ('name', 'start')
+    name: str
+    start: int
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        if profiler.enabled:
+            self.start = profiler.enter()
+        return self
+
+    def __exit__(self, *exception):
+        if self.start:
+            profiler.leave(self.name, self.start)
+            self.start = 0
+        return False
+
+
+class NullSpan:
+    """
+    A span that times nothing, handed out by measure while profiling is off.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        return False
+
+
+NULL_SPAN = NullSpan()
+profiler = Profiler()
+
+
+def span(name: str):
+    """
+    Decorates a function to time every call as a named span. With profiling off, the function is left as it is.
+    """
+    def decorate(function):
+        if not profiler.enabled:
+            return function
+
+        @functools.wraps(function)
+        def timed(*arguments, **keywords):
+            start = profiler.enter()
+            try:
+                return function(*arguments, **keywords)
+            finally:
+                profiler.leave(name, start)
+        return timed
+    return decorate
+
+
+def measure(name: str):
+    """
+    Returns a context manager that times a block as a named span, or one that does nothing with profiling off.
+    """
+    return Span(name) if profiler.enabled else NULL_SPAN
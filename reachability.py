@@ -0,0 +1,283 @@
+"""
+This module works out which cells of a map the player can reach on foot, with the same collision rule as
+Player.can_stand_at: the player fits where both of its probe corners lie on passable tiles.
+
+Along each axis, the positions within one tile fall into a few runs in which the probes lie on the same cells.
+Every run of every tile is a position class: the player can stand anywhere in a class or nowhere, and it can
+walk between neighbouring classes when it can stand in both. A breadth-first search over the classes, from
+the class of the spawn position, gives every reachable class, and with it every cell the player's grid
+location can be on, which is the cell the interact, pick up and use buttons act on.
+
+Functions:
+- axis_classes: Returns the position classes of one axis over one tile.
+- class_of: Returns the position class of a position along one axis.
+- reachable_cells: Returns every cell the player's grid location can reach from a position.
+- unreachable_targets: Returns the cells of a list the player can't reach.
+
+Classes:
+- Navigator: Finds the shortest walks from player positions to cells of a map.
+"""
+from collections import deque
+
+from data import *
+
+
+def axis_classes(probe_offsets, foot_offset) -> list[tuple[int, tuple[int, ...], set[int]]]:
+    """
+    Returns the position classes of one axis over one tile: for every run of positions within a tile whose
+    probes lie on the same cells, the first position of the run, the cell of each probe and the cells the
+    player's grid location can be on, relative to the tile.
+    """
+    classes = []
+    for phase in range(TILE_SIZE):
+        probes = tuple((phase + offset) // TILE_SIZE for offset in probe_offsets)
+        if not classes or classes[-1][1] != probes:
+            classes.append((phase, probes, set()))
+        classes[-1][2].add((phase + foot_offset) // TILE_SIZE)
+    return classes
+
+
+def class_of(position: int, classes) -> int:
+    """
+    Returns the position class of a position along one axis, numbered across tiles.
+    """
+    tile, phase = divmod(position, TILE_SIZE)
+    index = max(index for index, (first, _, _) in enumerate(classes) if first <= phase)
+    return tile * len(classes) + index
+
+
+def reachable_cells(game_map, start=PLAYER_SPAWN) -> set[tuple[int, int]]:
+    """
+    Returns every cell the player's grid location can be on after walking from a start position.
+    """
+    x_classes = axis_classes([offset_x for offset_x, _ in PROBE_OFFSETS], PLAYER_FOOT[0] - MAP_ORIGIN[0])
+    y_classes = axis_classes([offset_y for _, offset_y in PROBE_OFFSETS], PLAYER_FOOT[1] - MAP_ORIGIN[1])
+    count_x, count_y = len(x_classes), len(y_classes)
+
+    def can_stand(node_x, node_y):
+        tile_x, kind_x = divmod(node_x, count_x)
+        tile_y, kind_y = divmod(node_y, count_y)
+        return all(game_map.is_passable(tile_x + probe_x, tile_y + probe_y)
+                   for probe_x, probe_y in zip(x_classes[kind_x][1], y_classes[kind_y][1]))
+
+    start_node = (class_of(start[0], x_classes), class_of(start[1], y_classes))
+    if not can_stand(*start_node):
+        return set()
+    seen = {start_node}
+    queue = deque([start_node])
+    cells = set()
+    while queue:
+        node_x, node_y = queue.popleft()
+        tile_x, kind_x = divmod(node_x, count_x)
+        tile_y, kind_y = divmod(node_y, count_y)
+        for foot_x in x_classes[kind_x][2]:
+            for foot_y in y_classes[kind_y][2]:
+                cells.add((tile_x + foot_x, tile_y + foot_y))
+        for neighbour in ((node_x - 1, node_y), (node_x + 1, node_y), (node_x, node_y - 1), (node_x, node_y + 1)):
+            if neighbour not in seen and can_stand(*neighbour):
+                seen.add(neighbour)
+                queue.append(neighbour)
+    return cells
+
+
+def unreachable_targets(game_map, targets, start=PLAYER_SPAWN) -> list[tuple[int, int]]:
+    """
+    Returns the cells of a list the player's grid location can't reach from a start position.
+    """
+    cells = reachable_cells(game_map, start)
+    return [tuple(target) for target in targets if tuple(target) not in cells]
+
+
+class Navigator:
+    """
+    Finds the shortest walks from player positions to cells of a map, over the position classes of
+    reachable_cells. A walk is a list of (direction, pixels) moves in straight lines, after which the player's grid
+    location is on the cell.
+
+    Instance Attributes:
+    - game_map: the map walked on
+    - x_classes, y_classes: the position classes of each axis (see axis_classes)
+    - standable: whether the player can stand in each position class looked at so far, keyed by class
+    - adjacent: the neighbours the player can stand in of each position class looked at so far, keyed by class
+    - feet: the cells the player's grid location can be on in each position class looked at so far
+    - fields: the distance from every position class to each cell looked up so far, keyed by cell
+    """
+    game_map: MapGrid
+    x_classes: list
+    y_classes: list
+    standable: dict[tuple[int, int], bool]
+    adjacent: dict[tuple[int, int], list[tuple[int, int]]]
+    feet: dict[tuple[int, int], list[tuple[int, int]]]
+    fields: dict[tuple[int, int], dict[tuple[int, int], int]]
+
+    def __init__(self, game_map) -> None:
+        self.game_map = game_map
+        self.x_classes = axis_classes([offset_x for offset_x, _ in PROBE_OFFSETS], PLAYER_FOOT[0] - MAP_ORIGIN[0])
+        self.y_classes = axis_classes([offset_y for _, offset_y in PROBE_OFFSETS], PLAYER_FOOT[1] - MAP_ORIGIN[1])
+        self.standable = {}
+        self.adjacent = {}
+        self.feet = {}
+        self.fields = {}
+
+    def node_of(self, position) -> tuple[int, int]:
+        """
+        Return the position class of a player position.
+        """
+        return class_of(position[0], self.x_classes), class_of(position[1], self.y_classes)
+
+    def can_stand(self, node) -> bool:
+        """
+        Return whether the player can stand in a position class.
+        """
+        standable = self.standable.get(node)
+        if standable is None:
+            tile_x, kind_x = divmod(node[0], len(self.x_classes))
+            tile_y, kind_y = divmod(node[1], len(self.y_classes))
+            standable = self.standable[node] = all(
+                self.game_map.is_passable(tile_x + probe_x, tile_y + probe_y)
+                for probe_x, probe_y in zip(self.x_classes[kind_x][1], self.y_classes[kind_y][1]))
+        return standable
+
+    def neighbours(self, node):
+        """
+        Return the position classes next to a position class that the player can stand in.
+        """
+        neighbours = self.adjacent.get(node)
+        if neighbours is None:
+            node_x, node_y = node
+            neighbours = self.adjacent[node] = [
+                neighbour for neighbour in ((node_x - 1, node_y), (node_x + 1, node_y), (node_x, node_y - 1),
+                                            (node_x, node_y + 1)) if self.can_stand(neighbour)]
+        return neighbours
+
+    def foot_cells(self, node) -> list[tuple[int, int]]:
+        """
+        Return the cells the player's grid location can be on in a position class.
+        """
+        feet = self.feet.get(node)
+        if feet is None:
+            tile_x, kind_x = divmod(node[0], len(self.x_classes))
+            tile_y, kind_y = divmod(node[1], len(self.y_classes))
+            feet = self.feet[node] = [(tile_x + foot_x, tile_y + foot_y)
+                                      for foot_x in self.x_classes[kind_x][2] for foot_y in self.y_classes[kind_y][2]]
+        return feet
+
+    def field(self, cell) -> dict[tuple[int, int], int]:
+        """
+        Return the number of position classes between every position class the player can walk to the cell from
+        and the cell.
+        """
+        field = self.fields.get(cell)
+        if field is None:
+            field = self.fields[cell] = {}
+            queue = deque()
+            for kind_x, (_, _, feet_x) in enumerate(self.x_classes):
+                for kind_y, (_, _, feet_y) in enumerate(self.y_classes):
+                    for foot_x in feet_x:
+                        for foot_y in feet_y:
+                            node = ((cell[0] - foot_x) * len(self.x_classes) + kind_x,
+                                    (cell[1] - foot_y) * len(self.y_classes) + kind_y)
+                            if node not in field and self.can_stand(node):
+                                field[node] = 0
+                                queue.append(node)
+            while queue:
+                node = queue.popleft()
+                for neighbour in self.neighbours(node):
+                    if neighbour not in field:
+                        field[neighbour] = field[node] + 1
+                        queue.append(neighbour)
+        return field
+
+    def distance(self, position, cell) -> int:
+        """
+        Return the number of position classes between a player position and a cell, or None if the cell can't be
+        reached.
+        """
+        return self.field(cell).get(self.node_of(position))
+
+    def path_to(self, position, cell) -> list[tuple[int, int]]:
+        """
+        Return the position classes on the shortest way from a player position to a cell, or None if the cell
+        can't be reached.
+        """
+        field = self.field(cell)
+        node = self.node_of(position)
+        if node not in field:
+            return None
+        path = [node]
+        while field[node]:
+            node = next(neighbour for neighbour in self.neighbours(node) if field.get(neighbour) == field[node] - 1)
+            path.append(node)
+        return path
+
+    def path_to_nearest(self, position, cells) -> tuple[tuple[int, int], list[tuple[int, int]]]:
+        """
+        Return the nearest of a set of cells to a player position and the position classes on the way to it, or
+        None and None if none can be reached.
+        """
+        start = self.node_of(position)
+        parents = {start: None}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            reached = [cell for cell in self.foot_cells(node) if cell in cells]
+            if reached:
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = parents[node]
+                return reached[0], path[::-1]
+            for neighbour in self.neighbours(node):
+                if neighbour not in parents:
+                    parents[neighbour] = node
+                    queue.append(neighbour)
+        return None, None
+
+    def class_start(self, node_x: int, classes) -> int:
+        """
+        Return the first position along an axis in a position class of that axis.
+        """
+        tile, kind = divmod(node_x, len(classes))
+        return tile * TILE_SIZE + classes[kind][0]
+
+    def walk(self, position, path, cell) -> list[tuple[str, int]]:
+        """
+        Return the moves that walk a player position along the position classes of a path and then onto the cell,
+        merging moves in the same direction.
+        """
+        x, y = position
+        moves = []
+
+        def move(direction, pixels):
+            if pixels:
+                if moves and moves[-1][0] == direction:
+                    pixels += moves.pop()[1]
+                moves.append((direction, pixels))
+
+        for (node_x, node_y), (next_x, next_y) in zip(path, path[1:]):
+            if next_x > node_x:
+                target = self.class_start(next_x, self.x_classes)
+                move('right', target - x)
+                x = target
+            elif next_x < node_x:
+                target = self.class_start(node_x, self.x_classes) - 1
+                move('left', x - target)
+                x = target
+            elif next_y > node_y:
+                target = self.class_start(next_y, self.y_classes)
+                move('down', target - y)
+                y = target
+            else:
+                target = self.class_start(node_y, self.y_classes) - 1
+                move('up', y - target)
+                y = target
+
+        node_x, node_y = path[-1]
+        for axis, classes, node, foot, current in ((0, self.x_classes, node_x, PLAYER_FOOT[0], x),
+                                                   (1, self.y_classes, node_y, PLAYER_FOOT[1], y)):
+            low = max(self.class_start(node, classes), cell[axis] * TILE_SIZE + MAP_ORIGIN[axis] - foot)
+            high = min(self.class_start(node + 1, classes), (cell[axis] + 1) * TILE_SIZE + MAP_ORIGIN[axis] - foot) - 1
+            target = min(max(current, low), high)
+            if target != current:
+                move(('right', 'left', 'down', 'up')[2 * axis + (target < current)], abs(target - current))
+        return moves
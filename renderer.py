@@ -0,0 +1,109 @@
+"""
+This module contains the opt-in dirty-rectangle renderer used by the game screen.
+
+Instead of flipping the whole fullscreen surface every frame, the game screen still draws the frame into
+the back buffer but tells the renderer which regions hold dynamic content (player, items, campfire, timer,
+hearts, messages). When the frame is presented, the pixels of every tracked region are compared with the
+previous frame and only the regions that moved or changed are presented with pygame.display.update. Large
+overlays request a full flip instead.
+
+The renderer is enabled by setting the FOREST_DIRTY_RECTS environment variable to 1.
+
+Classes:
+- DirtyRectRenderer: Tracks changed screen regions and presents them.
+"""
+import os
+
+import pygame
+
+DIRTY_RECTS = os.environ.get('FOREST_DIRTY_RECTS', '0') == '1'
+
+
+class DirtyRectRenderer:
+    """
+    Tracks the dynamic regions of a frame and presents only the ones that changed.
+
+    Instance Attributes:
+    - previous: the regions tracked on the last presented frame, keyed by name
+    - current: the regions tracked on the frame being drawn, keyed by name
+    - full: whether the frame being drawn must be presented with a full flip
+    - previous_full: whether the last frame was presented with a full flip
+    - statistics: number of full and partial presents and the area updated by partial presents
+    """
+    previous: dict
+    current: dict
+    full: bool
+    previous_full: bool
+    statistics: dict
+
+    def __init__(self):
+        self.previous = {}
+        self.current = {}
+        self.full = True
+        self.previous_full = False
+        self.statistics = {'Full Frames': 0, 'Partial Frames': 0, 'Pixels Updated': 0}
+
+    def track(self, key, rects, signature=None):
+        """
+        Record the area drawn for a dynamic element this frame.
+
+        The signature describes what was drawn there. When it is not given, it is taken from the screen
+        pixels inside the area once the frame is presented.
+        """
+        if isinstance(rects, pygame.Rect):
+            rects = [rects]
+        self.current[key] = (tuple(tuple(rect) for rect in rects if rect.width and rect.height), signature)
+
+    def sign_regions(self, screen):
+        """
+        Fill in the missing signatures of the current frame from the screen pixels.
+        """
+        screen_rect = screen.get_rect()
+        for key, (rects, signature) in self.current.items():
+            if signature is None:
+                pixels = []
+                for rect in rects:
+                    visible = screen_rect.clip(rect)
+                    if visible.width and visible.height:
+                        pixels.append(pygame.image.tobytes(screen.subsurface(visible), 'RGB'))
+                self.current[key] = (rects, hash(b''.join(pixels)))
+
+    def request_full(self):
+        """
+        Present the current frame with a full flip. The frame after it is flipped in full as well, since the
+        overlay that caused the request may have disappeared.
+        """
+        self.full = True
+
+    def dirty_rects(self) -> list[pygame.Rect]:
+        """
+        Return the regions whose content changed between the last presented frame and the current one.
+        """
+        rects = []
+        for key in self.previous.keys() | self.current.keys():
+            before = self.previous.get(key)
+            after = self.current.get(key)
+            if before != after:
+                for entry in (before, after):
+                    if entry:
+                        rects.extend(pygame.Rect(rect) for rect in entry[0])
+        return rects
+
+    def present(self, screen):
+        """
+        Present the current frame and start tracking the next one.
+        """
+        self.sign_regions(screen)
+        if self.full or self.previous_full:
+            pygame.display.flip()
+            self.statistics['Full Frames'] += 1
+        else:
+            rects = self.dirty_rects()
+            if rects:
+                pygame.display.update(rects)
+            self.statistics['Partial Frames'] += 1
+            self.statistics['Pixels Updated'] += sum(rect.width * rect.height for rect in rects)
+        self.previous = self.current
+        self.current = {}
+        self.previous_full = self.full
+        self.full = False
@@ -0,0 +1,434 @@
+"""
+This module records games to compact binary logs and replays them, exactly, at the speed they were played or as
+fast as possible.
+
+A game is replayable because its rules run in a Simulation (see simulation.py): the items are shuffled from
+the seed kept by GameState.map_selector, and everything else follows from the keys held in every step and the
+actions taken between steps, which a Recorder attached to the simulation writes as they happen. Every
+KEYFRAME_SECONDS of game time the recorder also writes a keyframe, a snapshot of the game, the player and the
+game timer, so a Replayer can seek to any point by restoring the keyframe before it instead of replaying from
+the start.
+
+The log is the header, then one record after the other, each starting with a tag byte:
+- 0 to 4: a run of steps with no key or one of the MOVEMENT_KEYS directions held, and the number of steps as
+  a variable-length integer
+- ACTION_TAG + the index of the action in ACTIONS, followed by the index of the fruit in FRUITS for 'eat'
+- KEYFRAME_TAG, followed by the length and zlib-compressed JSON of a snapshot (see Simulation.snapshot)
+
+Games are recorded when FOREST_RECORD names a directory, one log per game. Replay a log with:
+    python replay.py LOG [--seek SECONDS] [--until SECONDS] [--realtime] [--watch]
+
+Functions:
+- write_varint: Writes a variable-length unsigned integer.
+- read_varint: Reads a variable-length unsigned integer.
+- direction_of: Returns the index of the direction the held keys walk the player in.
+- recording_path: Returns the path of a new log in the record directory.
+- read_log: Reads the header and records of a log.
+- watch: Replays a log in the game window.
+- main: Replays a log and prints the state of the game at the end.
+
+Classes:
+- Recorder: Writes the steps and actions of a simulation to a log.
+- Replayer: Replays a log into a simulation and seeks within it.
+"""
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+import zlib
+
+from simulation import *
+
+LOG_MAGIC = b'FOEREC\0\0'
+LOG_VERSION = 1
+LOG_EXTENSION = '.frec'
+# Magic, version, seed, seconds per step, then the map, difficulty and gender as UTF-8 strings after their length
+LOG_HEADER = struct.Struct('<8sHQd')
+STRING_LENGTH = struct.Struct('<H')
+KEYFRAME_LENGTH = struct.Struct('<I')
+
+ACTION_TAG = 0x10
+KEYFRAME_TAG = 0x20
+ACTIONS = ['pick_up', 'interact', 'craft_campfire', 'eat', 'place_campfire', 'fire_flare', 'ask_for_help']
+KEYFRAME_SECONDS = 10
+
+RECORD_DIRECTORY = os.environ.get('FOREST_RECORD')
+
+
+def write_varint(log, value: int):
+    """
+    Writes an unsigned integer seven bits at a time, lowest first, with the top bit set on every byte but the last.
+    """
+    data = bytearray()
+    while value >= 0x80:
+        data.append(value & 0x7F | 0x80)
+        value >>= 7
+    data.append(value)
+    log.write(data)
+
+
+def read_varint(data: bytes, offset: int) -> tuple[int, int]:
+    """
+    Reads an unsigned integer written by write_varint at an offset. Returns it and the offset after it.
+    """
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def direction_of(keys) -> int:
+    """
+    Returns 0 if the held keys don't walk the player, or 1 plus the index in MOVEMENT_KEYS of the direction they
+    walk it in.
+    """
+    for index, (key, arrow_key, _, _, _) in enumerate(MOVEMENT_KEYS, 1):
+        if keys[key] or keys[arrow_key]:
+            return index
+    return 0
+
+
+def recording_path(directory: str) -> str:
+    """
+    Returns the path of a new log in a directory, named after the time the game started.
+    """
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, time.strftime('game-%Y%m%d-%H%M%S') + LOG_EXTENSION)
+
+
+class Recorder:
+    """
+    Writes the steps and actions of a simulation to a log, with a keyframe every KEYFRAME_SECONDS of game time.
+
+    Instance Attributes:
+    - path: the log written to
+    - simulation: the game recorded
+    - timer: the game timer saved in every keyframe, or None
+    - log: the open log file
+    - direction: the direction of the run of steps not written yet
+    - count: the number of steps in the run not written yet
+    - keyframe_steps: the number of steps between two keyframes
+    - next_keyframe: the step after which the next keyframe is written
+    """
+    path: str
+    simulation: Simulation
+    timer: Timer
+    log: object
+    direction: int
+    count: int
+    keyframe_steps: int
+    next_keyframe: int
+
+    def __init__(self, path: str, simulation: Simulation, timer: Timer = None,
+                 keyframe_seconds: float = KEYFRAME_SECONDS) -> None:
+        self.path = path
+        self.simulation = simulation
+        self.timer = timer
+        self.log = open(path, 'wb')
+        self.direction = 0
+        self.count = 0
+        self.keyframe_steps = max(1, round(keyframe_seconds / simulation.clock.step))
+        game_state = simulation.game_state
+        self.log.write(LOG_HEADER.pack(LOG_MAGIC, LOG_VERSION, game_state.seed, simulation.clock.step))
+        for text in (game_state.map, game_state.difficulty, game_state.gender):
+            encoded = text.encode()
+            self.log.write(STRING_LENGTH.pack(len(encoded)) + encoded)
+        self.write_keyframe()
+        simulation.recorder = self
+
+    def flush_run(self):
+        """
+        Write the run of steps not written yet.
+        """
+        if self.count:
+            self.log.write(bytes([self.direction]))
+            write_varint(self.log, self.count)
+            self.count = 0
+
+    def write_keyframe(self):
+        """
+        Write a snapshot of the game and the game timer, and push the log to disk.
+        """
+        self.flush_run()
+        snapshot = self.simulation.snapshot()
+        if self.timer is not None:
+            snapshot['timer'] = self.timer.get_time()
+        data = zlib.compress(json.dumps(snapshot, separators=(',', ':')).encode())
+        self.log.write(bytes([KEYFRAME_TAG]) + KEYFRAME_LENGTH.pack(len(data)) + data)
+        self.log.flush()
+        self.next_keyframe = (self.simulation.clock.steps // self.keyframe_steps + 1) * self.keyframe_steps
+
+    def record_steps(self, keys, count: int):
+        """
+        Record steps taken with keys held, and write a keyframe once the next one is due.
+        """
+        direction = direction_of(keys)
+        if direction != self.direction:
+            self.flush_run()
+            self.direction = direction
+        self.count += count
+        if self.simulation.clock.steps >= self.next_keyframe:
+            self.write_keyframe()
+
+    def record_action(self, name: str, *arguments):
+        """
+        Record an action taken between steps.
+        """
+        self.flush_run()
+        self.log.write(bytes([ACTION_TAG + ACTIONS.index(name)]))
+        if name == 'eat':
+            self.log.write(bytes([FRUITS.index(arguments[0])]))
+
+    def close(self):
+        """
+        Write a last keyframe, stop recording and close the log.
+        """
+        if not self.log.closed:
+            self.write_keyframe()
+            self.simulation.recorder = None
+            self.log.close()
+
+
+def read_log(path: str) -> tuple[dict, list[tuple]]:
+    """
+    Reads the header of a log and its records: ('steps', direction, count), ('action', name, arguments) and
+    ('keyframe', snapshot). A log cut short, by a crash, is read up to its last whole record. Raises ValueError for
+    a file that isn't a log of this version.
+    """
+    with open(path, 'rb') as log:
+        data = log.read()
+    if len(data) < LOG_HEADER.size or data[:len(LOG_MAGIC)] != LOG_MAGIC:
+        raise ValueError(f'{path} is not a recorded game')
+    magic, version, seed, step = LOG_HEADER.unpack_from(data)
+    if version != LOG_VERSION:
+        raise ValueError(f'{path} is a version {version} recording, expected version {LOG_VERSION}')
+    offset = LOG_HEADER.size
+    strings = []
+    for _ in range(3):
+        (length,) = STRING_LENGTH.unpack_from(data, offset)
+        strings.append(data[offset + STRING_LENGTH.size:offset + STRING_LENGTH.size + length].decode())
+        offset += STRING_LENGTH.size + length
+    header = {'seed': seed, 'step': step, 'map': strings[0], 'difficulty': strings[1], 'gender': strings[2]}
+
+    records = []
+    try:
+        while offset < len(data):
+            tag = data[offset]
+            offset += 1
+            if tag <= len(MOVEMENT_KEYS):
+                count, offset = read_varint(data, offset)
+                records.append(('steps', tag, count))
+            elif ACTION_TAG <= tag < ACTION_TAG + len(ACTIONS):
+                name = ACTIONS[tag - ACTION_TAG]
+                arguments = ()
+                if name == 'eat':
+                    arguments = (FRUITS[data[offset]],)
+                    offset += 1
+                records.append(('action', name, arguments))
+            elif tag == KEYFRAME_TAG:
+                (length,) = KEYFRAME_LENGTH.unpack_from(data, offset)
+                offset += KEYFRAME_LENGTH.size
+                if offset + length > len(data):
+                    break
+                records.append(('keyframe', json.loads(zlib.decompress(data[offset:offset + length]))))
+                offset += length
+            else:
+                raise ValueError(f'{path} has an unknown record {tag:#x} at byte {offset - 1}')
+    except (IndexError, struct.error):
+        pass
+    return header, records
+
+
+class Replayer:
+    """
+    Replays a log into a simulation, as fast as possible or at the speed it was recorded, and seeks within it.
+
+    Instance Attributes:
+    - header: the seed, step length, map, difficulty and gender of the recorded game
+    - records: the records of the log (see read_log)
+    - keyframes: the index in records of every keyframe, in order
+    - simulation: the game replayed into
+    - index: the index of the next record to replay
+    - done: the number of steps of the next record already replayed
+    """
+    header: dict
+    records: list[tuple]
+    keyframes: list[int]
+    simulation: Simulation
+    index: int
+    done: int
+
+    def __init__(self, path: str, player_images=HEADLESS_IMAGES) -> None:
+        self.header, self.records = read_log(path)
+        self.keyframes = [index for index, record in enumerate(self.records) if record[0] == 'keyframe']
+        if not self.keyframes:
+            raise ValueError(f'{path} has no keyframe to start from')
+        game_state = GameState()
+        game_state.set_difficulty(self.header['difficulty'])
+        game_state.set_gender(self.header['gender'])
+        game_state.map_selector(self.header['map'], self.header['seed'])
+        self.simulation = Simulation(game_state, Player(*PLAYER_SPAWN, [1, 1], player_images),
+                                     StepClock(self.header['step']))
+        self.restore(self.keyframes[0])
+
+    def restore(self, index: int):
+        """
+        Restore the keyframe at an index of the records and replay from the record after it.
+        """
+        self.simulation.restore(self.records[index][1])
+        self.index = index + 1
+        self.done = 0
+
+    @property
+    def steps(self) -> int:
+        """
+        The number of steps replayed.
+        """
+        return self.simulation.clock.steps
+
+    @property
+    def total_steps(self) -> int:
+        """
+        The number of steps in the log.
+        """
+        return max(self.records[self.keyframes[-1]][1]['steps'],
+                   sum(record[2] for record in self.records if record[0] == 'steps'))
+
+    def get_time(self) -> float:
+        """
+        Return the seconds of game time replayed, like Timer.get_time.
+        """
+        return self.simulation.clock.now() / 1000
+
+    def seek(self, steps: int):
+        """
+        Go to a step of the game: restore the last keyframe at or before it and replay from there.
+        """
+        index = max((index for index in self.keyframes if self.records[index][1]['steps'] <= steps),
+                    default=self.keyframes[0])
+        self.restore(index)
+        self.play(steps)
+
+    def play(self, until: int = None, realtime: bool = False, on_step=None) -> bool:
+        """
+        Replay the records up to a step and the actions taken after it, or to the end. Steps run as fast as
+        possible, or one at a time, SIMULATION_STEP apart in real time when realtime is set and with on_step
+        called after each when it is given. Returns whether the end of the log was reached.
+        """
+        simulation = self.simulation
+        start, started = time.perf_counter(), simulation.clock.steps
+        while self.index < len(self.records):
+            record = self.records[self.index]
+            if record[0] == 'steps':
+                direction, count = record[1], record[2] - self.done
+                if until is not None:
+                    count = min(count, until - simulation.clock.steps)
+                    if count <= 0:
+                        return False
+                directions = {MOVEMENT_KEYS[direction - 1][2]} if direction else set()
+                if realtime or on_step is not None:
+                    keys = key_state(directions)
+                    for _ in range(count):
+                        if realtime:
+                            delay = (simulation.clock.steps - started + 1) * simulation.clock.step - (
+                                time.perf_counter() - start)
+                            if delay > 0:
+                                time.sleep(delay)
+                        simulation.step(keys)
+                        if on_step is not None:
+                            on_step()
+                else:
+                    taken = simulation.run(count, directions)
+                    for _ in range(count - taken):
+                        simulation.step(key_state(directions))
+                self.done += count
+                if self.done < record[2]:
+                    continue
+            elif record[0] == 'action':
+                if until is not None and simulation.clock.steps > until:
+                    return False
+                getattr(simulation, record[1])(*record[2])
+            self.index += 1
+            self.done = 0
+        return True
+
+
+def watch(replayer: Replayer, until: int = None, realtime: bool = False):
+    """
+    Replays a log up to a step, or to the end, in the game window, drawing the map, the player and their health
+    after every step. Closing the window stops the replay.
+    """
+    from set import display_hearts, display_map, display_mask, display_time, init_display, load_scene_assets
+
+    screen = init_display()
+    load_scene_assets('game')
+    simulation = replayer.simulation
+
+    def draw():
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                raise KeyboardInterrupt
+        screen.fill((0, 0, 0))
+        display_time(replayer, screen)
+        display_hearts(simulation.player, screen)
+        display_map(simulation.player, screen, simulation.game_state)
+        if simulation.game_state.is_dark_mode():
+            display_mask(simulation.player, simulation.game_state, simulation.game_state.is_campfire(), screen)
+        pygame.display.flip()
+
+    try:
+        replayer.play(until, realtime, draw)
+    except KeyboardInterrupt:
+        pass
+
+
+def main(arguments=None):
+    """
+    Replays a log, from a point in it if asked, and prints the state of the game at the end and how long the
+    replay took.
+    """
+    parser = argparse.ArgumentParser(description='Replay a recorded Forest of Echoes game.')
+    parser.add_argument('log')
+    parser.add_argument('--seek', type=float, help='start from this many seconds of game time')
+    parser.add_argument('--until', type=float, help='stop after this many seconds of game time')
+    parser.add_argument('--realtime', action='store_true', help='replay at the speed the game was played')
+    parser.add_argument('--watch', action='store_true', help='show the replay in the game window')
+    options = parser.parse_args(arguments)
+
+    start = time.perf_counter()
+    try:
+        if options.watch:
+            from set import initialize_player
+            probe = GameState()
+            probe.gender = read_log(options.log)[0]['gender']
+            replayer = Replayer(options.log, initialize_player(probe).player_images)
+        else:
+            replayer = Replayer(options.log)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+    step = replayer.header['step']
+    if options.seek is not None:
+        replayer.seek(round(options.seek / step))
+    until = round(options.until / step) if options.until is not None else None
+    if options.watch:
+        watch(replayer, until, options.realtime)
+    else:
+        replayer.play(until, options.realtime)
+    elapsed = time.perf_counter() - start
+
+    simulation = replayer.simulation
+    player = simulation.player
+    print(f'{replayer.header["map"]} on {replayer.header["difficulty"]}, seed {replayer.header["seed"]}: '
+          f'{replayer.get_time():.2f} of {replayer.total_steps * step:.2f} s replayed in {elapsed * 1000:.0f} ms, '
+          f'{"won" if simulation.won else "lost" if simulation.lost else "playing"}, health {player.health:.2f}, '
+          f'position ({player.player_x}, {player.player_y}), inventory {sorted(player.inventory)}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,295 @@
+"""
+This module saves game sessions to save slots and loads them back, without stalling the frame that saves.
+
+A session is everything a game needs to go on where it was left: the map, difficulty, character and item seed
+it was started with, the time on the game timer and a snapshot of the game's simulation (see
+Simulation.snapshot), which holds the player's position, health and inventory, the items left on the map, the
+campfire and the statistics. Taking the snapshot copies the game into plain data, which a SaveWriter encodes
+and writes on its own thread, so the game can go on changing while the save is written. A save is written
+next to the slot and moved over it once it is whole, so a crash never leaves a slot half-written. Loading a
+slot memory-maps the file and unpacks it in place.
+
+The game autosaves to the 'autosave' slot every AUTOSAVE_SECONDS of game time (set FOREST_AUTOSAVE to change
+it, 0 turns it off) and when the window is closed, and saves to slots 1 to 3 with F1 to F3. The start screen
+loads slots 1 to 3 with F1 to F3 and the autosave with F4. Saves are kept in SAVE_DIRECTORY (FOREST_SAVES).
+
+File layout (little-endian):
+- header: magic b'FOESAVE\\0', format version (u16), body length (u32), CRC-32 of the body (u32)
+- body: the numbers of the session (see SESSION), then the map, difficulty and gender, the name and
+  description of every item in the inventory and every item on the map after its cell (u16 x, u16 y), and the
+  cells of the campfires (u16 x, u16 y). Every string is UTF-8 after its length (u16).
+
+Functions:
+- slot_path: Returns the path of a save slot.
+- capture_session: Copies the session of a running game.
+- pack_string: Returns a string encoded as UTF-8 after its length.
+- encode_session: Encodes a session in the save format.
+- write_session: Writes a session to a file.
+- decode_session: Decodes a session from the save format.
+- unpack_session: Unpacks a session from the body of a save.
+- load_session: Reads a session from a file.
+- start_session: Starts a headless game from a session.
+
+Classes:
+- SaveWriter: Writes sessions on a background thread.
+"""
+import math
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+
+from simulation import *
+
+SAVE_MAGIC = b'FOESAVE\0'
+SAVE_VERSION = 1
+SAVE_EXTENSION = '.fsave'
+SAVE_DIRECTORY = os.environ.get('FOREST_SAVES', 'saves')
+SAVE_SLOTS = ['1', '2', '3']
+AUTOSAVE_SLOT = 'autosave'
+AUTOSAVE_SECONDS = float(os.environ.get('FOREST_AUTOSAVE', '30'))
+
+HEADER = struct.Struct('<8sHII')
+# Seed, seconds per step, steps, timer seconds, last health update, campfire start (NaN when there is none),
+# health decrement interval, health, move remainder, last animation update, health lost, health gained, the
+# position and previous position, direction (index in MOVEMENT_KEYS), animation frame, flags (FLAGS), help
+# tracker, then how many inventory items, map items and campfires follow
+SESSION = struct.Struct('<QdQdddddddddiiiiBBBIHHH')
+STRING_LENGTH = struct.Struct('<H')
+CELL = struct.Struct('<HH')
+FLAGS = ['dark mode', 'campfire', 'end']
+DIRECTIONS = [direction for _, _, direction, _, _ in MOVEMENT_KEYS]
+
+
+def slot_path(slot: str, directory: str = None) -> str:
+    """
+    Returns the path of a save slot in a directory, SAVE_DIRECTORY by default.
+    """
+    return os.path.join(directory or SAVE_DIRECTORY, f'slot-{slot}{SAVE_EXTENSION}')
+
+
+def capture_session(simulation: Simulation, timer: Timer = None) -> dict:
+    """
+    Copies the session of a running game into plain data, which the game can go on changing without affecting.
+    """
+    game_state = simulation.game_state
+    return {'map': game_state.map, 'difficulty': game_state.difficulty, 'gender': game_state.gender,
+            'seed': game_state.seed, 'step': simulation.clock.step,
+            'timer': timer.get_time() if timer is not None else simulation.clock.now() / 1000,
+            'snapshot': simulation.snapshot()}
+
+
+def pack_string(text: str) -> bytes:
+    """
+    Returns a string encoded as UTF-8 after its length.
+    """
+    encoded = text.encode()
+    return STRING_LENGTH.pack(len(encoded)) + encoded
+
+
+def encode_session(session: dict) -> bytes:
+    """
+    Encodes a session in the save format, header included.
+    """
+    snapshot = session['snapshot']
+    player, game_state = snapshot['player'], snapshot['game state']
+    flags = sum(1 << index for index, flag in enumerate(FLAGS) if game_state[flag])
+    campfire_start = snapshot['campfire start']
+    parts = [SESSION.pack(
+        session['seed'] or 0, session['step'], snapshot['steps'], session['timer'],
+        snapshot['last health update'], math.nan if campfire_start is None else campfire_start,
+        snapshot['interval'], player['health'], player['remainder'], player['last update'],
+        game_state['statistics']['Health Lost'], game_state['statistics']['Health Gained'],
+        *player['position'], *player['previous'], DIRECTIONS.index(player['direction']), player['frame'], flags,
+        game_state['help tracker'], len(player['inventory']), len(game_state['items']),
+        len(game_state['campfire locations']))]
+    parts.extend(pack_string(text) for text in (session['map'], session['difficulty'], session['gender']))
+    for name, description in player['inventory'].items():
+        parts.append(pack_string(name) + pack_string(description))
+    for x, y, name, description in game_state['items']:
+        parts.append(CELL.pack(x, y) + pack_string(name) + pack_string(description))
+    parts.extend(CELL.pack(x, y) for x, y in game_state['campfire locations'])
+    body = b''.join(parts)
+    return HEADER.pack(SAVE_MAGIC, SAVE_VERSION, len(body), zlib.crc32(body)) + body
+
+
+def write_session(path: str, session: dict):
+    """
+    Writes a session to a file, replacing the old file only once the new one is written.
+    """
+    data = encode_session(session)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path + '.tmp', 'wb') as save_file:
+        save_file.write(data)
+    os.replace(path + '.tmp', path)
+
+
+def decode_session(buffer, name: str = '<save>') -> dict:
+    """
+    Decodes a session from the save format in a buffer, without copying the buffer. Raises ValueError if it
+    isn't a save of this version, doesn't match its checksum or can't be unpacked.
+    """
+    if len(buffer) < HEADER.size:
+        raise ValueError(f'{name} is too short to be a save')
+    magic, version, length, checksum = HEADER.unpack_from(buffer, 0)
+    if magic != SAVE_MAGIC or version != SAVE_VERSION:
+        raise ValueError(f'{name} is not a version {SAVE_VERSION} save')
+    body = memoryview(buffer)[HEADER.size:HEADER.size + length]
+    # The view is released before any error leaves, so a memory-mapped buffer can be closed as the error
+    # propagates
+    try:
+        if len(body) != length or zlib.crc32(body) != checksum:
+            raise ValueError(f'{name} is damaged: its body does not match its checksum')
+        return unpack_session(body)
+    except (struct.error, IndexError) as error:
+        raise ValueError(f'{name} is damaged: {error}') from error
+    finally:
+        body.release()
+
+
+def unpack_session(body: memoryview) -> dict:
+    """
+    Unpacks a session from the body of a save. Raises struct.error or IndexError if the body is cut short or
+    holds values out of range, and UnicodeDecodeError if a string isn't UTF-8.
+    """
+    (seed, step, steps, timer, last_health_update, campfire_start, interval, health, remainder, last_update,
+     health_lost, health_gained, x, y, previous_x, previous_y, direction, frame, flags, help_tracker,
+     inventory_count, item_count, campfire_count) = SESSION.unpack_from(body, 0)
+    offset = SESSION.size
+
+    def string() -> str:
+        nonlocal offset
+        (string_length,) = STRING_LENGTH.unpack_from(body, offset)
+        offset += STRING_LENGTH.size + string_length
+        return str(body[offset - string_length:offset], 'utf-8')
+
+    def cell() -> list[int]:
+        nonlocal offset
+        offset += CELL.size
+        return list(CELL.unpack_from(body, offset - CELL.size))
+
+    map_name, difficulty, gender = string(), string(), string()
+    inventory = {}
+    for _ in range(inventory_count):
+        item_name = string()
+        inventory[item_name] = string()
+    items = [cell() + [string(), string()] for _ in range(item_count)]
+    campfire_locations = [cell() for _ in range(campfire_count)]
+    return {'map': map_name, 'difficulty': difficulty, 'gender': gender, 'seed': seed, 'step': step,
+            'timer': timer,
+            'snapshot': {
+                'steps': steps, 'last health update': last_health_update,
+                'campfire start': None if math.isnan(campfire_start) else campfire_start, 'interval': interval,
+                'player': {'position': [x, y], 'previous': [previous_x, previous_y], 'remainder': remainder,
+                           'direction': DIRECTIONS[direction], 'frame': frame, 'last update': last_update,
+                           'health': health, 'inventory': inventory},
+                'game state': {**{flag: bool(flags >> index & 1) for index, flag in enumerate(FLAGS)},
+                               'campfire locations': campfire_locations,
+                               'statistics': {'Health Lost': health_lost, 'Health Gained': health_gained},
+                               'help tracker': help_tracker, 'items': items}}}
+
+
+def load_session(path: str) -> dict:
+    """
+    Reads a session from a file through a memory map. Raises OSError if the file can't be read and ValueError
+    if it isn't an undamaged save of this version.
+    """
+    with open(path, 'rb') as save_file:
+        with mmap.mmap(save_file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return decode_session(buffer, path)
+
+
+def start_session(session: dict, player_images=HEADLESS_IMAGES) -> Simulation:
+    """
+    Starts a game from a session, with the map, difficulty and items it was started with, and restores it.
+    """
+    game_state = GameState()
+    game_state.set_difficulty(session['difficulty'])
+    game_state.set_gender(session['gender'])
+    game_state.map_selector(session['map'], session['seed'])
+    simulation = Simulation(game_state, Player(*PLAYER_SPAWN, [1, 1], player_images), StepClock(session['step']))
+    simulation.restore(session['snapshot'])
+    return simulation
+
+
+class SaveWriter:
+    """
+    Writes sessions on a background thread, one after the other, so saving never stalls a frame.
+
+    Instance Attributes:
+    - queue: the (path, session) pairs to write, in order, and None to stop the thread
+    - writer: the writer thread, started the first time a session is saved
+    - lock: held while the counters are read or changed
+    - writes: the number of sessions written
+    - write_time: the seconds spent encoding and writing sessions
+    - slowest_write: the seconds the slowest write took
+    - errors: the errors of the writes that failed, most recent last
+    """
+    queue: queue.Queue
+    writer: threading.Thread
+    lock: threading.Lock
+    writes: int
+    write_time: float
+    slowest_write: float
+    errors: list[OSError]
+
+    def __init__(self) -> None:
+        self.queue = queue.Queue()
+        self.writer = None
+        self.lock = threading.Lock()
+        self.writes = 0
+        self.write_time = 0.0
+        self.slowest_write = 0.0
+        self.errors = []
+
+    def save(self, path: str, session: dict):
+        """
+        Ask the writer thread to write a session captured with capture_session.
+        """
+        self.queue.put((path, session))
+        if self.writer is None:
+            self.writer = threading.Thread(target=self.run_writer, name='save writer', daemon=True)
+            self.writer.start()
+
+    def run_writer(self):
+        """
+        Write the sessions asked for by save, in the order they were asked for, until the writer is closed.
+        """
+        while True:
+            job = self.queue.get()
+            if job is None:
+                self.queue.task_done()
+                return
+            start = time.perf_counter()
+            try:
+                write_session(*job)
+            except OSError as error:
+                with self.lock:
+                    self.errors.append(error)
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                self.writes += 1
+                self.write_time += elapsed
+                self.slowest_write = max(self.slowest_write, elapsed)
+            self.queue.task_done()
+
+    def wait(self):
+        """
+        Wait until every session asked for has been written.
+        """
+        self.queue.join()
+
+    def close(self):
+        """
+        Write the sessions asked for and stop the writer thread.
+        """
+        if self.writer is not None:
+            self.queue.put(None)
+            self.writer.join()
+            self.writer = None
+
+
+save_writer = SaveWriter()
@@ -0,0 +1,140 @@
+"""
+This module contains the scene stack that moves the game between its screens.
+
+Every screen is a Scene. The SceneManager keeps the open scenes on a stack and runs the one on top, one frame
+at a time, from a single loop. Scenes move between each other by asking the manager to push a scene on top of
+themselves, pop themselves off or replace themselves. Transitions are applied between frames, so however many
+screens the player goes through, the Python stack stays as deep as the loop and no finished screen stays alive.
+
+Classes:
+- Scene: A screen of the game, run one frame at a time by a SceneManager.
+- SceneManager: Runs the scene on top of a stack of scenes from a single loop.
+"""
+import pygame
+
+from profiler import profiler
+
+
+class Scene:
+    """
+    A screen of the game, run one frame at a time by a SceneManager.
+
+    Instance Attributes:
+    - manager: the scene manager running the scene, set when the scene is pushed
+    """
+    manager: 'SceneManager'
+
+    def enter(self):
+        """
+        Called when the scene is pushed onto the stack, before its first frame.
+        """
+
+    def resume(self):
+        """
+        Called when the scene is back on top of the stack after the scene above it was popped.
+        """
+
+    def leave(self):
+        """
+        Called when the scene is popped off the stack or replaced.
+        """
+
+    def frame(self, screen, events):
+        """
+        Handle the events of one frame, update the scene and draw it on the screen.
+        """
+        raise NotImplementedError
+
+
+class SceneManager:
+    """
+    Runs the scene on top of a stack of scenes from a single loop.
+
+    Instance Attributes:
+    - screen: the surface every scene draws on
+    - stack: the open scenes, the running one last
+    - pending: the transitions asked for during the current frame, applied once the frame is over
+    - clock: the clock limiting the frame rate
+    - fps_cap: the maximum number of frames per second, or 0 for no limit
+    - frame_time: the seconds the last frame took, including the wait for the frame cap
+    - running: whether the loop keeps running
+    - transitions: the number of transitions applied
+    """
+    screen: pygame.Surface
+    stack: list[Scene]
+    pending: list[tuple[str, Scene]]
+    clock: pygame.time.Clock
+    fps_cap: int
+    frame_time: float
+    running: bool
+    transitions: int
+
+    def __init__(self, screen: pygame.Surface, clock: pygame.time.Clock, fps_cap: int = 0) -> None:
+        self.screen = screen
+        self.stack = []
+        self.pending = []
+        self.clock = clock
+        self.fps_cap = fps_cap
+        self.frame_time = 0.0
+        self.running = True
+        self.transitions = 0
+
+    def push(self, scene: Scene):
+        """
+        Open a scene on top of the running one. The running scene resumes when it is popped.
+        """
+        self.pending.append(('push', scene))
+
+    def pop(self):
+        """
+        Close the running scene and resume the one below it.
+        """
+        self.pending.append(('pop', None))
+
+    def replace(self, scene: Scene):
+        """
+        Close the running scene and open another one in its place.
+        """
+        self.pending.append(('replace', scene))
+
+    def quit(self):
+        """
+        Stop the loop once the current frame is over.
+        """
+        self.running = False
+
+    def apply_transitions(self):
+        """
+        Apply the transitions asked for during the last frame, in order.
+        """
+        while self.pending:
+            action, scene = self.pending.pop(0)
+            if action in {'pop', 'replace'} and self.stack:
+                self.stack.pop().leave()
+            if action in {'push', 'replace'}:
+                scene.manager = self
+                self.stack.append(scene)
+                scene.enter()
+            elif self.stack:
+                self.stack[-1].resume()
+            self.transitions += 1
+
+    def run_frame(self):
+        """
+        Run one frame of the scene on top of the stack, apply the transitions it asked for and wait for the
+        frame cap. The frame is timed by the profiler, up to the wait.
+        """
+        profiler.begin_frame()
+        self.stack[-1].frame(self.screen, pygame.event.get())
+        self.apply_transitions()
+        profiler.end_frame()
+        self.frame_time = self.clock.tick(self.fps_cap) / 1000
+
+    def run(self, scene: Scene):
+        """
+        Open a scene and run frames until the loop is stopped or every scene is closed.
+        """
+        self.push(scene)
+        self.apply_transitions()
+        while self.running and self.stack:
+            self.run_frame()
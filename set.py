@@ -5,8 +5,6 @@ Functions:
 - render_text: Renders multiple lines of text on the screen.
 - display_text: Displays win or lose text on the screen.
 - pause_campfire: Stops the campfire sound if it is playing.
-- open_chest: Handles the actions when a player opens a chest.
-- get_health_decrement: Returns the health decrement interval based on the game difficulty.
 - initialize_player: Initializes the player object with the appropriate images.
 - display_inventory: Displays the player's inventory on the screen.
 - display_menu: Displays the game menu with controls, credits, and help sections.
@@ -20,6 +18,7 @@ Functions:
 - display_buttons: Displays in-game buttons for interaction.
 - display_time: Displays the elapsed time on the screen.
 - display_hearts: Displays the player's health as heart icons.
+- display_profiler: Displays the rolling statistics of the profiler's spans.
 - interact_checker: Checks the player's current grid code for interactions.
 - display_fruit_message: Displays a message when the player eats a fruit.
 - display_error_message: Displays an error message for invalid actions.
@@ -27,11 +26,30 @@ Functions:
 - display_items: Displays items from the player's inventory on the screen.
 - get_item_image: Returns the image associated with an item name.
 - campfire_valid_loc: Checks if a location is valid for placing a campfire.
-- display_map: Displays the game map and items on the screen.
+- get_map_tile_sprites: Returns the image and offset used to draw every map tile code.
+- get_grass_background: Returns an opaque surface tiled with grass.
+- draw_map_tiles: Draws the static map tiles of a world area onto a surface.
+- exposed_areas: Returns the parts of a world area outside a previous one.
+- build_map_layer: Draws the static part of a world area of the current map once into an off-screen surface.
+- get_map_layer: Returns the cached static map layer, rebuilding it when the map changes or the view leaves it.
+- display_map: Scrolls the camera to the player and displays the game map and items in view.
 """
 
+import assets
 from assets import *
+from cache import *
 from data import *
+from lighting import *
+from profiler import *
+from simulation import *
+
+# Where the hill image is drawn from the top-left hill tile of a hill, and how many cells the cached map layer
+# reaches past the camera's view on every side
+HILL_OFFSET = (0, 10)
+LAYER_MARGIN = 4
+
+# Grass tiled once into an opaque surface, cut to size for every map layer (see get_grass_background)
+grass_background = None
 
 
 def render_text(screen, text_lines, font, color, start_pos, line_spacing):
@@ -40,7 +58,7 @@ def render_text(screen, text_lines, font, color, start_pos, line_spacing):
     """
     x, y = start_pos
     for line in text_lines:
-        text_surface = font.render(line, True, color)
+        text_surface = render_cached(font, line, True, color)
         screen.blit(text_surface, (x, y))
         y += text_surface.get_height() + line_spacing
 
@@ -63,15 +81,15 @@ def display_intro(screen, start_time):
     """
     screen.fill(D_BLUE)
 
-    screen.blit(small_button_image, (5, 5))
-    return_text = pixel_40.render('RETURN', True, WHITE)
+    screen.blit(assets.small_button_image, (5, 5))
+    return_text = render_cached(assets.pixel_40, 'RETURN', True, WHITE)
     return_text_rect = return_text.get_rect(topleft=(24, 20))
     screen.blit(return_text, return_text_rect)
-    screen.blit(small_button_image, (1300, 880))
-    proceed_text = pixel_35.render('PROCEED', True, WHITE)
+    screen.blit(assets.small_button_image, (1300, 880))
+    proceed_text = render_cached(assets.pixel_35, 'PROCEED', True, WHITE)
     screen.blit(proceed_text, (1320, 895))
 
-    text1 = pixel_40.render('Story Intro', True, WHITE)
+    text1 = render_cached(assets.pixel_40, 'Story Intro', True, WHITE)
     screen.blit(text1, (680, 100))
 
     text_lines = [
@@ -103,26 +121,28 @@ def display_intro(screen, start_time):
     for i in range(paragraphs_to_display + 1):
         if i < len(text_lines):
             if text_lines[i]:
-                text_surface = steph_30.render(text_lines[i], True, WHITE)
+                text_surface = render_cached(assets.steph_30, text_lines[i], True, WHITE)
                 text_rect = text_surface.get_rect()
                 x_position = (screen_width - text_rect.width) // 2
                 screen.blit(text_surface, (x_position, 170 + i * 40))
 
 
-def display_text(screen, value):
+def display_text(screen, value) -> list[pygame.Rect]:
     """
-    Displays win or lose text on the screen.
+    Displays win or lose text on the screen and returns the areas drawn.
     """
+    drawn = []
     if value == 'win':
-        end_text = pixel_30.render("Congrats on Escaping the Forest", True, WHITE)
-        screen.blit(end_text, (window_size[0] / 2 - end_text.get_width() / 2 + 50, 840))
-        end_text1 = steph_15.render("You will be shortly transported to the end page!", True, WHITE)
-        screen.blit(end_text1, (window_size[0] / 2 - end_text1.get_width() / 2 + 50, 860))
+        end_text = render_cached(assets.pixel_30, "Congrats on Escaping the Forest", True, WHITE)
+        drawn.append(screen.blit(end_text, (window_size[0] / 2 - end_text.get_width() / 2 + 50, 840)))
+        end_text1 = render_cached(assets.steph_15, "You will be shortly transported to the end page!", True, WHITE)
+        drawn.append(screen.blit(end_text1, (window_size[0] / 2 - end_text1.get_width() / 2 + 50, 860)))
     elif value == 'lose':
-        end_text = pixel_30.render("Unfortunate ending!!", True, WHITE)
-        screen.blit(end_text, (window_size[0] / 2 - end_text.get_width() / 2 + 50, 840))
-        end_text1 = steph_15.render("You will be shortly transported to the end page!", True, WHITE)
-        screen.blit(end_text1, (window_size[0] / 2 - end_text1.get_width() / 2 + 50, 860))
+        end_text = render_cached(assets.pixel_30, "Unfortunate ending!!", True, WHITE)
+        drawn.append(screen.blit(end_text, (window_size[0] / 2 - end_text.get_width() / 2 + 50, 840)))
+        end_text1 = render_cached(assets.steph_15, "You will be shortly transported to the end page!", True, WHITE)
+        drawn.append(screen.blit(end_text1, (window_size[0] / 2 - end_text1.get_width() / 2 + 50, 860)))
+    return drawn
 
 
 def pause_campfire(campfire_sound_playing, campfire_sound1) -> bool:
@@ -135,63 +155,35 @@ def pause_campfire(campfire_sound_playing, campfire_sound1) -> bool:
     return campfire_sound_playing
 
 
-def open_chest(player):
-    """
-    Handles the actions when a player opens a chest.
-    """
-    play_sound_effect(chest_sound, 0.4)
-    player.remove_item_from_inventory('Wood Key')
-    player.remove_item_from_inventory('Gold Key')
-    player.remove_item_from_inventory('Blue Key')
-    player.remove_item_from_inventory('Copper Key')
-    player.inventory['FlareGun'] = 'Your only escape! Find the perfect place to fire!'
-    player.inventory['JewelBag'] = 'The Hidden Treasure Worth Millions!!'
-
-
-def get_health_decrement(game_state) -> int:
-    """
-    Returns the health decrement interval based on the game difficulty.
-    """
-    if game_state.current_difficulty() == 'easy':
-        health_decrement_interval = 35000
-    elif game_state.current_difficulty() == 'medium':
-        health_decrement_interval = 25000
-    elif game_state.current_difficulty() == 'hard':
-        health_decrement_interval = 20000
-    else:
-        raise ValueError
-    return health_decrement_interval
-
-
 def initialize_player(game_state) -> Player:
     """
     Initializes the player object with the appropriate images.
     """
     player_images = {
-        'down': man_down,
-        'up': man_up,
-        'left': man_left,
-        'right': man_right,
-        'dead': man_dead1
+        'down': assets.man_down,
+        'up': assets.man_up,
+        'left': assets.man_left,
+        'right': assets.man_right,
+        'dead': assets.man_dead1
     }
     if game_state.current_gender() == 'male':
         player_images = {
-            'down': man_down,
-            'up': man_up,
-            'left': man_left,
-            'right': man_right,
-            'dead': man_dead1
+            'down': assets.man_down,
+            'up': assets.man_up,
+            'left': assets.man_left,
+            'right': assets.man_right,
+            'dead': assets.man_dead1
         }
     elif game_state.current_gender() == 'girl':
         player_images = {
-            'down': girl_down,
-            'up': girl_up,
-            'left': girl_left,
-            'right': girl_right,
-            'dead': girl_dead1
+            'down': assets.girl_down,
+            'up': assets.girl_up,
+            'left': assets.girl_left,
+            'right': assets.girl_right,
+            'dead': assets.girl_dead1
         }
 
-    return Player(260, 150, [1, 1], player_images)
+    return Player(*PLAYER_SPAWN, [1, 1], player_images)
 
 
 def display_inventory(screen, display_message, player):
@@ -201,9 +193,9 @@ def display_inventory(screen, display_message, player):
     screen.fill(D_BLUE)
 
     if display_message:
-        blah = steph_15.render('You have crafted a Campfire!', True, WHITE)
+        blah = render_cached(assets.steph_15, 'You have crafted a Campfire!', True, WHITE)
         screen.blit(blah, (window_size[0] - 290, 750))
-        blah1 = steph_15.render('Items have been removed from your inventory', True, WHITE)
+        blah1 = render_cached(assets.steph_15, 'Items have been removed from your inventory', True, WHITE)
         screen.blit(blah1, (window_size[0] - 340, 770))
 
     pygame.draw.rect(screen, BLACK, pygame.Rect(400, 200, 706, 564))
@@ -212,38 +204,38 @@ def display_inventory(screen, display_message, player):
         for col in range(5):
             x = start_x + col * 135
             y = start_y + row * 132
-            screen.blit(item_frame, (x, y))
+            screen.blit(assets.item_frame, (x, y))
 
-    inventory_text = pixel_150.render('INVENTORY', True, GRAY)
-    inventory_text1 = pixel_150.render('INVENTORY', True, WHITE)
+    inventory_text = render_cached(assets.pixel_150, 'INVENTORY', True, GRAY)
+    inventory_text1 = render_cached(assets.pixel_150, 'INVENTORY', True, WHITE)
     screen.blit(inventory_text, (438, 80))
     screen.blit(inventory_text1, (443, 85))
 
-    screen.blit(small_button_image, (5, 5))
-    return_text = pixel_40.render('RETURN', True, WHITE)
+    screen.blit(assets.small_button_image, (5, 5))
+    return_text = render_cached(assets.pixel_40, 'RETURN', True, WHITE)
     return_text_rect = return_text.get_rect(topleft=(24, 20))
     screen.blit(return_text, return_text_rect)
 
-    new_matchbox = pygame.transform.scale(matchbox_image, (50, 50))
-    w_matchbox = pygame.transform.scale(w_matchbox_image, (50, 50))
-    new_log = pygame.transform.scale(logs_image, (45, 40))
-    w_log = pygame.transform.scale(w_logs_image, (45, 40))
-    new_rock = pygame.transform.scale(rock_image, (45, 45))
-    w_rock = pygame.transform.scale(w_rock_image, (45, 45))
-    campfire_resized = pygame.transform.scale(campfire_image, (90, 90))
+    new_matchbox = scaled_sprite(assets.matchbox_image, (50, 50))
+    w_matchbox = scaled_sprite(assets.w_matchbox_image, (50, 50))
+    new_log = scaled_sprite(assets.logs_image, (45, 40))
+    w_log = scaled_sprite(assets.w_logs_image, (45, 40))
+    new_rock = scaled_sprite(assets.rock_image, (45, 45))
+    w_rock = scaled_sprite(assets.w_rock_image, (45, 45))
+    campfire_resized = scaled_sprite(assets.campfire_image, (90, 90))
 
-    screen.blit(item_frame1, (window_size[0] - 370, 470))
-    screen.blit(item_frame1, (window_size[0] - 270, 470))
-    screen.blit(item_frame1, (window_size[0] - 170, 470))
+    screen.blit(assets.item_frame1, (window_size[0] - 370, 470))
+    screen.blit(assets.item_frame1, (window_size[0] - 270, 470))
+    screen.blit(assets.item_frame1, (window_size[0] - 170, 470))
 
     if all(key in player.inventory for key in campfire_materials):
-        craft_text = pixel_40.render('CRAFT', True, GREEN)
+        craft_text = render_cached(assets.pixel_40, 'CRAFT', True, GREEN)
         screen.blit(new_matchbox, (window_size[0] - 335, 500))
         screen.blit(new_log, (window_size[0] - 233, 505))
         screen.blit(new_rock, (window_size[0] - 135, 503))
         screen.blit(campfire_resized, (window_size[0] - 260, 580))
     else:
-        craft_text = pixel_40.render('CRAFT', True, RED)
+        craft_text = render_cached(assets.pixel_40, 'CRAFT', True, RED)
         screen.blit(w_matchbox, (window_size[0] - 335, 500))
         screen.blit(w_log, (window_size[0] - 233, 505))
         screen.blit(w_rock, (window_size[0] - 135, 503))
@@ -253,10 +245,10 @@ def display_inventory(screen, display_message, player):
             screen.blit(new_log, (window_size[0] - 233, 505))
         if 'Rock' in player.inventory:
             screen.blit(new_rock, (window_size[0] - 135, 503))
-        screen.blit(w_campfire_image, (window_size[0] - 260, 580))
+        screen.blit(assets.w_campfire_image, (window_size[0] - 260, 580))
 
-    screen.blit(small_button_image, craft_button_rect.topleft)
-    screen.blit(small_button_image, (window_size[0] - 290, 690))
+    screen.blit(assets.small_button_image, craft_button_rect.topleft)
+    screen.blit(assets.small_button_image, (window_size[0] - 290, 690))
     craft_text_rect = craft_text.get_rect(topleft=(window_size[0] - 260, 705))
     screen.blit(craft_text, craft_text_rect)
 
@@ -264,12 +256,11 @@ def display_inventory(screen, display_message, player):
     count = 0
 
     for item in player.inventory:
-        item_image = get_item_image(item)
+        scaled_item_image = get_item_image(item, (55, 55))
         item_descr = player.inventory[item]
 
-        if item_image:
-            scaled_item_image = pygame.transform.scale(item_image, (55, 55))
-            scaled_item_image1 = pygame.transform.scale(item_image, (45, 45))
+        if scaled_item_image:
+            scaled_item_image1 = get_item_image(item, (45, 45))
 
             col, row = count % 5, count // 5
 
@@ -278,7 +269,7 @@ def display_inventory(screen, display_message, player):
 
             screen.blit(scaled_item_image, (screen_x, screen_y))
             screen.blit(scaled_item_image1, (10, start_y1))
-            decription = steph_15.render(item_descr, True, WHITE)
+            decription = render_cached(assets.steph_15, item_descr, True, WHITE)
             screen.blit(decription, (70, start_y1 + 17))
 
             start_y1 += 60
@@ -290,53 +281,54 @@ def display_menu(screen, is_reveal):
     Displays the menu on the screen.
     """
     screen.fill(D_BLUE)
-    screen.blit(small_button_image, (5, 5))
-    return_text = pixel_40.render('RETURN', True, WHITE)
+    screen.blit(assets.small_button_image, (5, 5))
+    return_text = render_cached(assets.pixel_40, 'RETURN', True, WHITE)
     return_text_rect = return_text.get_rect(topleft=(24, 20))
     screen.blit(return_text, return_text_rect)
 
-    text1 = pixel_40.render('Controls', True, WHITE)
+    text1 = render_cached(assets.pixel_40, 'Controls', True, WHITE)
     screen.blit(text1, (50, 700))
 
-    text2 = steph_15.render('W or Up Arrow = Upward Movement', True, WHITE)
+    text2 = render_cached(assets.steph_15, 'W or Up Arrow = Upward Movement', True, WHITE)
     screen.blit(text2, (50, 740))
-    text3 = steph_15.render('A or Left Arrow = Leftward Movement', True, WHITE)
+    text3 = render_cached(assets.steph_15, 'A or Left Arrow = Leftward Movement', True, WHITE)
     screen.blit(text3, (50, 760))
-    text4 = steph_15.render('D or Right Arrow = Rightward Movement', True, WHITE)
+    text4 = render_cached(assets.steph_15, 'D or Right Arrow = Rightward Movement', True, WHITE)
     screen.blit(text4, (50, 780))
-    text5 = steph_15.render('S or Down Arrow = Downward Movement', True, WHITE)
+    text5 = render_cached(assets.steph_15, 'S or Down Arrow = Downward Movement', True, WHITE)
     screen.blit(text5, (50, 800))
-    text6 = steph_15.render('Rest of the game mechanics are buttons which you can click', True, WHITE)
+    text6 = render_cached(assets.steph_15, 'Rest of the game mechanics are buttons which you can click', True, WHITE)
     screen.blit(text6, (50, 830))
 
-    text1 = pixel_40.render('Credits', True, WHITE)
+    text1 = render_cached(assets.pixel_40, 'Credits', True, WHITE)
     screen.blit(text1, (650, 700))
 
-    text2 = steph_15.render('Game Development: 100% Me', True, WHITE)
+    text2 = render_cached(assets.steph_15, 'Game Development: 100% Me', True, WHITE)
     screen.blit(text2, (650, 740))
-    text3 = steph_15.render('Digital Images: Varied between AI generation and Google Images', True, WHITE)
+    text3 = render_cached(assets.steph_15, 'Digital Images: Varied between AI generation and Google Images',
+                          True, WHITE)
     screen.blit(text3, (650, 760))
-    text4 = steph_15.render('Music and Sound Effects: Found online through youtube', True, WHITE)
+    text4 = render_cached(assets.steph_15, 'Music and Sound Effects: Found online through youtube', True, WHITE)
     screen.blit(text4, (650, 780))
 
-    text1 = pixel_40.render('Help ~ Spoilers', True, WHITE)
+    text1 = render_cached(assets.pixel_40, 'Help ~ Spoilers', True, WHITE)
     screen.blit(text1, (1150, 700))
 
-    screen.blit(small_button_image, (1200, 750))
-    proceed_text = pixel_35.render('Reveal', True, WHITE)
+    screen.blit(assets.small_button_image, (1200, 750))
+    proceed_text = render_cached(assets.pixel_35, 'Reveal', True, WHITE)
     screen.blit(proceed_text, (1230, 765))
 
     if is_reveal:
-        text2 = steph_15.render('There are 4 keys scattered throughout the map', True, WHITE)
+        text2 = render_cached(assets.steph_15, 'There are 4 keys scattered throughout the map', True, WHITE)
         screen.blit(text2, (1150, 830))
-        text3 = steph_15.render('After collecting the four, you can open the chest', True, WHITE)
+        text3 = render_cached(assets.steph_15, 'After collecting the four, you can open the chest', True, WHITE)
         screen.blit(text3, (1150, 850))
-        text4 = steph_15.render('You must fire the flare gun at the top of the hill', True, WHITE)
+        text4 = render_cached(assets.steph_15, 'You must fire the flare gun at the top of the hill', True, WHITE)
         screen.blit(text4, (1150, 870))
-        text5 = steph_15.render('The hill is always in the top right of the map', True, WHITE)
+        text5 = render_cached(assets.steph_15, 'The hill is always in the top right of the map', True, WHITE)
         screen.blit(text5, (1150, 890))
 
-    text1 = pixel_40.render('Story Intro', True, WHITE)
+    text1 = render_cached(assets.pixel_40, 'Story Intro', True, WHITE)
     screen.blit(text1, (680, 100))
     text_lines = [
         "     Deep within the enigmatic expanse of the Whispering Woods, a legend persists, veiled in the",
@@ -356,7 +348,7 @@ def display_menu(screen, is_reveal):
         "     Will you uncover the secrets of the Whispering Woods and claim what countless others have",
         "sought, or will you, too, fade into the forest's eternal tales?"
     ]
-    render_text(screen, text_lines, steph_24, WHITE, (350, 170), 5)
+    render_text(screen, text_lines, assets.steph_24, WHITE, (350, 170), 5)
 
 
 def display_selection(screen, game_state, which_msg, current_time, msg_start):
@@ -366,86 +358,86 @@ def display_selection(screen, game_state, which_msg, current_time, msg_start):
     screen.fill(D_BLUE)
 
     if which_msg == 'error' and current_time - msg_start <= 3000:
-        blah = steph_15.render('Must Select a character and Map!', True, WHITE)
+        blah = render_cached(assets.steph_15, 'Must Select a character and Map!', True, WHITE)
         screen.blit(blah, (1270, 860))
     elif which_msg == 'error':
         pygame.draw.rect(screen, D_BLUE, pygame.Rect(1170, 700, 250, 100))
 
     if game_state.current_map() == 'map1':
         pygame.draw.rect(screen, D_BLUE, pygame.Rect(1110, 480, 210, 100))
-        screen.blit(check_mark, (1300, 480))
+        screen.blit(assets.check_mark, (1300, 480))
     elif game_state.current_map() == 'map2':
         pygame.draw.rect(screen, D_BLUE, pygame.Rect(1110, 480, 210, 100))
-        screen.blit(check_mark, (1300, 630))
+        screen.blit(assets.check_mark, (1300, 630))
     elif game_state.current_map() == 'map3':
         pygame.draw.rect(screen, D_BLUE, pygame.Rect(1110, 480, 210, 100))
-        screen.blit(check_mark, (1300, 780))
+        screen.blit(assets.check_mark, (1300, 780))
 
     if game_state.current_gender() == 'male':
         pygame.draw.rect(screen, D_BLUE, pygame.Rect(850, 750, 210, 100))
-        screen.blit(check_mark, (900, 500))
+        screen.blit(assets.check_mark, (900, 500))
     elif game_state.current_gender() == 'girl':
         pygame.draw.rect(screen, D_BLUE, pygame.Rect(850, 490, 210, 100))
-        screen.blit(check_mark, (900, 780))
+        screen.blit(assets.check_mark, (900, 780))
 
     if game_state.current_difficulty() == 'easy':
         pygame.draw.rect(screen, D_BLUE, pygame.Rect(100, 790, 60, 60))
         pygame.draw.rect(screen, D_BLUE, pygame.Rect(230, 790, 60, 60))
         pygame.draw.rect(screen, D_BLUE, pygame.Rect(330, 790, 60, 60))
-        screen.blit(difficulty_check, (100, 800))
+        screen.blit(assets.difficulty_check, (100, 800))
     elif game_state.current_difficulty() == 'medium':
         pygame.draw.rect(screen, D_BLUE, pygame.Rect(100, 790, 60, 60))
         pygame.draw.rect(screen, D_BLUE, pygame.Rect(230, 790, 60, 60))
         pygame.draw.rect(screen, D_BLUE, pygame.Rect(330, 790, 60, 60))
-        screen.blit(difficulty_check, (230, 800))
+        screen.blit(assets.difficulty_check, (230, 800))
     elif game_state.current_difficulty() == 'hard':
         pygame.draw.rect(screen, D_BLUE, pygame.Rect(100, 790, 60, 60))
         pygame.draw.rect(screen, D_BLUE, pygame.Rect(230, 790, 60, 60))
         pygame.draw.rect(screen, D_BLUE, pygame.Rect(330, 790, 60, 60))
-        screen.blit(difficulty_check, (330, 800))
+        screen.blit(assets.difficulty_check, (330, 800))
 
-    screen.blit(small_button_image, (5, 5))
-    return_text = pixel_40.render('RETURN', True, WHITE)
+    screen.blit(assets.small_button_image, (5, 5))
+    return_text = render_cached(assets.pixel_40, 'RETURN', True, WHITE)
     return_text_rect = return_text.get_rect(topleft=(24, 20))
     screen.blit(return_text, return_text_rect)
 
-    screen.blit(small_button_image, (1300, 880))
-    proceed_text = pixel_35.render('PROCEED', True, WHITE)
+    screen.blit(assets.small_button_image, (1300, 880))
+    proceed_text = render_cached(assets.pixel_35, 'PROCEED', True, WHITE)
     screen.blit(proceed_text, (1320, 895))
 
-    select_text = pixel_100.render('Choose your preferences', True, GRAY)
+    select_text = render_cached(assets.pixel_100, 'Choose your preferences', True, GRAY)
     screen.blit(select_text, (300, 80))
-    screen.blit(pixel_100.render('Choose your preferences', True, WHITE), (305, 85))
+    screen.blit(render_cached(assets.pixel_100, 'Choose your preferences', True, WHITE), (305, 85))
 
-    screen.blit(pixel_50.render('Dark Mode?', True, GRAY), (150, 350))
-    screen.blit(pixel_50.render('Dark Mode?', True, WHITE), (153, 353))
-    rec_text = steph_20.render('Try Dark Mode for the REAL challenge', True, WHITE)
+    screen.blit(render_cached(assets.pixel_50, 'Dark Mode?', True, GRAY), (150, 350))
+    screen.blit(render_cached(assets.pixel_50, 'Dark Mode?', True, WHITE), (153, 353))
+    rec_text = render_cached(assets.steph_20, 'Try Dark Mode for the REAL challenge', True, WHITE)
     screen.blit(rec_text, (120, 560))
-    screen.blit(on_switch if game_state.is_dark_mode() else off_switch, (210, 430))
+    screen.blit(assets.on_switch if game_state.is_dark_mode() else assets.off_switch, (210, 430))
 
-    screen.blit(pixel_50.render('Difficulty?', True, GRAY), (130, 650))
-    screen.blit(pixel_50.render('Difficulty?', True, WHITE), (133, 653))
+    screen.blit(render_cached(assets.pixel_50, 'Difficulty?', True, GRAY), (130, 650))
+    screen.blit(render_cached(assets.pixel_50, 'Difficulty?', True, WHITE), (133, 653))
 
-    screen.blit(difficulty_scale, (40, 720))
+    screen.blit(assets.difficulty_scale, (40, 720))
 
-    screen.blit(pixel_50.render('Character?', True, GRAY), (640, 350))
-    screen.blit(pixel_50.render('Character?', True, WHITE), (643, 353))
-    screen.blit(example_man, (653, 400))
-    screen.blit(example_girl, (653, 680))
+    screen.blit(render_cached(assets.pixel_50, 'Character?', True, GRAY), (640, 350))
+    screen.blit(render_cached(assets.pixel_50, 'Character?', True, WHITE), (643, 353))
+    screen.blit(assets.example_man, (653, 400))
+    screen.blit(assets.example_girl, (653, 680))
 
-    screen.blit(pixel_50.render('Map?', True, GRAY), (1140, 350))
-    screen.blit(pixel_50.render('Map?', True, WHITE), (1143, 353))
+    screen.blit(render_cached(assets.pixel_50, 'Map?', True, GRAY), (1140, 350))
+    screen.blit(render_cached(assets.pixel_50, 'Map?', True, WHITE), (1143, 353))
 
-    screen.blit(small_button_image, (1110, 480))
-    diff_text1 = pixel_35.render(' EASY', True, GREEN)
+    screen.blit(assets.small_button_image, (1110, 480))
+    diff_text1 = render_cached(assets.pixel_35, ' EASY', True, GREEN)
     screen.blit(diff_text1, (1150, 495))
 
-    screen.blit(small_button_image, (1110, 630))
-    diff_text2 = pixel_35.render('MEDIUM', True, YELLOW)
+    screen.blit(assets.small_button_image, (1110, 630))
+    diff_text2 = render_cached(assets.pixel_35, 'MEDIUM', True, YELLOW)
     screen.blit(diff_text2, (1140, 645))
 
-    screen.blit(small_button_image, (1110, 780))
-    diff_text3 = pixel_35.render(' HARD', True, RED)
+    screen.blit(assets.small_button_image, (1110, 780))
+    diff_text3 = render_cached(assets.pixel_35, ' HARD', True, RED)
     screen.blit(diff_text3, (1145, 795))
 
 
@@ -454,16 +446,16 @@ def display_win(screen, game_state, timer):
     Displays the win screen with statistics.
     """
     screen.fill(L_GREEN)
-    screen.blit(small_button_image, (5, 5))
-    return_text = pixel_40.render('RETURN', True, WHITE)
+    screen.blit(assets.small_button_image, (5, 5))
+    return_text = render_cached(assets.pixel_40, 'RETURN', True, WHITE)
     return_text_rect = return_text.get_rect(topleft=(24, 20))
     screen.blit(return_text, return_text_rect)
 
-    you_text = dash_180.render('You', True, GRAY)
-    escaped_text = dash_180.render('Escaped!', True, GRAY)
+    you_text = render_cached(assets.dash_180, 'You', True, GRAY)
+    escaped_text = render_cached(assets.dash_180, 'Escaped!', True, GRAY)
 
-    you_text2 = dash_180.render('You', True, WHITE)
-    escaped_text2 = dash_180.render('Escaped!', True, WHITE)
+    you_text2 = render_cached(assets.dash_180, 'You', True, WHITE)
+    escaped_text2 = render_cached(assets.dash_180, 'Escaped!', True, WHITE)
 
     screen.blit(you_text, (window_size[0] / 2 - you_text.get_width() / 2, 150))
     screen.blit(escaped_text, (window_size[0] / 2 - escaped_text.get_width() / 2, 300))
@@ -471,46 +463,48 @@ def display_win(screen, game_state, timer):
     screen.blit(you_text2, ((window_size[0] / 2 - you_text.get_width() / 2) - 5, 145))
     screen.blit(escaped_text2, ((window_size[0] / 2 - escaped_text.get_width() / 2) - 5, 295))
 
-    end_text = pixel_100.render('You beat the game!', True, GRAY)
-    end_text1 = pixel_100.render('You beat the game!', True, WHITE)
+    end_text = render_cached(assets.pixel_100, 'You beat the game!', True, GRAY)
+    end_text1 = render_cached(assets.pixel_100, 'You beat the game!', True, WHITE)
     screen.blit(end_text, (window_size[0] / 2 - end_text.get_width() / 2, 500))
     screen.blit(end_text1, (window_size[0] / 2 - end_text.get_width() / 2 - 5, 495))
 
-    stat_text = pixel_70.render('Statistics', True, GRAY)
-    stat_text1 = pixel_70.render('Statistics', True, WHITE)
+    stat_text = render_cached(assets.pixel_70, 'Statistics', True, GRAY)
+    stat_text1 = render_cached(assets.pixel_70, 'Statistics', True, WHITE)
     screen.blit(stat_text, (window_size[0] / 2 - stat_text.get_width() / 2, 610))
     screen.blit(stat_text1, (window_size[0] / 2 - stat_text.get_width() / 2, 605))
     pygame.draw.rect(screen, BLACK, pygame.Rect(560, 660, 392, 13))
     pygame.draw.rect(screen, GRAY, pygame.Rect(560, 660, 390, 10))
 
-    time_text = pixel_40.render("Time Played:", True, WHITE)
+    time_text = render_cached(assets.pixel_40, "Time Played:", True, WHITE)
     screen.blit(time_text, (500, 700))
-    result1_text = pixel_40.render(f"{round(timer.get_time(), 2)} seconds", True, WHITE)
+    result1_text = render_cached(assets.pixel_40, f"{round(timer.get_time(), 2)} seconds", True, WHITE)
     screen.blit(result1_text, (900, 700))
 
-    health_text = pixel_40.render("Health Gained:", True, WHITE)
+    health_text = render_cached(assets.pixel_40, "Health Gained:", True, WHITE)
     screen.blit(health_text, (500, 750))
-    result2_text = pixel_40.render(f"{round(game_state.statistics['Health Gained'], 2)} hearts", True, WHITE)
+    result2_text = render_cached(assets.pixel_40, f"{round(game_state.statistics['Health Gained'], 2)} hearts",
+                                 True, WHITE)
     screen.blit(result2_text, (900, 750))
 
-    health_text1 = pixel_40.render("Health Lost:", True, WHITE)
+    health_text1 = render_cached(assets.pixel_40, "Health Lost:", True, WHITE)
     screen.blit(health_text1, (500, 800))
-    result3_text = pixel_40.render(f"{round(game_state.statistics['Health Lost'], 2)} hearts", True, WHITE)
+    result3_text = render_cached(assets.pixel_40, f"{round(game_state.statistics['Health Lost'], 2)} hearts",
+                                 True, WHITE)
     screen.blit(result3_text, (900, 800))
 
-    diff_text = pixel_40.render("Difficulty Level:", True, WHITE)
+    diff_text = render_cached(assets.pixel_40, "Difficulty Level:", True, WHITE)
     screen.blit(diff_text, (500, 850))
-    result4_text = pixel_40.render(f"{game_state.current_difficulty()}", True, WHITE)
+    result4_text = render_cached(assets.pixel_40, f"{game_state.current_difficulty()}", True, WHITE)
     screen.blit(result4_text, (900, 850))
 
-    map_text = pixel_40.render("Map Difficulty:", True, WHITE)
+    map_text = render_cached(assets.pixel_40, "Map Difficulty:", True, WHITE)
     screen.blit(map_text, (500, 900))
-    result4_text = pixel_40.render(f"{get_map_difficulty(game_state.current_map())}", True, WHITE)
+    result4_text = render_cached(assets.pixel_40, f"{get_map_difficulty(game_state.current_map())}", True, WHITE)
     screen.blit(result4_text, (900, 900))
 
-    help_text = pixel_40.render("Help Tracker:", True, WHITE)
+    help_text = render_cached(assets.pixel_40, "Help Tracker:", True, WHITE)
     screen.blit(help_text, (500, 950))
-    result4_text = pixel_40.render(f"{game_state.help_tracker}", True, WHITE)
+    result4_text = render_cached(assets.pixel_40, f"{game_state.help_tracker}", True, WHITE)
     screen.blit(result4_text, (900, 950))
 
 
@@ -519,16 +513,16 @@ def display_gameover(screen, game_state, timer):
     Displays the gameover screen with statistics.
     """
     screen.fill((128, 0, 0))
-    screen.blit(small_button_image, (5, 5))
-    return_text = pixel_40.render('RETURN', True, WHITE)
+    screen.blit(assets.small_button_image, (5, 5))
+    return_text = render_cached(assets.pixel_40, 'RETURN', True, WHITE)
     return_text_rect = return_text.get_rect(topleft=(24, 20))
     screen.blit(return_text, return_text_rect)
 
-    game_text = dash_180.render('Game', True, GRAY)
-    over_text = dash_180.render('Over!', True, GRAY)
+    game_text = render_cached(assets.dash_180, 'Game', True, GRAY)
+    over_text = render_cached(assets.dash_180, 'Over!', True, GRAY)
 
-    game_text2 = dash_180.render('Game', True, WHITE)
-    over_text2 = dash_180.render('Over!', True, WHITE)
+    game_text2 = render_cached(assets.dash_180, 'Game', True, WHITE)
+    over_text2 = render_cached(assets.dash_180, 'Over!', True, WHITE)
 
     screen.blit(game_text, (window_size[0] / 2 - game_text.get_width() / 2, 150))
     screen.blit(over_text, (window_size[0] / 2 - over_text.get_width() / 2, 300))
@@ -536,46 +530,48 @@ def display_gameover(screen, game_state, timer):
     screen.blit(game_text2, ((window_size[0] / 2 - game_text2.get_width() / 2) - 5, 145))
     screen.blit(over_text2, ((window_size[0] / 2 - over_text2.get_width() / 2) - 5, 295))
 
-    end_text = pixel_100.render('You ran out of hearts!', True, GRAY)
-    end_text1 = pixel_100.render('You ran out of hearts!', True, WHITE)
+    end_text = render_cached(assets.pixel_100, 'You ran out of hearts!', True, GRAY)
+    end_text1 = render_cached(assets.pixel_100, 'You ran out of hearts!', True, WHITE)
     screen.blit(end_text, (window_size[0] / 2 - end_text.get_width() / 2, 500))
     screen.blit(end_text1, (window_size[0] / 2 - end_text.get_width() / 2 - 5, 495))
 
-    stat_text = pixel_70.render('Statistics', True, GRAY)
-    stat_text1 = pixel_70.render('Statistics', True, WHITE)
+    stat_text = render_cached(assets.pixel_70, 'Statistics', True, GRAY)
+    stat_text1 = render_cached(assets.pixel_70, 'Statistics', True, WHITE)
     screen.blit(stat_text, (window_size[0] / 2 - stat_text.get_width() / 2, 610))
     screen.blit(stat_text1, (window_size[0] / 2 - stat_text.get_width() / 2, 605))
     pygame.draw.rect(screen, BLACK, pygame.Rect(560, 660, 392, 13))
     pygame.draw.rect(screen, GRAY, pygame.Rect(560, 660, 390, 10))
 
-    time_text = pixel_40.render("Time Played:", True, WHITE)
+    time_text = render_cached(assets.pixel_40, "Time Played:", True, WHITE)
     screen.blit(time_text, (500, 700))
-    result1_text = pixel_40.render(f"{round(timer.get_time(), 2)} seconds", True, WHITE)
+    result1_text = render_cached(assets.pixel_40, f"{round(timer.get_time(), 2)} seconds", True, WHITE)
     screen.blit(result1_text, (900, 700))
 
-    health_text = pixel_40.render("Health Gained:", True, WHITE)
+    health_text = render_cached(assets.pixel_40, "Health Gained:", True, WHITE)
     screen.blit(health_text, (500, 750))
-    result2_text = pixel_40.render(f"{round(game_state.statistics['Health Gained'], 2)} hearts", True, WHITE)
+    result2_text = render_cached(assets.pixel_40, f"{round(game_state.statistics['Health Gained'], 2)} hearts",
+                                 True, WHITE)
     screen.blit(result2_text, (900, 750))
 
-    health_text1 = pixel_40.render("Health Lost:", True, WHITE)
+    health_text1 = render_cached(assets.pixel_40, "Health Lost:", True, WHITE)
     screen.blit(health_text1, (500, 800))
-    result3_text = pixel_40.render(f"{round(game_state.statistics['Health Lost'], 2)} hearts", True, WHITE)
+    result3_text = render_cached(assets.pixel_40, f"{round(game_state.statistics['Health Lost'], 2)} hearts",
+                                 True, WHITE)
     screen.blit(result3_text, (900, 800))
 
-    diff_text = pixel_40.render("Difficulty Level:", True, WHITE)
+    diff_text = render_cached(assets.pixel_40, "Difficulty Level:", True, WHITE)
     screen.blit(diff_text, (500, 850))
-    result4_text = pixel_40.render(f"{game_state.current_difficulty()}", True, WHITE)
+    result4_text = render_cached(assets.pixel_40, f"{game_state.current_difficulty()}", True, WHITE)
     screen.blit(result4_text, (900, 850))
 
-    map_text = pixel_40.render("Map Difficulty:", True, WHITE)
+    map_text = render_cached(assets.pixel_40, "Map Difficulty:", True, WHITE)
     screen.blit(map_text, (500, 900))
-    result4_text = pixel_40.render(f"{get_map_difficulty(game_state.current_map())}", True, WHITE)
+    result4_text = render_cached(assets.pixel_40, f"{get_map_difficulty(game_state.current_map())}", True, WHITE)
     screen.blit(result4_text, (900, 900))
 
-    help_text = pixel_40.render("Help Tracker:", True, WHITE)
+    help_text = render_cached(assets.pixel_40, "Help Tracker:", True, WHITE)
     screen.blit(help_text, (500, 950))
-    result4_text = pixel_40.render(f"{game_state.help_tracker}", True, WHITE)
+    result4_text = render_cached(assets.pixel_40, f"{game_state.help_tracker}", True, WHITE)
     screen.blit(result4_text, (900, 950))
 
 
@@ -583,15 +579,15 @@ def display_start(screen):
     """
     Displays the start screen with game title and options.
     """
-    screen.blit(background_start_image, (0, 0))
+    screen.blit(assets.background_start_image, (0, 0))
 
-    forest_text = dash_180.render('Forest', True, ORANGE)
-    of_text = dash_180.render('of', True, ORANGE)
-    echoes_text = dash_180.render('Echoes', True, ORANGE)
+    forest_text = render_cached(assets.dash_180, 'Forest', True, ORANGE)
+    of_text = render_cached(assets.dash_180, 'of', True, ORANGE)
+    echoes_text = render_cached(assets.dash_180, 'Echoes', True, ORANGE)
 
-    forest_text2 = dash_180.render('Forest', True, YELLOW)
-    of_text2 = dash_180.render('of', True, YELLOW)
-    echoes_text2 = dash_180.render('Echoes', True, YELLOW)
+    forest_text2 = render_cached(assets.dash_180, 'Forest', True, YELLOW)
+    of_text2 = render_cached(assets.dash_180, 'of', True, YELLOW)
+    echoes_text2 = render_cached(assets.dash_180, 'Echoes', True, YELLOW)
 
     screen.blit(forest_text, (window_size[0] / 2 - forest_text.get_width() / 2, 130))
     screen.blit(of_text, (window_size[0] / 2 - of_text.get_width() / 2, 295))
@@ -601,20 +597,20 @@ def display_start(screen):
     screen.blit(of_text2, ((window_size[0] / 2 - of_text.get_width() / 2) - 5, 290))
     screen.blit(echoes_text2, ((window_size[0] / 2 - echoes_text.get_width() / 2) - 5, 450))
 
-    screen.blit(start_button_image, (start_button_rect.x, start_button_rect.y))
-    screen.blit(menu_button_image, (menu_button_rect.x, menu_button_rect.y))
-    screen.blit(exit_button_image, (exit_button_rect.x, exit_button_rect.y))
+    screen.blit(assets.start_button_image, (start_button_rect.x, start_button_rect.y))
+    screen.blit(assets.menu_button_image, (menu_button_rect.x, menu_button_rect.y))
+    screen.blit(assets.exit_button_image, (exit_button_rect.x, exit_button_rect.y))
 
-    start_text = pixel_70.render('START', True, WHITE)
-    menu_text = pixel_70.render('MENU', True, WHITE)
-    exit_text = pixel_70.render('EXIT', True, WHITE)
+    start_text = render_cached(assets.pixel_70, 'START', True, WHITE)
+    menu_text = render_cached(assets.pixel_70, 'MENU', True, WHITE)
+    exit_text = render_cached(assets.pixel_70, 'EXIT', True, WHITE)
 
-    start_text_x = start_button_rect.x + start_button_image.get_width() / 2 - start_text.get_width() / 2
-    start_text_y = start_button_rect.y + start_button_image.get_height() / 2 - start_text.get_height() / 2
-    menu_text_x = menu_button_rect.x + menu_button_image.get_width() / 2 - menu_text.get_width() / 2
-    menu_text_y = menu_button_rect.y + menu_button_image.get_height() / 2 - menu_text.get_height() / 2
-    exit_text_x = exit_button_rect.x + exit_button_image.get_width() / 2 - exit_text.get_width() / 2
-    exit_text_y = exit_button_rect.y + exit_button_image.get_height() / 2 - exit_text.get_height() / 2
+    start_text_x = start_button_rect.x + assets.start_button_image.get_width() / 2 - start_text.get_width() / 2
+    start_text_y = start_button_rect.y + assets.start_button_image.get_height() / 2 - start_text.get_height() / 2
+    menu_text_x = menu_button_rect.x + assets.menu_button_image.get_width() / 2 - menu_text.get_width() / 2
+    menu_text_y = menu_button_rect.y + assets.menu_button_image.get_height() / 2 - menu_text.get_height() / 2
+    exit_text_x = exit_button_rect.x + assets.exit_button_image.get_width() / 2 - exit_text.get_width() / 2
+    exit_text_y = exit_button_rect.y + assets.exit_button_image.get_height() / 2 - exit_text.get_height() / 2
 
     screen.blit(start_text, (start_text_x, start_text_y))
     screen.blit(menu_text, (menu_text_x, menu_text_y))
@@ -629,10 +625,10 @@ def display_use_text(certain_button, current_time, msg_start, game_button_rect,
     if certain_button and current_time - msg_start <= 4000:
         game_button_rect.x = [445, 575, 705, 840, 975][indicator - 1]
         ex_x = game_button_rect.x
-        screen.blit(game_button1, game_button_rect.topleft)
-        yes_text = pixel_24.render('Yes', True, BLACK)
+        screen.blit(assets.game_button1, game_button_rect.topleft)
+        yes_text = render_cached(assets.pixel_24, 'Yes', True, BLACK)
         screen.blit(yes_text, (ex_x + 25, 455))
-        blah1 = steph_15.render('Are you sure you want to use this item?', True, WHITE)
+        blah1 = render_cached(assets.steph_15, 'Are you sure you want to use this item?', True, WHITE)
         screen.blit(blah1, (ex_x - 50, 400))
 
     if which_msg == 'fruit' and current_time - msg_start <= 5000:
@@ -644,231 +640,250 @@ def display_use_text(certain_button, current_time, msg_start, game_button_rect,
     elif which_msg == 'error1' and current_time - msg_start <= 5000:
         display_error_message(screen, window_size)
 
-    select_text = pixel_100.render('Select Which Item', True, GRAY)
-    select_text1 = pixel_100.render('Select Which Item', True, WHITE)
+    select_text = render_cached(assets.pixel_100, 'Select Which Item', True, GRAY)
+    select_text1 = render_cached(assets.pixel_100, 'Select Which Item', True, WHITE)
     screen.blit(select_text, (400, 80))
     screen.blit(select_text1, (405, 85))
 
-    use_text = pixel_100.render('You want to Use', True, GRAY)
-    use_text1 = pixel_100.render('You want to Use', True, WHITE)
+    use_text = render_cached(assets.pixel_100, 'You want to Use', True, GRAY)
+    use_text1 = render_cached(assets.pixel_100, 'You want to Use', True, WHITE)
     screen.blit(use_text, (438, 150))
     screen.blit(use_text1, (443, 155))
 
-    screen.blit(small_button_image, (5, 5))
-    return_text = pixel_40.render('RETURN', True, WHITE)
+    screen.blit(assets.small_button_image, (5, 5))
+    return_text = render_cached(assets.pixel_40, 'RETURN', True, WHITE)
     return_text_rect = return_text.get_rect(topleft=(24, 20))
     screen.blit(return_text, return_text_rect)
 
 
-def display_mask(player, game_state, campfire_light, screen):
+@span('display_mask')
+def display_mask(player, game_state, campfire_light, screen, extra_lights=()):
     """
-    Displays a mask effect for dark mode around the player.
+    Displays a mask effect for dark mode around the player, the lit campfire and any extra
+    ((x, y), radius) lights given in mask coordinates.
     """
-    mask = pygame.Surface((1130, 715))
-    player_position = player.get_player_grid_location()
-    circle_center = ((player_position[0] * 50) + 40, (player_position[1] * 50) + 35)
-    mask.fill((0, 0, 0))
-    if game_state.current_difficulty() == 'easy':
-        pygame.draw.circle(mask, (255, 255, 255, 0), circle_center, 80)
-    elif game_state.current_difficulty() == 'medium':
-        pygame.draw.circle(mask, (255, 255, 255, 0), circle_center, 60)
-    elif game_state.current_difficulty() == 'hard':
-        pygame.draw.circle(mask, (255, 255, 255, 0), circle_center, 40)
+    camera = game_state.camera
+    mask_x, mask_y = camera.viewport.topleft
+    cell_x, cell_y = camera.grid_to_screen(*player.get_player_grid_location())
+    circle_center = (cell_x - mask_x + 25, cell_y - mask_y + 20)
+    lights = []
+    if game_state.current_difficulty() in LIGHT_RADII:
+        lights.append((circle_center, LIGHT_RADII[game_state.current_difficulty()]))
 
     if campfire_light:
-        x = game_state.campfire_location()[0]
-        y = game_state.campfire_location()[1]
-        x1 = (x * 50) + 40
-        y1 = (y * 50) + 30
-        pygame.draw.circle(mask, (255, 255, 255, 0), (x1, y1), 100)
+        cell_x, cell_y = camera.grid_to_screen(*game_state.campfire_location())
+        lights.append(((cell_x - mask_x + 25, cell_y - mask_y + 15), CAMPFIRE_LIGHT_RADIUS))
 
-    mask.set_colorkey((255, 255, 255))
-    screen.blit(mask, (185, 85))
+    lights.extend(extra_lights)
+    light_mask.draw(screen, lights, camera.viewport.topleft)
 
 
-def display_messages(screen, msg_display, current_time, msg_start):
+@span('display_messages')
+def display_messages(screen, msg_display, current_time, msg_start) -> list[pygame.Rect]:
     """
-    Displays various game messages based on player actions.
+    Displays various game messages based on player actions and returns the areas drawn.
     """
+    drawn = []
     if msg_display == 'pick up' and current_time - msg_start <= 2500:
-        blah = steph_15.render('Item has been added to inventory!', True, WHITE)
-        screen.blit(blah, (700, 830))
+        blah = render_cached(assets.steph_15, 'Item has been added to inventory!', True, WHITE)
+        drawn.append(screen.blit(blah, (700, 830)))
     if msg_display == 'pick up error' and current_time - msg_start <= 2500:
-        blah = steph_15.render('There are no items to pick up here!', True, WHITE)
-        screen.blit(blah, (700, 830))
+        blah = render_cached(assets.steph_15, 'There are no items to pick up here!', True, WHITE)
+        drawn.append(screen.blit(blah, (700, 830)))
     if msg_display == 'interact error' and current_time - msg_start <= 2500:
-        blah = steph_15.render('There is nothing to interact with!', True, WHITE)
-        screen.blit(blah, (700, 830))
+        blah = render_cached(assets.steph_15, 'There is nothing to interact with!', True, WHITE)
+        drawn.append(screen.blit(blah, (700, 830)))
     if msg_display == 'key error' and current_time - msg_start <= 2500:
-        blah = steph_15.render('The chest is locked', True, WHITE)
-        screen.blit(blah, (700, 830))
+        blah = render_cached(assets.steph_15, 'The chest is locked', True, WHITE)
+        drawn.append(screen.blit(blah, (700, 830)))
     if msg_display == 'sign1' and current_time - msg_start <= 5000:
-        screen.blit(wooden_sign1, (300, 50))
+        drawn.append(screen.blit(assets.wooden_sign1, (300, 50)))
     if msg_display == 'sign2' and current_time - msg_start <= 5000:
-        screen.blit(wooden_sign2, (300, 50))
+        drawn.append(screen.blit(assets.wooden_sign2, (300, 50)))
     if msg_display == 'sign3' and current_time - msg_start <= 5000:
-        screen.blit(wooden_sign3, (300, 50))
+        drawn.append(screen.blit(assets.wooden_sign3, (300, 50)))
     if msg_display == 'chest opened' and current_time - msg_start <= 10000:
-        blah = steph_15.render('Chest is Opened!!', True, WHITE)
-        screen.blit(blah, (720, 830))
-        blah1 = steph_15.render('You have found the Hidden Treasure!!', True, WHITE)
-        screen.blit(blah1, (665, 850))
-        blah2 = steph_15.render('With the treasure is a Flare Gun', True, WHITE)
-        screen.blit(blah2, (685, 870))
-        blah3 = steph_15.render('Quickly Fire it at the Correct Location!', True, WHITE)
-        screen.blit(blah3, (675, 890))
+        blah = render_cached(assets.steph_15, 'Chest is Opened!!', True, WHITE)
+        drawn.append(screen.blit(blah, (720, 830)))
+        blah1 = render_cached(assets.steph_15, 'You have found the Hidden Treasure!!', True, WHITE)
+        drawn.append(screen.blit(blah1, (665, 850)))
+        blah2 = render_cached(assets.steph_15, 'With the treasure is a Flare Gun', True, WHITE)
+        drawn.append(screen.blit(blah2, (685, 870)))
+        blah3 = render_cached(assets.steph_15, 'Quickly Fire it at the Correct Location!', True, WHITE)
+        drawn.append(screen.blit(blah3, (675, 890)))
     if msg_display == 'return':
-        blah = steph_15.render('Are you sure', True, WHITE)
-        screen.blit(blah, (40, 150))
-        blah1 = steph_15.render('you want to leave?', True, WHITE)
-        screen.blit(blah1, (25, 165))
-        screen.blit(small_button_image, (5, 200))
-        yes_text = pixel_40.render('YES', True, WHITE)
-        screen.blit(yes_text, (50, 215))
-        screen.blit(small_button_image, (5, 280))
-        no_text = pixel_40.render('NO', True, WHITE)
-        screen.blit(no_text, (60, 295))
-
-
-def display_buttons(screen, game_state):
+        blah = render_cached(assets.steph_15, 'Are you sure', True, WHITE)
+        drawn.append(screen.blit(blah, (40, 150)))
+        blah1 = render_cached(assets.steph_15, 'you want to leave?', True, WHITE)
+        drawn.append(screen.blit(blah1, (25, 165)))
+        drawn.append(screen.blit(assets.small_button_image, (5, 200)))
+        yes_text = render_cached(assets.pixel_40, 'YES', True, WHITE)
+        drawn.append(screen.blit(yes_text, (50, 215)))
+        drawn.append(screen.blit(assets.small_button_image, (5, 280)))
+        no_text = render_cached(assets.pixel_40, 'NO', True, WHITE)
+        drawn.append(screen.blit(no_text, (60, 295)))
+    return drawn
+
+
+@span('display_buttons')
+def display_buttons(screen, game_state, enabled=None, show_help: bool = True) -> pygame.Rect:
     """
-    Displays in-game buttons for interaction.
+    Displays in-game buttons for interaction and returns the area of the dark mode help button. Buttons that
+    are disabled in the enabled mapping ('interact', 'pick up') get a gray label. The help button is hidden
+    while show_help is off, as it is while the help it gives lasts.
     """
-    screen.blit(small_button_image, (5, 5))
-    return_text = pixel_40.render('RETURN', True, WHITE)
+    enabled = enabled or {}
+    screen.blit(assets.small_button_image, (5, 5))
+    return_text = render_cached(assets.pixel_40, 'RETURN', True, WHITE)
     screen.blit(return_text, (24, 20))
 
-    screen.blit(game_button, (1350, 500))
-    interact_text = pixel_24.render('INTERACT', True, BLACK)
+    screen.blit(assets.game_button, (1350, 500))
+    interact_text = render_cached(assets.pixel_24, 'INTERACT', True, BLACK if enabled.get('interact', True) else GRAY)
     screen.blit(interact_text, (1370, 518))
 
-    screen.blit(game_button, (1350, 600))
-    pick_up_text = pixel_24.render('PICK UP', True, BLACK)
+    screen.blit(assets.game_button, (1350, 600))
+    pick_up_text = render_cached(assets.pixel_24, 'PICK UP', True, BLACK if enabled.get('pick up', True) else GRAY)
     screen.blit(pick_up_text, (1380, 618))
 
-    screen.blit(game_button, (1350, 700))
-    use_item_text = pixel_24.render('USE ITEM', True, BLACK)
+    screen.blit(assets.game_button, (1350, 700))
+    use_item_text = render_cached(assets.pixel_24, 'USE ITEM', True, BLACK)
     screen.blit(use_item_text, (1372, 718))
 
-    screen.blit(game_button, (1350, 800))
-    inventory_text = pixel_24.render('INVENTORY', True, BLACK)
+    screen.blit(assets.game_button, (1350, 800))
+    inventory_text = render_cached(assets.pixel_24, 'INVENTORY', True, BLACK)
     screen.blit(inventory_text, (1365, 818))
 
-    if game_state.is_dark_mode():
-        screen.blit(game_button, (1350, 200))
-        inventory_text = pixel_24.render('HELP', True, BLACK)
+    help_area = pygame.Rect(1350, 200, 0, 0)
+    if game_state.is_dark_mode() and show_help:
+        help_area = screen.blit(assets.game_button, (1350, 200))
+        inventory_text = render_cached(assets.pixel_24, 'HELP', True, BLACK)
         screen.blit(inventory_text, (1390, 218))
-        text1 = steph_15.render('This temporarily pauses', True, WHITE)
-        screen.blit(text1, (1350, 260))
-        text2 = steph_15.render('dark mode', True, WHITE)
-        screen.blit(text2, (1380, 280))
+        text1 = render_cached(assets.steph_15, 'This temporarily pauses', True, WHITE)
+        help_area.union_ip(screen.blit(text1, (1350, 260)))
+        text2 = render_cached(assets.steph_15, 'dark mode', True, WHITE)
+        help_area.union_ip(screen.blit(text2, (1380, 280)))
+    return help_area
 
 
-def display_time(timer, screen):
+@span('display_time')
+def display_time(timer, screen) -> pygame.Rect:
     """
-    Displays the elapsed time on the screen.
+    Displays the elapsed time on the screen and returns the area drawn.
     """
     elapsed_seconds = timer.get_time()
-    timer_text = pixel_30.render(f"Elapsed Time: {elapsed_seconds:.2f} seconds", True, WHITE)
-    screen.blit(timer_text, (200, 890))
+    timer_text = render_cached(assets.pixel_30, f"Elapsed Time: {elapsed_seconds:.2f} seconds", True, WHITE)
+    return screen.blit(timer_text, (200, 890))
 
 
-def display_hearts(player, screen):
+@span('display_hearts')
+def display_hearts(player, screen) -> pygame.Rect:
     """
-    Displays the player's health as heart icons.
+    Displays the player's health as heart icons and returns the area drawn.
     """
+    hearts_area = pygame.Rect(200, 830, 6 * 50 + assets.empty_heart.get_width(), assets.empty_heart.get_height())
     if player.health <= 2.0:
-        blah = steph_15.render('Your almost out of health!', True, RED)
-        screen.blit(blah, (200, 920))
+        blah = render_cached(assets.steph_15, 'Your almost out of health!', True, RED)
+        hearts_area.union_ip(screen.blit(blah, (200, 920)))
     for i in range(7):
         x = 200 + i * 50
-        screen.blit(empty_heart, (x, 830))
+        screen.blit(assets.empty_heart, (x, 830))
     if player.health >= 7:
         for i in range(7):
             x = 200 + i * 50
-            screen.blit(full_heart, (x, 830))
+            screen.blit(assets.full_heart, (x, 830))
     elif player.health >= 6.5:
         for i in range(6):
             x = 200 + i * 50
-            screen.blit(full_heart, (x, 830))
-        screen.blit(half_heart, (200 + 6 * 50, 830))
+            screen.blit(assets.full_heart, (x, 830))
+        screen.blit(assets.half_heart, (200 + 6 * 50, 830))
     elif player.health >= 6:
         for i in range(6):
             x = 200 + i * 50
-            screen.blit(full_heart, (x, 830))
+            screen.blit(assets.full_heart, (x, 830))
     elif player.health >= 5.5:
         for i in range(5):
             x = 200 + i * 50
-            screen.blit(full_heart, (x, 830))
-        screen.blit(half_heart, (200 + 5 * 50, 830))
+            screen.blit(assets.full_heart, (x, 830))
+        screen.blit(assets.half_heart, (200 + 5 * 50, 830))
     elif player.health >= 5:
         for i in range(5):
             x = 200 + i * 50
-            screen.blit(full_heart, (x, 830))
+            screen.blit(assets.full_heart, (x, 830))
     elif player.health >= 4.5:
         for i in range(4):
             x = 200 + i * 50
-            screen.blit(full_heart, (x, 830))
-        screen.blit(half_heart, (200 + 4 * 50, 830))
+            screen.blit(assets.full_heart, (x, 830))
+        screen.blit(assets.half_heart, (200 + 4 * 50, 830))
     elif player.health >= 4:
         for i in range(4):
             x = 200 + i * 50
-            screen.blit(full_heart, (x, 830))
+            screen.blit(assets.full_heart, (x, 830))
     elif player.health >= 3.5:
         for i in range(3):
             x = 200 + i * 50
-            screen.blit(full_heart, (x, 830))
-        screen.blit(half_heart, (200 + 3 * 50, 830))
+            screen.blit(assets.full_heart, (x, 830))
+        screen.blit(assets.half_heart, (200 + 3 * 50, 830))
     elif player.health >= 3:
         for i in range(3):
             x = 200 + i * 50
-            screen.blit(full_heart, (x, 830))
+            screen.blit(assets.full_heart, (x, 830))
     elif player.health >= 2.5:
         for i in range(2):
             x = 200 + i * 50
-            screen.blit(full_heart, (x, 830))
-        screen.blit(half_heart, (200 + 2 * 50, 830))
+            screen.blit(assets.full_heart, (x, 830))
+        screen.blit(assets.half_heart, (200 + 2 * 50, 830))
     elif player.health >= 2:
         for i in range(2):
             x = 200 + i * 50
-            screen.blit(full_heart, (x, 830))
+            screen.blit(assets.full_heart, (x, 830))
     elif player.health >= 1.5:
         x = 200
-        screen.blit(full_heart, (x, 830))
-        screen.blit(half_heart, (x + 50, 830))
+        screen.blit(assets.full_heart, (x, 830))
+        screen.blit(assets.half_heart, (x + 50, 830))
     elif player.health >= 1:
         x = 200
-        screen.blit(full_heart, (x, 830))
+        screen.blit(assets.full_heart, (x, 830))
     elif player.health >= 0.5:
         x = 200
-        screen.blit(half_heart, (x, 830))
+        screen.blit(assets.half_heart, (x, 830))
+    return hearts_area
+
+
+def display_profiler(screen, statistics) -> pygame.Rect:
+    """
+    Displays the rolling mean, 95th percentile and maximum milliseconds of every span of the profiler over the
+    top left of the map, and returns the area drawn. The numbers change every frame, so they are not cached.
+    """
+    rows = [('span', 'mean', 'p95', 'max ms')]
+    rows.extend((name, f'{values["mean"]:.3f}', f'{values["p95"]:.3f}', f'{values["max"]:.3f}')
+                for name, values in statistics.items())
+    line_height = assets.steph_15.get_linesize()
+    area = pygame.Rect(MAP_ORIGIN[0], MAP_ORIGIN[1], 420, line_height * len(rows) + 10)
+    panel = pygame.Surface(area.size, pygame.SRCALPHA)
+    panel.fill((0, 0, 0, 180))
+    screen.blit(panel, area)
+    for index, row in enumerate(rows):
+        for column, text in zip((5, 210, 280, 350), row):
+            screen.blit(assets.steph_15.render(text, True, WHITE), (area.x + column, area.y + 5 + index * line_height))
+    return area
 
 
 def interact_checker(player, game_state) -> str:
     """
-    Checks the player's current grid code for interactions.
+    Checks the player's current grid cell for interactions.
     """
-    if player.get_player_grid_code(game_state) not in {4, 6, 7, 8}:
-        return 'Error'
-    elif player.get_player_grid_code(game_state) == 4:
-        return 'Chest'
-    elif player.get_player_grid_code(game_state) == 6:
-        return 'sign1'
-    elif player.get_player_grid_code(game_state) == 7:
-        return 'sign2'
-    elif player.get_player_grid_code(game_state) == 8:
-        return 'sign3'
+    return get_triggers(game_state).interaction(player.get_player_grid_location())
 
 
 def display_fruit_message(screen, window_size):
     """
     Displays a message when the player eats a fruit.
     """
-    blah = steph_24.render('You ate the fruit!!', True, WHITE)
+    blah = render_cached(assets.steph_24, 'You ate the fruit!!', True, WHITE)
     screen.blit(blah, (window_size[0] // 2 - 100, 290))
-    blah0 = steph_24.render('You have gained two additional hearts!!', True, WHITE)
+    blah0 = render_cached(assets.steph_24, 'You have gained two additional hearts!!', True, WHITE)
     screen.blit(blah0, (window_size[0] // 2 - 200, 320))
-    blah1 = steph_24.render('The item has been removed from your inventory', True, WHITE)
+    blah1 = render_cached(assets.steph_24, 'The item has been removed from your inventory', True, WHITE)
     screen.blit(blah1, (window_size[0] // 2 - 220, 350))
 
 
@@ -876,7 +891,7 @@ def display_error_message(screen, window_size):
     """
     Displays an error message for invalid actions.
     """
-    blah = steph_24.render('You are not in a valid location', True, WHITE)
+    blah = render_cached(assets.steph_24, 'You are not in a valid location', True, WHITE)
     screen.blit(blah, (window_size[0] // 2 - 100, 290))
 
 
@@ -884,11 +899,11 @@ def display_campfire_message(screen, window_size):
     """
     Displays a message when the player places a campfire.
     """
-    blah = steph_24.render('You have placed a campfire down!', True, WHITE)
+    blah = render_cached(assets.steph_24, 'You have placed a campfire down!', True, WHITE)
     screen.blit(blah, (window_size[0] // 2 - 150, 290))
-    blah0 = steph_24.render('Heal yourself by staying on the campfire', True, WHITE)
+    blah0 = render_cached(assets.steph_24, 'Heal yourself by staying on the campfire', True, WHITE)
     screen.blit(blah0, (window_size[0] // 2 - 195, 320))
-    blah1 = steph_24.render('The item has been removed from your inventory', True, WHITE)
+    blah1 = render_cached(assets.steph_24, 'The item has been removed from your inventory', True, WHITE)
     screen.blit(blah1, (window_size[0] // 2 - 220, 350))
 
 
@@ -896,146 +911,233 @@ def display_items(screen, start_x, window_size, inventory):
     """
     Displays items from the player's inventory on the screen.
     """
-    resize_pear = pygame.transform.scale(pear_fruit_image, (55, 55))
-    resize_apple = pygame.transform.scale(apple_fruit_image, (55, 55))
-    resize_orange = pygame.transform.scale(orange_fruit_image, (55, 55))
-    resize_campfire = pygame.transform.scale(campfire_image, (70, 70))
-    resize_flaregun = pygame.transform.scale(flaregun_image, (70, 70))
     y = window_size[1] // 2
     for col in range(5):
         x = start_x + col * 135
-        screen.blit(item_frame, (x, y))
-        if 'Pear' in inventory:
-            screen.blit(resize_pear, (460, window_size[1] // 2 + 50))
-        if 'Apple' in inventory:
-            screen.blit(resize_apple, (590, window_size[1] // 2 + 50))
-        if 'Orange' in inventory:
-            screen.blit(resize_orange, (725, window_size[1] // 2 + 50))
-        if 'Campfire' in inventory:
-            screen.blit(resize_campfire, (852, window_size[1] // 2 + 47))
-        if 'FlareGun' in inventory:
-            screen.blit(resize_flaregun, (990, window_size[1] // 2 + 47))
+        screen.blit(assets.item_frame, (x, y))
 
+    if 'Pear' in inventory:
+        screen.blit(get_item_image('Pear', (55, 55)), (460, window_size[1] // 2 + 50))
+    if 'Apple' in inventory:
+        screen.blit(get_item_image('Apple', (55, 55)), (590, window_size[1] // 2 + 50))
+    if 'Orange' in inventory:
+        screen.blit(get_item_image('Orange', (55, 55)), (725, window_size[1] // 2 + 50))
+    if 'Campfire' in inventory:
+        screen.blit(get_item_image('Campfire', (70, 70)), (852, window_size[1] // 2 + 47))
+    if 'FlareGun' in inventory:
+        screen.blit(get_item_image('FlareGun', (70, 70)), (990, window_size[1] // 2 + 47))
 
-def get_item_image(item_name) -> pygame.Surface:
+
+def get_item_image(item_name, size=None) -> pygame.Surface:
     """
-    Returns the image associated with an item name.
+    Returns the image associated with an item name, scaled to the given size through the sprite registry.
     """
     item_name = item_name.strip().lower()
+    item_image = None
     if item_name == "apple":
-        return apple_fruit_image
+        item_image = assets.apple_fruit_image
     elif item_name == "orange":
-        return orange_fruit_image
+        item_image = assets.orange_fruit_image
     elif item_name == "pear":
-        return pear_fruit_image
+        item_image = assets.pear_fruit_image
     elif item_name == "matchbox":
-        return matchbox_image
+        item_image = assets.matchbox_image
     elif item_name == "logs":
-        return logs_image
+        item_image = assets.logs_image
     elif item_name == "rock":
-        return rock_image
+        item_image = assets.rock_image
     elif item_name == "blue key":
-        return blue_key_image
+        item_image = assets.blue_key_image
     elif item_name == "gold key":
-        return gold_key_image
+        item_image = assets.gold_key_image
     elif item_name == "copper key":
-        return copper_key_image
+        item_image = assets.copper_key_image
     elif item_name == "wood key":
-        return wood_key_image
+        item_image = assets.wood_key_image
     elif item_name == "campfire":
-        return campfire_image
+        item_image = assets.campfire_image
     elif item_name == "flaregun":
-        return flaregun_image
+        item_image = assets.flaregun_image
     elif item_name == "jewelbag":
-        return jewel_bag
+        item_image = assets.jewel_bag
+
+    if item_image is not None and size is not None:
+        return scaled_sprite(item_image, size)
+    return item_image
 
 
 def campfire_valid_loc(value) -> bool:
     """
     Checks if a location is valid for placing a campfire.
     """
-    if value not in {2, 3, 4, 5, 6, 7, 8, 11, 10, 11, 12, 13, 14, 15, 16}:
+    if value not in CAMPFIRE_BLOCKED_TILES:
         return True
     else:
         return False
 
 
-def display_map(player, screen, game_state):
-    """
-    Displays the game map and items on the screen.
-    """
-
-    pygame.draw.rect(screen, BLACK, (185, 85, 1130, 730), 15)
-    grid_x, grid_y = 20, 12
-    tile_width, tile_height = 50, 50
-
-    grid_start_x = 250
-    grid_start_y = 150
-
-    for row in range(-1, grid_y + 1):
-        for col in range(-1, grid_x + 1):
-            tile_x = grid_start_x + col * tile_width
-            tile_y = grid_start_y + row * tile_height
-            screen.blit(grass_tile_image, (tile_x, tile_y))
-
-    map_name = game_state.current_map()
-    map_file_path = f'{map_name}'
-    with open(map_file_path, 'r') as map_file:
-        game_map = load_map(map_file)
-
-        for y, row in enumerate(game_map):
-            for x, tile in enumerate(row):
-                if tile == 0:
-                    screen.blit(individual_tree_image, ((x * tile_width) + 202, (y * tile_height) + 102))
-                elif tile == 2:
-                    screen.blit(water_tile_image, ((x * tile_width) + 200, (y * tile_height) + 100))
-                elif tile == 4:
-                    screen.blit(chest_image, ((x * tile_width) + 205, (y * tile_height) + 105))
-                elif tile == 5:
-                    screen.blit(bridge_tile_image, ((x * tile_width) + 200, (y * tile_height) + 100))
-                elif tile in {6, 7, 8}:
-                    screen.blit(sign_tile_image, ((x * tile_width) + 200, (y * tile_height) + 100))
-                elif tile == 10:
-                    screen.blit(flower_grass_tile_image, ((x * tile_width) + 200, (y * tile_height) + 100))
-                elif tile == 11:
-                    screen.blit(red_bushes_image, ((x * tile_width) + 205, (y * tile_height) + 103))
-                elif tile == 12:
-                    screen.blit(white_bushes_image, ((x * tile_width) + 205, (y * tile_height) + 103))
-                elif tile == 13:
-                    screen.blit(purple_bushes_image, ((x * tile_width) + 205, (y * tile_height) + 103))
-                elif tile == 14:
-                    screen.blit(blue_bushes_image, ((x * tile_width) + 205, (y * tile_height) + 103))
-                elif tile == 15:
-                    screen.blit(tulips_image, ((x * tile_width) + 205, (y * tile_height) + 103))
-                elif tile == 16:
-                    screen.blit(ground_vern_image, ((x * tile_width) + 205, (y * tile_height) + 103))
-                elif tile == 20:
-                    screen.blit(pathway_hori_image, ((x * tile_width) + 195, (y * tile_height) + 100))
-                elif tile == 21:
-                    screen.blit(pathway_vert_image, ((x * tile_width) + 200, (y * tile_height) + 95))
-                elif tile == 22:
-                    screen.blit(l_curve_image, ((x * tile_width) + 202, (y * tile_height) + 100))
-                elif tile == 23:
-                    screen.blit(inverse_l_image, ((x * tile_width) + 200, (y * tile_height) + 100))
-                elif tile == 24:
-                    screen.blit(up_left_l_image, ((x * tile_width) + 200, (y * tile_height) + 100))
-                elif tile == 25:
-                    screen.blit(up_right_l_image, ((x * tile_width) + 200, (y * tile_height) + 100))
-                elif tile == 26:
-                    screen.blit(t_path_image, ((x * tile_width) + 200, (y * tile_height) + 100))
-                elif tile == 27:
-                    screen.blit(all_path_image, ((x * tile_width) + 200, (y * tile_height) + 100))
-                elif tile == 28:
-                    screen.blit(upside_down_t_image, ((x * tile_width) + 200, (y * tile_height) + 100))
-                elif tile == 29:
-                    screen.blit(right_t_image, ((x * tile_width) + 200, (y * tile_height) + 100))
-
-        screen.blit(hill_tile_image, (1100, 110))
-        for location, item in game_state.items.items():
-            item_image = get_item_image(item.name)
-            x, y = location
-            screen_x = 210 + (x * 50)
-            screen_y = 110 + (y * 50)
-            screen.blit(item_image, (screen_x, screen_y))
-
-        screen.blit(player.current_image, (player.player_x, player.player_y))
+def get_map_tile_sprites() -> dict:
+    """
+    Returns the image and pixel offset used to draw every map tile code.
+    """
+    return {
+        0: (assets.individual_tree_image, 2, 2),
+        2: (assets.water_tile_image, 0, 0),
+        4: (assets.chest_image, 5, 5),
+        5: (assets.bridge_tile_image, 0, 0),
+        6: (assets.sign_tile_image, 0, 0),
+        7: (assets.sign_tile_image, 0, 0),
+        8: (assets.sign_tile_image, 0, 0),
+        10: (assets.flower_grass_tile_image, 0, 0),
+        11: (assets.red_bushes_image, 5, 3),
+        12: (assets.white_bushes_image, 5, 3),
+        13: (assets.purple_bushes_image, 5, 3),
+        14: (assets.blue_bushes_image, 5, 3),
+        15: (assets.tulips_image, 5, 3),
+        16: (assets.ground_vern_image, 5, 3),
+        20: (assets.pathway_hori_image, -5, 0),
+        21: (assets.pathway_vert_image, 0, -5),
+        22: (assets.l_curve_image, 2, 0),
+        23: (assets.inverse_l_image, 0, 0),
+        24: (assets.up_left_l_image, 0, 0),
+        25: (assets.up_right_l_image, 0, 0),
+        26: (assets.t_path_image, 0, 0),
+        27: (assets.all_path_image, 0, 0),
+        28: (assets.upside_down_t_image, 0, 0),
+        29: (assets.right_t_image, 0, 0)
+    }
+
+
+def get_grass_background(width, height) -> pygame.Surface:
+    """
+    Returns an opaque surface of at least width x height pixels tiled with grass, one tile larger than asked
+    in both directions so any tile alignment can be cut out of it.
+    """
+    global grass_background
+    if (grass_background is None or grass_background.get_width() < width + TILE_SIZE
+            or grass_background.get_height() < height + TILE_SIZE):
+        grass_background = pygame.Surface((width + TILE_SIZE, height + TILE_SIZE)).convert()
+        for y in range(0, height + TILE_SIZE, TILE_SIZE):
+            for x in range(0, width + TILE_SIZE, TILE_SIZE):
+                grass_background.blit(assets.grass_tile_image, (x, y))
+    return grass_background
+
+
+def draw_map_tiles(surface, game_map, area, dirty=None):
+    """
+    Draws the grass, the map tiles and the hills of a world area of the map onto a surface whose top-left
+    corner shows the top-left corner of the area. Only the part of the area inside the world rect dirty is
+    drawn, the whole area by default, and only the cells in it or whose images reach into it are visited.
+    """
+    dirty = area if dirty is None else dirty.clip(area)
+    offset_x, offset_y = MAP_ORIGIN[0] - area.left, MAP_ORIGIN[1] - area.top
+    target = dirty.move(-area.left, -area.top)
+    clip = surface.get_clip()
+    surface.set_clip(target)
+
+    phase_x, phase_y = (dirty.left - MAP_ORIGIN[0]) % TILE_SIZE, (dirty.top - MAP_ORIGIN[1]) % TILE_SIZE
+    surface.blit(get_grass_background(*dirty.size), target, (phase_x, phase_y, *dirty.size))
+
+    tile_sprites = get_map_tile_sprites()
+    hill_image = assets.hill_tile_image
+    reach_x = -(-hill_image.get_width() // TILE_SIZE)
+    reach_y = -(-(hill_image.get_height() + HILL_OFFSET[1]) // TILE_SIZE)
+    left, top = world_to_grid(dirty.left, dirty.top)
+    right, bottom = world_to_grid(dirty.right - 1, dirty.bottom - 1)
+
+    hills = []
+    width, height, tiles = game_map.width, game_map.height, game_map.tiles
+    for y in range(max(top - reach_y, 0), min(bottom + 1, height - 1) + 1):
+        for x in range(max(left - reach_x, 0), min(right + 1, width - 1) + 1):
+            tile = tiles[y * width + x]
+            if tile in tile_sprites and left - 1 <= x and top - 1 <= y:
+                image, dx, dy = tile_sprites[tile]
+                surface.blit(image, (x * TILE_SIZE + dx + offset_x, y * TILE_SIZE + dy + offset_y))
+            elif (tile == HILL_TILE and (x == 0 or tiles[y * width + x - 1] != HILL_TILE)
+                  and (y == 0 or tiles[(y - 1) * width + x] != HILL_TILE)):
+                hills.append((x, y))
+
+    for x, y in hills:
+        surface.blit(hill_image, (x * TILE_SIZE + HILL_OFFSET[0] + offset_x, y * TILE_SIZE + HILL_OFFSET[1] + offset_y))
+    surface.set_clip(clip)
+
+
+@span('build_map_layer')
+def build_map_layer(game_state, area) -> pygame.Surface:
+    """
+    Draws the static part of a world area of the current map once into an off-screen surface.
+    """
+    layer = pygame.Surface(area.size).convert()
+    draw_map_tiles(layer, load_game_map(game_state), area)
+    return layer
+
+
+def exposed_areas(area, previous) -> list[pygame.Rect]:
+    """
+    Returns the parts of a world area outside a previous world area that overlaps it, as at most four rects.
+    """
+    exposed = []
+    if area.top < previous.top:
+        exposed.append(pygame.Rect(area.left, area.top, area.width, previous.top - area.top))
+    if area.bottom > previous.bottom:
+        exposed.append(pygame.Rect(area.left, previous.bottom, area.width, area.bottom - previous.bottom))
+    top, bottom = max(area.top, previous.top), min(area.bottom, previous.bottom)
+    if area.left < previous.left:
+        exposed.append(pygame.Rect(area.left, top, previous.left - area.left, bottom - top))
+    if area.right > previous.right:
+        exposed.append(pygame.Rect(previous.right, top, area.right - previous.right, bottom - top))
+    return exposed
+
+
+def get_map_layer(game_state) -> tuple[pygame.Surface, pygame.Rect]:
+    """
+    Returns the cached static map layer and the world area it shows. The layer covers the camera's view and
+    LAYER_MARGIN cells around it. It is rebuilt when the map changes. When the view scrolls out of it, the part
+    still in the new area is moved within the layer and only the newly exposed strips are drawn.
+    """
+    view = game_state.camera.world_view()
+    area = view.inflate(2 * LAYER_MARGIN * TILE_SIZE, 2 * LAYER_MARGIN * TILE_SIZE)
+    previous = game_state.map_layer_area
+    if (game_state.map_layer is None or game_state.map_layer_name != game_state.current_map()
+            or previous.size != area.size or not previous.colliderect(area)):
+        game_state.map_layer = build_map_layer(game_state, area)
+        game_state.map_layer_area = area
+        game_state.map_layer_name = game_state.current_map()
+    elif not previous.contains(view):
+        game_state.map_layer.scroll(previous.left - area.left, previous.top - area.top)
+        for exposed in exposed_areas(area, previous):
+            draw_map_tiles(game_state.map_layer, load_game_map(game_state), area, exposed)
+        game_state.map_layer_area = area
+    return game_state.map_layer, game_state.map_layer_area
+
+
+@span('display_map')
+def display_map(player, screen, game_state, alpha=1.0) -> list[pygame.Rect]:
+    """
+    Scrolls the camera to the player, displays the part of the game map in view with the items on it and
+    returns the areas of the items and player. The player is drawn alpha of the way through its last
+    simulation step.
+    """
+    camera = game_state.camera
+    game_map = load_game_map(game_state)
+    render_x, render_y = player.render_position(alpha)
+    camera.follow(render_x + PLAYER_FOOT[0], render_y + PLAYER_FOOT[1], game_map.width, game_map.height)
+
+    layer, area = get_map_layer(game_state)
+    view = camera.world_view()
+    screen.blit(layer, camera.view, view.move(-area.left, -area.top))
+    pygame.draw.rect(screen, BLACK, camera.viewport, BORDER_WIDTH)
+
+    drawn = []
+    clip = screen.get_clip()
+    screen.set_clip(camera.view)
+    left, top, right, bottom = camera.visible_cells()
+    for location, item in game_state.items.items():
+        x, y = location
+        if left <= x <= right and top <= y <= bottom:
+            screen_x, screen_y = camera.grid_to_screen(x, y)
+            drawn.append(screen.blit(get_item_image(item.name), (screen_x + 10, screen_y + 10)))
+
+    drawn.append(screen.blit(player.current_image, camera.to_screen(render_x, render_y)))
+    screen.set_clip(clip)
+    return drawn
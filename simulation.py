@@ -0,0 +1,404 @@
+"""
+This module runs the rules of the game without a display or audio: walking, health decay, campfire healing,
+eating fruit, crafting, opening the chest and firing the flare gun.
+
+A Simulation reads the time from a clock it is given instead of pygame.time.get_ticks, and the clock only
+advances with the simulation, one SIMULATION_STEP at a time, so a game runs the same at any speed. The game
+screens are a shell around a Simulation: they turn clicks and keys into its actions and play the sounds and
+draw the messages for what each action returns. Scripts of actions run a game without them, at machine speed:
+the steps in which nothing happens but time passing, or the player walking on, are run in one go.
+
+Functions:
+- get_health_decrement: Returns the health decrement interval based on the game difficulty.
+- key_state: Returns the held movement keys for a set of directions, indexed like pygame.key.get_pressed.
+- new_game: Starts a headless game on a map.
+- run_script: Runs a script of actions and returns what each one did.
+
+Classes:
+- StepClock: A clock that advances one simulation step at a time.
+- Simulation: The rules of one game.
+"""
+from data import *
+
+# Milliseconds between two health losses for each difficulty
+HEALTH_DECREMENT_INTERVALS = {'easy': 35000, 'medium': 25000, 'hard': 20000}
+CAMPFIRE_DURATION = 15000
+MAX_HEALTH = 7
+FRUIT_HEALTH = 2
+FRUITS = ['Pear', 'Apple', 'Orange']
+CHEST_KEYS = ['Wood Key', 'Gold Key', 'Blue Key', 'Copper Key']
+CAMPFIRE_MATERIALS = ['Matchbox', 'Logs', 'Rock']
+
+# A player without images, for games without a display
+HEADLESS_IMAGES = {direction: [None] for direction in ('down', 'up', 'left', 'right', 'dead')}
+
+
+def get_health_decrement(game_state) -> int:
+    """
+    Returns the health decrement interval based on the game difficulty.
+    """
+    if game_state.current_difficulty() not in HEALTH_DECREMENT_INTERVALS:
+        raise ValueError
+    return HEALTH_DECREMENT_INTERVALS[game_state.current_difficulty()]
+
+
+def key_state(directions=()) -> dict[int, bool]:
+    """
+    Returns the movement keys held for a set of directions ('up', 'down', 'left', 'right'), indexed by key code
+    like pygame.key.get_pressed.
+    """
+    return {key: direction in directions for *keys, direction, _, _ in MOVEMENT_KEYS for key in keys}
+
+
+class StepClock:
+    """
+    A clock that advances one simulation step at a time, read in milliseconds like pygame.time.get_ticks.
+
+    Instance Attributes:
+    - step: the seconds one step takes
+    - steps: the number of steps taken
+    """
+    step: float
+    steps: int
+
+    def __init__(self, step: float = SIMULATION_STEP) -> None:
+        self.step = step
+        self.steps = 0
+
+    def now(self) -> float:
+        """
+        Return the milliseconds the clock has advanced.
+        """
+        return self.steps * self.step * 1000
+
+    def advance(self, steps: int = 1):
+        """
+        Advance the clock by a number of steps.
+        """
+        self.steps += steps
+
+
+class Simulation:
+    """
+    The rules of one game, stepped SIMULATION_STEP seconds at a time.
+
+    Instance Attributes:
+    - game_state: the settings, items, statistics and campfire of the game
+    - player: the player's position, inventory and health
+    - game_map: the map the game is played on
+    - clock: the clock the rules read the time from, advanced by every step
+    - health_decrement_interval: the milliseconds between two health losses
+    - last_health_update_time: when the player last lost health
+    - campfire_start: when the campfire was placed
+    - recorder: what the steps and actions are recorded to (see replay.py), or None
+    """
+    game_state: GameState
+    player: Player
+    game_map: MapGrid
+    clock: StepClock
+    health_decrement_interval: int
+    last_health_update_time: float
+    campfire_start: float
+    recorder: object
+
+    def __init__(self, game_state: GameState, player: Player, clock: StepClock = None) -> None:
+        self.game_state = game_state
+        self.player = player
+        self.game_map = load_game_map(game_state)
+        self.clock = clock if clock is not None else StepClock()
+        self.health_decrement_interval = get_health_decrement(game_state)
+        self.last_health_update_time = self.clock.now()
+        self.campfire_start = None
+        self.recorder = None
+
+    @property
+    def won(self) -> bool:
+        """
+        Whether the flare gun has been fired.
+        """
+        return self.game_state.check_end()
+
+    @property
+    def lost(self) -> bool:
+        """
+        Whether the player has run out of health.
+        """
+        return self.player.health < 0.5
+
+    @property
+    def over(self) -> bool:
+        """
+        Whether the game has been won or lost.
+        """
+        return self.won or self.lost
+
+    def healing(self) -> bool:
+        """
+        Return whether the player stands at a burning campfire and can gain health.
+        """
+        return (self.game_state.is_campfire() and self.player.health <= MAX_HEALTH
+                and self.player.get_player_grid_location() == self.game_state.campfire_location())
+
+    @span('Simulation.step')
+    def step(self, keys=None):
+        """
+        Advance the game by one step: walk with the keys held, heal at the campfire, put the campfire out once
+        it has burnt for CAMPFIRE_DURATION and take health away every health decrement interval.
+        """
+        self.clock.advance()
+        now = self.clock.now()
+        self.player.save_position()
+        if not self.over:
+            self.player.handle_movement(self.game_map, SIMULATION_STEP, keys if keys is not None else key_state(),
+                                        now)
+        if self.game_state.is_campfire():
+            if now - self.campfire_start >= CAMPFIRE_DURATION:
+                self.game_state.toggle_campfire()
+            elif self.healing():
+                self.player.health += CAMPFIRE_HEAL_RATE * SIMULATION_STEP
+                self.game_state.health_gained_adder(CAMPFIRE_HEAL_RATE * SIMULATION_STEP)
+        if not self.over and now - self.last_health_update_time > self.health_decrement_interval:
+            self.player.health -= 0.5
+            self.game_state.health_lost_adder()
+            self.last_health_update_time = now
+        if self.recorder is not None:
+            self.recorder.record_steps(keys if keys is not None else key_state(), 1)
+
+    def quiet_steps(self) -> int:
+        """
+        Return how many of the next steps only pass time, while no keys are held: steps before the next health
+        loss or the campfire going out, while the player isn't healing.
+        """
+        if self.healing():
+            return 0
+        events = [self.last_health_update_time + self.health_decrement_interval]
+        if self.game_state.is_campfire():
+            events.append(self.campfire_start + CAMPFIRE_DURATION)
+        return max(int((min(events) - self.clock.now()) / (self.clock.step * 1000)) - 2, 0)
+
+    def run(self, steps: int, directions=()) -> int:
+        """
+        Advance the game by a number of steps with the same directions held, or until it is over. Returns the
+        number of steps taken. The quiet steps before the next health loss are run in one go: skipped while no
+        keys are held, or walked with a single sweep while the campfire isn't burning.
+        """
+        keys = key_state(directions)
+        taken = 0
+        while taken < steps and not self.over:
+            quiet = min(self.quiet_steps(), steps - taken - 1)
+            if quiet > 0 and not directions:
+                self.clock.advance(quiet)
+                self.player.save_position()
+                taken += quiet
+            elif quiet > 0 and not self.game_state.is_campfire():
+                times = []
+                for _ in range(quiet):
+                    self.clock.advance()
+                    times.append(self.clock.now())
+                self.player.walk(self.game_map, SIMULATION_STEP, keys, times)
+                taken += quiet
+            else:
+                quiet = 0
+            if quiet and self.recorder is not None:
+                self.recorder.record_steps(keys, quiet)
+            self.step(keys)
+            taken += 1
+        return taken
+
+    def record(self, *action):
+        """
+        Record an action with its arguments, if the game is being recorded.
+        """
+        if self.recorder is not None:
+            self.recorder.record_action(*action)
+
+    def ask_for_help(self):
+        """
+        Count a use of the help button, which lifts the darkness for a moment.
+        """
+        self.record('ask_for_help')
+        self.game_state.help_tracker += 1
+
+    def pick_up(self) -> str:
+        """
+        Pick up the item on the player's cell. Returns 'pick up', or 'pick up error' if there is none.
+        """
+        self.record('pick_up')
+        player_cell = tuple(self.player.get_player_grid_location())
+        if not get_triggers(self.game_state).can_pick_up(player_cell):
+            return 'pick up error'
+        item = self.game_state.items[player_cell]
+        self.game_state.remove_item(player_cell)
+        self.player.item_to_inventory(item)
+        return 'pick up'
+
+    def interact(self) -> str:
+        """
+        Read the sign or open the chest on the player's cell. Returns the sign read, 'chest opened', 'key error'
+        if a key is missing or 'interact error' if there is nothing to interact with.
+        """
+        self.record('interact')
+        interaction = get_triggers(self.game_state).interaction(self.player.get_player_grid_location())
+        if interaction == 'Error':
+            return 'interact error'
+        if interaction != 'Chest':
+            return interaction
+        if not all(key in self.player.inventory for key in CHEST_KEYS):
+            return 'key error'
+        for key in CHEST_KEYS:
+            self.player.remove_item_from_inventory(key)
+        self.player.inventory['FlareGun'] = 'Your only escape! Find the perfect place to fire!'
+        self.player.inventory['JewelBag'] = 'The Hidden Treasure Worth Millions!!'
+        return 'chest opened'
+
+    def craft_campfire(self) -> bool:
+        """
+        Craft a campfire from the matchbox, logs and rock. Returns whether the player had all three.
+        """
+        self.record('craft_campfire')
+        if not all(material in self.player.inventory for material in CAMPFIRE_MATERIALS):
+            return False
+        for material in CAMPFIRE_MATERIALS:
+            self.player.remove_item_from_inventory(material)
+        self.player.inventory['Campfire'] = 'Heating Mechanism: Allows you to regain health'
+        return True
+
+    def eat(self, fruit: str) -> str:
+        """
+        Eat a fruit for FRUIT_HEALTH health, up to MAX_HEALTH. Returns 'fruit', or None if the player has none.
+        """
+        if fruit not in FRUITS:
+            return None
+        self.record('eat', fruit)
+        if fruit not in self.player.inventory:
+            return None
+        self.player.remove_item_from_inventory(fruit)
+        if self.player.health >= MAX_HEALTH - FRUIT_HEALTH:
+            self.game_state.health_gained_adder(MAX_HEALTH - self.player.health)
+            self.player.health = MAX_HEALTH
+        else:
+            self.game_state.health_gained_adder(FRUIT_HEALTH)
+            self.player.health += FRUIT_HEALTH
+        return 'fruit'
+
+    def place_campfire(self) -> str:
+        """
+        Place and light the campfire on the player's cell. Returns 'campfire', or 'error' if it can't be placed
+        there.
+        """
+        self.record('place_campfire')
+        if ('Campfire' not in self.player.inventory
+                or not get_triggers(self.game_state).can_place_campfire(self.player.get_player_grid_location())):
+            return 'error'
+        self.player.remove_item_from_inventory('Campfire')
+        self.game_state.set_campfire_location(self.player)
+        self.game_state.toggle_campfire()
+        self.campfire_start = self.clock.now()
+        return 'campfire'
+
+    def fire_flare(self) -> str:
+        """
+        Fire the flare gun from the player's cell, which wins the game. Returns 'win', or 'error1' if it can't
+        be fired there.
+        """
+        self.record('fire_flare')
+        if ('FlareGun' not in self.player.inventory
+                or not get_triggers(self.game_state).can_fire_flare(self.player.get_player_grid_location())):
+            return 'error1'
+        self.player.remove_item_from_inventory('FlareGun')
+        self.game_state.end_game()
+        if self.game_state.is_dark_mode():
+            self.game_state.toggle_dark_mode()
+        return 'win'
+
+    def perform(self, action):
+        """
+        Perform one scripted action and return what it did. An action is a tuple of a name and its arguments:
+        ('walk', direction, seconds), ('wait', seconds), ('pick_up',), ('interact',), ('craft',),
+        ('eat', fruit), ('place_campfire',), ('fire_flare',) or ('ask_for_help',).
+        """
+        name, *arguments = action
+        if name == 'walk':
+            direction, seconds = arguments
+            return self.run(round(seconds / self.clock.step), {direction})
+        if name == 'wait':
+            return self.run(round(arguments[0] / self.clock.step))
+        actions = {'pick_up': self.pick_up, 'interact': self.interact, 'craft': self.craft_campfire,
+                   'eat': self.eat, 'place_campfire': self.place_campfire, 'fire_flare': self.fire_flare,
+                   'ask_for_help': self.ask_for_help}
+        if name not in actions:
+            raise ValueError(f'unknown action {name!r}')
+        return actions[name](*arguments)
+
+    def snapshot(self) -> dict:
+        """
+        Return the state of the game as plain data, which restore can go back to.
+        """
+        player, game_state = self.player, self.game_state
+        return {
+            'steps': self.clock.steps, 'last health update': self.last_health_update_time,
+            'campfire start': self.campfire_start, 'interval': self.health_decrement_interval,
+            'player': {'position': [player.player_x, player.player_y],
+                       'previous': [player.previous_x, player.previous_y], 'remainder': player.move_remainder,
+                       'direction': player.direction, 'frame': player.frame_index, 'last update': player.last_update,
+                       'health': player.health, 'inventory': dict(player.inventory)},
+            'game state': {'dark mode': game_state.dark_mode, 'campfire': game_state.campfire, 'end': game_state.end,
+                           'campfire locations': [list(cell) for cell in game_state.campfire_locations],
+                           'statistics': dict(game_state.statistics), 'help tracker': game_state.help_tracker,
+                           'items': [[x, y, item.name, item.descr_one] for (x, y), item in game_state.items.items()]},
+        }
+
+    def restore(self, snapshot: dict):
+        """
+        Go back to the state of the game in a snapshot.
+        """
+        player, game_state = self.player, self.game_state
+        self.clock.steps = snapshot['steps']
+        self.last_health_update_time = snapshot['last health update']
+        self.campfire_start = snapshot['campfire start']
+        self.health_decrement_interval = snapshot['interval']
+
+        saved = snapshot['player']
+        player.player_x, player.player_y = saved['position']
+        player.previous_x, player.previous_y = saved['previous']
+        player.move_remainder = saved['remainder']
+        player.direction, player.frame_index = saved['direction'], saved['frame']
+        player.current_image = player.player_images[player.direction][player.frame_index]
+        player.last_update = saved['last update']
+        player.health = saved['health']
+        player.inventory = dict(saved['inventory'])
+
+        saved = snapshot['game state']
+        game_state.dark_mode, game_state.campfire, game_state.end = saved['dark mode'], saved['campfire'], saved['end']
+        game_state.campfire_locations = [list(cell) for cell in saved['campfire locations']]
+        game_state.statistics = dict(saved['statistics'])
+        game_state.help_tracker = saved['help tracker']
+        game_state.items = {(x, y): Item(name, description) for x, y, name, description in saved['items']}
+        game_state.triggers = TriggerIndex(self.game_map, game_state.items)
+        for cell in game_state.campfire_locations:
+            game_state.triggers.campfire_placed(cell)
+
+
+def new_game(map_name: str, difficulty: str = 'medium', seed=None, clock: StepClock = None,
+             dark_mode: bool = True) -> Simulation:
+    """
+    Starts a headless game on a map, with the player at the spawn and the items shuffled by a seed.
+    """
+    game_state = GameState()
+    game_state.set_difficulty(difficulty)
+    game_state.dark_mode = dark_mode
+    game_state.map_selector(map_name, seed)
+    return Simulation(game_state, Player(*PLAYER_SPAWN, [1, 1], HEADLESS_IMAGES), clock)
+
+
+def run_script(simulation: Simulation, script) -> list:
+    """
+    Runs a script of actions (see Simulation.perform) and returns what each one did, stopping when the game is
+    over.
+    """
+    outcomes = []
+    for action in script:
+        if simulation.over:
+            break
+        outcomes.append(simulation.perform(action))
+    return outcomes
@@ -0,0 +1,302 @@
+"""
+This module streams chunked maps (see mapformat.py), so only the chunks around the player are kept in memory.
+
+A ChunkedMap stands in for a MapGrid: it has a width, a height, tile_at and is_passable, and its tiles and
+passable layers are indexed with y * width + x like the bytearrays of a MapGrid, so the collision checks and
+the map drawing work on it unchanged. Reading a cell of a chunk that isn't in memory faults the chunk in from
+disk. As the player moves, stream asks a background thread to load the chunks within STREAM_RADIUS chunks of
+the player before they are needed; a chunk the thread fails to load is left for the lookup that needs it
+to load, which raises the error. At most max_chunks chunks are kept and the least recently used one is
+evicted to make room, so the memory a map takes is the same whatever its size. A chunk that doesn't match its
+checksum is rebuilt from its rows of the text map the chunked map was converted from, and nothing more of the
+text map is kept.
+
+Classes:
+- ChunkedLayer: One layer of a chunked map, indexed like a layer of a MapGrid.
+- ChunkedMap: A chunked map streamed from disk one chunk at a time.
+"""
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from itertools import islice
+
+from mapformat import PASSABLE_FROM_COLLISION, ChunkFile
+
+# How many chunks around the player's chunk are loaded ahead, and how many chunks are kept in memory. With
+# 32x32 chunks, one chunk around the player covers the camera's view and the cached map layer.
+STREAM_RADIUS = 1
+MAX_CHUNKS = 16
+
+
+class ChunkedLayer:
+    """
+    One layer of a chunked map, indexed with y * width + x like a layer of a MapGrid.
+
+    Instance Attributes:
+    - chunked_map: the map the layer belongs to
+    - layer: 0 for the tile codes, 1 for the passable cells
+    """
+    chunked_map: 'ChunkedMap'
+    layer: int
+
+    def __init__(self, chunked_map: 'ChunkedMap', layer: int) -> None:
+        self.chunked_map = chunked_map
+        self.layer = layer
+
+    def __getitem__(self, index: int) -> int:
+        chunked_map = self.chunked_map
+        if not 0 <= index < chunked_map.width * chunked_map.height:
+            raise IndexError(f'cell {index} is outside the {chunked_map.width}x{chunked_map.height} map')
+        y, x = divmod(index, chunked_map.width)
+        size = chunked_map.chunk_size
+        return chunked_map.chunk_at(x, y)[self.layer][(y % size) * size + x % size]
+
+    def __len__(self) -> int:
+        return self.chunked_map.width * self.chunked_map.height
+
+
+class ChunkedMap:
+    """
+    A chunked map streamed from disk one chunk at a time.
+
+    Instance Attributes:
+    - name: the map the chunks belong to, the path of its text map
+    - file: the chunked map file the chunks are read from
+    - width: the number of cells in a row
+    - height: the number of rows
+    - chunk_size: the number of cells along each side of a chunk
+    - max_chunks: the number of chunks kept in memory before the least recently used one is evicted
+    - chunks: the tile codes and passable cells of the chunks in memory, keyed by (chunk x, chunk y), ordered
+      from least to most recently used
+    - tiles: the tile codes, indexed like MapGrid.tiles
+    - passable: 1 for every cell that can be walked on and 0 for every blocked cell, indexed like
+      MapGrid.passable
+    - requested: the chunks asked of the loader thread and not loaded yet
+    - failed: the chunks the loader thread failed to load, which aren't asked of it again until a lookup loads
+      them
+    - hits: the number of cell lookups answered from a chunk in memory
+    - misses: the number of cell lookups that had to load their chunk
+    - prefetches: the number of chunks loaded ahead by the loader thread
+    - evictions: the number of chunks evicted
+    - failures: the number of chunks the loader thread failed to load
+    - loads: the number of chunks loaded
+    - load_time: the seconds spent loading chunks
+    - slowest_load: the seconds the slowest chunk load took
+    - lock: held while the chunks and counters are read or changed, as the loader thread changes them too
+    - queue: the chunks asked of the loader thread, in order, and None to stop it
+    - loader: the loader thread, started the first time chunks are asked for
+    """
+    name: str
+    file: ChunkFile
+    width: int
+    height: int
+    chunk_size: int
+    max_chunks: int
+    chunks: OrderedDict
+    tiles: ChunkedLayer
+    passable: ChunkedLayer
+    requested: set[tuple[int, int]]
+    failed: set[tuple[int, int]]
+    hits: int
+    misses: int
+    prefetches: int
+    evictions: int
+    failures: int
+    loads: int
+    load_time: float
+    slowest_load: float
+    lock: threading.Lock
+    queue: queue.Queue
+    loader: threading.Thread
+
+    def __init__(self, path: str, name: str = '', max_chunks: int = MAX_CHUNKS) -> None:
+        self.name = name
+        self.file = ChunkFile(path)
+        self.width, self.height, self.chunk_size = self.file.width, self.file.height, self.file.chunk_size
+        self.max_chunks = max_chunks
+        self.chunks = OrderedDict()
+        self.tiles = ChunkedLayer(self, 0)
+        self.passable = ChunkedLayer(self, 1)
+        self.requested = set()
+        self.failed = set()
+        self.hits = 0
+        self.misses = 0
+        self.prefetches = 0
+        self.evictions = 0
+        self.failures = 0
+        self.loads = 0
+        self.load_time = 0.0
+        self.slowest_load = 0.0
+        self.lock = threading.Lock()
+        self.queue = queue.Queue()
+        self.loader = None
+
+    def chunk_at(self, x: int, y: int) -> tuple[bytes, bytes]:
+        """
+        Return the tile codes and passable cells of the chunk holding cell (x, y), loading it if it isn't in
+        memory.
+        """
+        key = (x // self.chunk_size, y // self.chunk_size)
+        with self.lock:
+            chunk = self.chunks.get(key)
+            if chunk is not None:
+                self.chunks.move_to_end(key)
+                self.hits += 1
+                return chunk
+            self.misses += 1
+        return self.load(key)
+
+    def load(self, key: tuple[int, int]) -> tuple[bytes, bytes]:
+        """
+        Read a chunk from disk and keep it, evicting the least recently used chunks beyond max_chunks.
+        """
+        start = time.perf_counter()
+        try:
+            tiles, collision = self.file.read_chunk(*key)
+            chunk = (tiles, collision.translate(PASSABLE_FROM_COLLISION))
+        except ValueError:
+            if not os.path.exists(self.name):
+                raise
+            chunk = self.rebuild(key)
+        elapsed = time.perf_counter() - start
+        with self.lock:
+            self.loads += 1
+            self.load_time += elapsed
+            self.slowest_load = max(self.slowest_load, elapsed)
+            self.requested.discard(key)
+            self.failed.discard(key)
+            if key in self.chunks:
+                chunk = self.chunks[key]
+            else:
+                self.chunks[key] = chunk
+            self.chunks.move_to_end(key)
+            while len(self.chunks) > self.max_chunks:
+                self.chunks.popitem(last=False)
+                self.evictions += 1
+        return chunk
+
+    def rebuild(self, key: tuple[int, int]) -> tuple[bytes, bytes]:
+        """
+        Return the tile codes and passable cells of a chunk, cut from its rows of the text map, padded past the
+        edges of the map with blocked cells as the chunked format is. Only the chunk's rows are parsed.
+        """
+        from data import PASSABLE_TABLE
+
+        size = self.chunk_size
+        left = key[0] * size
+        tiles = bytearray()
+        with open(self.name, 'r') as map_data:
+            for line in islice(map_data, key[1] * size, min((key[1] + 1) * size, self.height)):
+                row = bytes(int(code) for code in line.split()[left:left + size])
+                tiles += row + bytes(size - len(row))
+        tiles += bytes(size * size - len(tiles))
+        return bytes(tiles), bytes(tiles).translate(PASSABLE_TABLE)
+
+    def stream(self, cell):
+        """
+        Ask the loader thread to load the chunks within STREAM_RADIUS chunks of a cell that aren't in memory.
+        """
+        chunk_x, chunk_y = cell[0] // self.chunk_size, cell[1] // self.chunk_size
+        columns = range(max(chunk_x - STREAM_RADIUS, 0), min(chunk_x + STREAM_RADIUS, self.file.chunks_x - 1) + 1)
+        rows = range(max(chunk_y - STREAM_RADIUS, 0), min(chunk_y + STREAM_RADIUS, self.file.chunks_y - 1) + 1)
+        with self.lock:
+            for key_y in rows:
+                for key_x in columns:
+                    key = (key_x, key_y)
+                    if key not in self.chunks and key not in self.requested and key not in self.failed:
+                        self.requested.add(key)
+                        self.queue.put(key)
+        if self.loader is None and self.requested:
+            self.loader = threading.Thread(target=self.run_loader, name=f'chunk loader {self.name}', daemon=True)
+            self.loader.start()
+
+    def run_loader(self):
+        """
+        Load the chunks asked for by stream, in the order they were asked for, until the map is closed. A chunk
+        that can't be loaded is marked as failed and the thread goes on with the next one.
+        """
+        while True:
+            key = self.queue.get()
+            if key is None:
+                return
+            with self.lock:
+                loaded = key in self.chunks
+            if not loaded:
+                try:
+                    self.load(key)
+                except (OSError, ValueError):
+                    with self.lock:
+                        self.requested.discard(key)
+                        self.failed.add(key)
+                        self.failures += 1
+                    continue
+                with self.lock:
+                    self.prefetches += 1
+            else:
+                with self.lock:
+                    self.requested.discard(key)
+
+    def close(self):
+        """
+        Stop the loader thread and close the map file.
+        """
+        if self.loader is not None:
+            self.queue.put(None)
+            self.loader.join()
+            self.loader = None
+        self.file.close()
+
+    def statistics(self) -> dict:
+        """
+        Return the number of chunks in memory, the lookups answered from memory and from disk, the chunks
+        loaded ahead, evicted and failed to load ahead, and the mean and slowest chunk load time.
+        """
+        return {'Chunks': len(self.chunks), 'Hits': self.hits, 'Misses': self.misses, 'Prefetches': self.prefetches,
+                'Evictions': self.evictions, 'Failures': self.failures,
+                'Mean Load': self.load_time / self.loads if self.loads else 0.0, 'Slowest Load': self.slowest_load}
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        """
+        Return whether (x, y) is a cell of the map.
+        """
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def tile_at(self, x: int, y: int) -> int:
+        """
+        Return the code of the tile at column x, row y. Negative indices count from the end, like list indices.
+        """
+        if not -self.width <= x < self.width or not -self.height <= y < self.height:
+            raise IndexError(f'tile ({x}, {y}) is outside the {self.width}x{self.height} map {self.name}')
+        return self.tiles[(y % self.height) * self.width + x % self.width]
+
+    def is_passable(self, x: int, y: int) -> bool:
+        """
+        Return whether the cell at column x, row y can be walked on. Cells outside the map are blocked.
+        """
+        return self.in_bounds(x, y) and self.passable[y * self.width + x] == 1
+
+    def row(self, y: int) -> bytes:
+        """
+        Return the tile codes of row y, loading every chunk the row crosses.
+        """
+        y %= self.height
+        size = self.chunk_size
+        start = (y % size) * size
+        return b''.join(self.chunk_at(x, y)[0][start:start + size] for x in range(0, self.width, size))[:self.width]
+
+    def __getitem__(self, y: int) -> bytes:
+        return self.row(y)
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __iter__(self):
+        return (self.row(y) for y in range(self.height))
+
+    def to_rows(self) -> list[list[int]]:
+        """
+        Return the map as a list of rows of tile codes, loading every chunk.
+        """
+        return [list(row) for row in self]